@@ -0,0 +1,312 @@
+"""
+Admin API routes
+"""
+import asyncio
+import codecs
+import csv
+import itertools
+import json
+import secrets
+import time
+from pathlib import Path
+from typing import AsyncIterator, Iterator, List, Optional, Tuple
+
+from fastapi import APIRouter, Depends, File, Form, Header, HTTPException, Query, UploadFile, status
+from fastapi.responses import PlainTextResponse, StreamingResponse
+from pydantic import ValidationError
+
+from ..core.config import get_settings
+from ..core.profiling import ProfilerBusyError, profile_store, sampling_profiler
+from ..schemas.interview import CreateInterviewRequest
+from ..services.batch_service import BatchEvaluator, EvaluationCache
+from ..services.interview_service import get_interview_service
+from ..services.question_service import get_question_service
+
+router = APIRouter(prefix="/admin", tags=["Admin"])
+
+_evaluation_cache: Optional[EvaluationCache] = None
+
+
+def is_admin_key(key: Optional[str]) -> bool:
+    """Check a key against the configured admin key"""
+    admin_key = get_settings().admin_api_key
+    return bool(admin_key and key and secrets.compare_digest(key, admin_key))
+
+
+async def require_admin(x_admin_key: Optional[str] = Header(default=None)):
+    """Check the X-Admin-Key header (admin endpoints are disabled without a configured key)"""
+    if not get_settings().admin_api_key:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="管理接口未启用"
+        )
+    if not is_admin_key(x_admin_key):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="管理密钥无效"
+        )
+
+
+def get_evaluation_cache() -> EvaluationCache:
+    """Get shared batch evaluation cache"""
+    global _evaluation_cache
+    if _evaluation_cache is None:
+        _evaluation_cache = EvaluationCache(Path(get_settings().batch_cache_path))
+    return _evaluation_cache
+
+
+def _iter_lines(upload: UploadFile, encoding: str = "utf-8") -> Iterator[str]:
+    """Iterate lines of an uploaded file (spooled to disk by Starlette, not held in memory)"""
+    upload.file.seek(0)
+    for line in upload.file:
+        yield line.decode(encoding)
+
+
+async def _aiter_lines(upload: UploadFile, encoding: str, batch: int = 256) -> AsyncIterator[str]:
+    """Iterate lines of an uploaded file, reading `batch` lines at a time in a worker thread"""
+    lines = _iter_lines(upload, encoding)
+    while True:
+        chunk = await asyncio.to_thread(lambda: list(itertools.islice(lines, batch)))
+        if not chunk:
+            return
+        for line in chunk:
+            yield line
+
+
+def _detect_encoding(upload: UploadFile) -> Optional[str]:
+    """
+    Find the text encoding of an upload by decoding all of it (blocking)
+
+    Returns:
+        "utf-8-sig" (UTF-8, BOM optional), "gbk" (Excel on Chinese Windows) or None
+    """
+    for encoding in ("utf-8-sig", "gbk"):
+        decoder = codecs.getincrementaldecoder(encoding)()
+        upload.file.seek(0)
+        try:
+            for chunk in iter(lambda: upload.file.read(64 * 1024), b""):
+                decoder.decode(chunk)
+            decoder.decode(b"", final=True)
+        except UnicodeDecodeError:
+            continue
+        return encoding
+    return None
+
+
+@router.post("/batch-evaluate", dependencies=[Depends(require_admin)])
+async def batch_evaluate(
+    file: UploadFile = File(..., description="JSONL of answers to re-grade"),
+    concurrency: Optional[int] = Query(default=None, ge=1, le=256),
+    use_cache: bool = True
+):
+    """
+    Re-grade stored answers in bulk
+
+    Upload a JSONL file (multipart field `file`), one record per line:
+    `{"question_id": "...", "selected_option": "A", "explanation": "..."}`
+
+    Results are streamed back as JSONL in completion order; each result
+    carries the `line` number of its input record.
+    """
+    # Decode errors must surface as a 400 here, not in the middle of a 200 stream
+    encoding = await asyncio.to_thread(_detect_encoding, file)
+    if encoding is None:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="无法识别文件编码，请使用 UTF-8 或 GBK"
+        )
+    settings = get_settings()
+    evaluator = BatchEvaluator(
+        concurrency=concurrency or settings.batch_concurrency,
+        cache=get_evaluation_cache() if use_cache else None
+    )
+
+    async def stream():
+        async for result in evaluator.run(_aiter_lines(file, encoding)):
+            yield json.dumps(result, ensure_ascii=False) + "\n"
+
+    return StreamingResponse(stream(), media_type="application/x-ndjson")
+
+
+_BULK_CHUNK = 500  # Candidates built and stored per step of the bulk stream
+
+
+def _iter_candidates(upload: UploadFile, encoding: str) -> Iterator[Tuple[int, Optional[dict], Optional[str]]]:
+    """
+    Iterate candidate rows of a CSV (header row) or JSONL upload
+
+    Yields:
+        (line number, row fields or None, error or None)
+    """
+    lines = _iter_lines(upload, encoding)
+    if (upload.filename or "").lower().endswith(".csv"):
+        reader = csv.DictReader(lines)
+        for row in reader:
+            # Empty cells fall back to the defaults
+            fields = {key.strip(): (value or "").strip() for key, value in row.items() if key}
+            yield reader.line_num, {key: value for key, value in fields.items() if value}, None
+        return
+    for line_no, raw in enumerate(lines, start=1):
+        if not raw.strip():
+            continue
+        try:
+            record = json.loads(raw)
+        except ValueError:
+            yield line_no, None, "Invalid JSON"
+            continue
+        if isinstance(record, dict):
+            yield line_no, record, None
+        else:
+            yield line_no, None, "Expected a JSON object"
+
+
+@router.post("/sessions/bulk", dependencies=[Depends(require_admin)])
+async def bulk_create_sessions(
+    file: UploadFile = File(..., description="Candidates as CSV (header row) or JSONL"),
+    position: Optional[str] = Form(default=None, description="Position for rows without one"),
+    question_count: Optional[int] = Form(default=None, ge=1, description="Question count for rows without one"),
+    jd_data: Optional[str] = Form(default=None, description="Parsed JD (JSON object) for rows without one")
+):
+    """
+    Create interview sessions for many candidates (campus drives)
+
+    Upload candidates as CSV with a header row (`candidate_name`, `position`,
+    `question_count`) or as JSONL with the fields of a session create request
+    (`resume_data` / `jd_data` included). Form fields give defaults for rows
+    that leave them out; a shared JD is matched against the bank once.
+
+    Results are streamed back as JSONL in input order: one
+    `{"line", "candidate_name", "session_id", "link"}` record per candidate,
+    or `{"line", "error"}` for a row that could not be used.
+    """
+    defaults = {"position": position, "question_count": question_count}
+    if jd_data:
+        try:
+            defaults["jd_data"] = json.loads(jd_data)
+        except ValueError:
+            defaults["jd_data"] = None
+        if not isinstance(defaults["jd_data"], dict):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="jd_data 须为JSON对象"
+            )
+    defaults = {key: value for key, value in defaults.items() if value is not None}
+    # Decode errors must surface as a 400 here, not in the middle of a 200 stream
+    encoding = await asyncio.to_thread(_detect_encoding, file)
+    if encoding is None:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="无法识别文件编码，请使用 UTF-8 或 GBK"
+        )
+    settings = get_settings()
+    link_base = settings.interview_link_base.rstrip("/")
+    service = get_interview_service()
+    rows = _iter_candidates(file, encoding)
+    accepted = 0
+    limit_reached = False
+
+    def next_chunk() -> List[dict]:
+        """Read the next rows and create their sessions in one batch"""
+        nonlocal accepted, limit_reached
+        results, requests = [], []
+        for line_no, record, error in rows:
+            if error is None and accepted >= settings.bulk_max_candidates:
+                limit_reached = True
+                results.append({"line": line_no, "error": f"Limit of {settings.bulk_max_candidates} candidates reached"})
+                break
+            if error is None:
+                try:
+                    request = CreateInterviewRequest(**{**defaults, **record})
+                except ValidationError as e:
+                    first = e.errors()[0]
+                    error = f"{'.'.join(str(loc) for loc in first['loc'])}: {first['msg']}"
+                else:
+                    # A count below 1 would create a session without questions
+                    if request.question_count is not None and request.question_count < 1:
+                        error = "question_count: Input should be greater than or equal to 1"
+            if error is not None:
+                results.append({"line": line_no, "error": error})
+                continue
+            accepted += 1
+            results.append({"line": line_no, "candidate_name": request.candidate_name})
+            requests.append(request)
+            if len(results) >= _BULK_CHUNK:
+                break
+
+        sessions = iter(service.create_sessions(requests))
+        for result in results:
+            if "error" not in result:
+                session = next(sessions)
+                result["session_id"] = session.id
+                result["question_count"] = session.question_count
+                result["link"] = f"{link_base}/interview/{session.id}"
+        return results
+
+    async def stream():
+        while not limit_reached:
+            # Parsing, selection and session building are CPU work; keep them off the event loop
+            results = await asyncio.to_thread(next_chunk)
+            if not results:
+                break
+            yield "".join(json.dumps(result, ensure_ascii=False) + "\n" for result in results)
+
+    return StreamingResponse(stream(), media_type="application/x-ndjson")
+
+
+def _require_profiling():
+    if not get_settings().profiling_enabled:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="性能分析未启用"
+        )
+
+
+@router.post("/profile/sample", dependencies=[Depends(require_admin)])
+async def sample_profile(
+    seconds: float = Query(default=10.0, gt=0),
+    interval_ms: float = Query(default=5.0, ge=1, le=1000)
+):
+    """
+    Run the sampling profiler over all threads for N seconds
+
+    Returns collapsed stacks ("frame;frame;frame count" per line), ready for
+    flamegraph.pl, speedscope or inferno.
+    """
+    _require_profiling()
+    seconds = min(seconds, get_settings().profiling_max_seconds)
+    try:
+        stacks, samples = await asyncio.to_thread(sampling_profiler.sample, seconds, interval_ms / 1000)
+    except ProfilerBusyError as e:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(e))
+
+    filename = f"profile-{time.strftime('%Y%m%d-%H%M%S')}.folded"
+    return PlainTextResponse(stacks, headers={
+        "Content-Disposition": f'attachment; filename="{filename}"',
+        "X-Profile-Samples": str(samples),
+    })
+
+
+@router.get("/profile/requests/{profile_id}", dependencies=[Depends(require_admin)])
+async def get_request_profile(profile_id: str):
+    """Get the full report of a request profiled with the X-Profile header"""
+    _require_profiling()
+    profile = profile_store.get(profile_id)
+    if not profile:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="性能分析结果未找到"
+        )
+    return PlainTextResponse(profile.report, headers={"X-Profile-Engine": profile.engine})
+
+
+@router.post("/questions/reload", dependencies=[Depends(require_admin)])
+async def reload_questions():
+    """Reload data/questions.json without restarting (this process only)"""
+    try:
+        result = await asyncio.to_thread(get_question_service().reload)
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"题库加载失败，仍使用当前题库: {e}"
+        )
+    return {"success": True, "data": result}
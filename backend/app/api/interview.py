@@ -1,14 +1,15 @@
 """
 Interview API routes
 """
-from fastapi import APIRouter, HTTPException, status
+from fastapi import APIRouter, File, Form, HTTPException, UploadFile, status
 from typing import Optional
 from ..schemas.interview import (
     CreateInterviewRequest, InterviewSessionResponse, 
     SubmitAnswerRequest, SubmitAnswerResponse,
-    InterviewReport, MessageResponse, Question, QuestionDisplay
+    InterviewReport, MessageResponse, Question
 )
 from ..services.interview_service import get_interview_service
+from ..services.parser_service import DocumentTooLargeError, ParserError, get_parser_service
 
 router = APIRouter(prefix="/interview", tags=["Interview"])
 
@@ -20,8 +21,8 @@ async def create_interview_session(request: CreateInterviewRequest):
     
     - **candidate_name**: Candidate name (optional)
     - **position**: Applied position (optional)
-    - **resume_data**: Parsed resume data (optional, reserved)
-    - **jd_data**: Parsed JD data (optional, reserved)
+    - **resume_data**: Parsed resume data (optional, see /parse/resume)
+    - **jd_data**: Parsed JD data (optional, see /parse/jd)
     - **question_count**: Number of questions, default 3
     """
     service = get_interview_service()
@@ -96,7 +97,8 @@ async def get_session_info(session_id: str):
         "question_count": session.question_count,
         "current_question_index": session.current_question_index,
         "created_at": session.created_at,
-        "completed_at": session.completed_at
+        "completed_at": session.completed_at,
+        "usage": session.usage
     }
 
 
@@ -152,7 +154,7 @@ async def submit_answer(session_id: str, request: SubmitAnswerRequest):
         # Get display version of next question
         next_q_display = None
         if next_question:
-            next_q_display = QuestionDisplay(**service.get_question_for_display(next_question))
+            next_q_display = service.get_question_for_display(next_question)
         
         return SubmitAnswerResponse(
             evaluation=evaluation,
@@ -216,33 +218,76 @@ async def cancel_interview(session_id: str):
     )
 
 
-# ============ Reserved Interfaces ============
+# ============ Document Parsing ============
+
+_DOCUMENT_LABELS = {"resume": "简历", "jd": "JD"}
+
+
+async def _parse_document(kind: str, file: Optional[UploadFile], text: Optional[str]) -> dict:
+    """Parse an uploaded or pasted document with the configured parser service"""
+    label = _DOCUMENT_LABELS[kind]
+    parser = get_parser_service()
+    if not parser.is_configured(kind):
+        return {
+            "success": False,
+            "message": f"{label}解析服务未配置",
+            "data": None
+        }
+    if file is None and not (text and text.strip()):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"请上传{label}文件或填写{label}文本"
+        )
+    
+    try:
+        if file is not None:
+            data, cached = await parser.parse_file(kind, file.file, file.filename or kind, file.content_type)
+        else:
+            data, cached = await parser.parse_text(kind, text)
+    except DocumentTooLargeError:
+        raise HTTPException(
+            status_code=status.HTTP_413_CONTENT_TOO_LARGE,
+            detail=f"{label}文件超过 {parser.settings.parser_max_upload_mb}MB"
+        )
+    except ParserError:
+        raise HTTPException(
+            status_code=status.HTTP_502_BAD_GATEWAY,
+            detail=f"{label}解析失败，请稍后重试"
+        )
+    return {
+        "success": True,
+        "message": f"{label}解析成功",
+        "data": data,
+        "cached": cached
+    }
+
 
 @router.post("/parse/resume")
-async def parse_resume(data: dict):
+async def parse_resume(
+    file: Optional[UploadFile] = File(default=None, description="Resume document (PDF, Word, ...)"),
+    text: Optional[str] = Form(default=None, description="Resume text, when no file is uploaded")
+):
     """
-    Resume parsing interface (reserved)
+    Parse a resume with the resume parser service
     
-    To be integrated with resume parsing service
+    Send a multipart `file` or a `text` form field. Results are cached by
+    document content, so re-submitting the same resume is answered at once.
+    The parsed data can be passed as `resume_data` when creating a session.
     """
-    # TODO: Call resume parsing service
-    return {
-        "success": False,
-        "message": "简历解析服务尚未实现",
-        "data": None
-    }
+    return await _parse_document("resume", file, text)
 
 
 @router.post("/parse/jd")
-async def parse_jd(data: dict):
+async def parse_jd(
+    file: Optional[UploadFile] = File(default=None, description="JD document"),
+    text: Optional[str] = Form(default=None, description="JD text, when no file is uploaded")
+):
     """
-    JD parsing interface (reserved)
+    Parse a job description with the JD parser service
     
-    To be integrated with JD parsing service
+    Send a multipart `file` or a `text` form field. The same JD is usually
+    submitted for many candidates; it is parsed once and then served from
+    the cache (concurrent submissions share the one parser call).
+    The parsed data can be passed as `jd_data` when creating a session.
     """
-    # TODO: Call JD parsing service
-    return {
-        "success": False,
-        "message": "JD解析服务尚未实现",
-        "data": None
-    }
+    return await _parse_document("jd", file, text)
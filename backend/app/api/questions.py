@@ -1,19 +1,38 @@
 """
 Question API routes
 """
-from fastapi import APIRouter, HTTPException, status
+import asyncio
+import base64
+import binascii
+from fastapi import APIRouter, HTTPException, Query, Request, Response, status
 from typing import Optional, List
-from ..schemas.interview import Question, QuestionType, DifficultyLevel
+from ..core.config import get_settings
+from ..core.http_cache import StaticPayload, cached_response
+from ..schemas.interview import (
+    Question, QuestionPage, QuestionSearchHit, QuestionSearchResult, QuestionType, DifficultyLevel
+)
 from ..services.question_service import get_question_service
 
 router = APIRouter(prefix="/questions", tags=["Questions"])
 
+QUESTION_FIELDS = set(Question.model_fields)
+
+
+async def _cached(request: Request, payload: StaticPayload) -> Response:
+    """Send a pre-serialized bank view (response_model then only documents the schema)"""
+    settings = get_settings()
+    return await cached_response(
+        request, payload,
+        max_age=settings.http_cache_max_age,
+        min_compress_size=settings.http_compress_min_size
+    )
+
 
 @router.get("/", response_model=List[Question])
-async def get_all_questions():
+async def get_all_questions(request: Request):
     """Get all questions (for management)"""
     service = get_question_service()
-    return service.get_all_questions()
+    return await _cached(request, service.get_view("all", service.get_all_questions))
 
 
 @router.get("/types")
@@ -34,8 +53,77 @@ async def get_difficulty_levels():
     ]
 
 
+@router.get("/page", response_model=QuestionPage)
+async def get_question_page(
+    q_type: Optional[QuestionType] = Query(default=None, alias="type"),
+    difficulty: Optional[DifficultyLevel] = None,
+    tags: Optional[str] = Query(default=None, description="Comma-separated; questions with any of the tags match"),
+    fields: Optional[str] = Query(default=None, description="Comma-separated fields to return, e.g. id,title,type"),
+    limit: int = Query(default=50, ge=1, le=500),
+    cursor: Optional[str] = Query(default=None, description="next_cursor of the previous page"),
+    count_only: bool = False
+):
+    """
+    List questions page by page (for management)
+    
+    Filters are combined (type AND difficulty AND any of the tags).
+    With count_only=true only `total` is returned.
+    """
+    service = get_question_service()
+    tag_list = _split(tags)
+    
+    if count_only:
+        total = service.count_questions(q_type, difficulty, tag_list)
+        return Response(content=QuestionPage(total=total).model_dump_json(), media_type="application/json")
+    
+    include = None
+    if fields:
+        include = {"items": {"__all__": _field_set(fields)}, "next_cursor": True, "total": True}
+    
+    try:
+        page, last_id, total = service.query_questions(
+            q_type, difficulty, tag_list, after_id=_decode_cursor(cursor), limit=limit
+        )
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Invalid cursor: {e}"
+        )
+    
+    # Items are bank models already; serialize them directly without re-validation
+    result = QuestionPage.model_construct(items=page, next_cursor=_encode_cursor(last_id), total=total)
+    return Response(content=result.model_dump_json(include=include), media_type="application/json")
+
+
+@router.get("/search", response_model=QuestionSearchResult)
+async def search_questions(
+    q: str = Query(min_length=1, max_length=200, description="Search text (Chinese or English)"),
+    q_type: Optional[QuestionType] = Query(default=None, alias="type"),
+    difficulty: Optional[DifficultyLevel] = None,
+    fields: Optional[str] = Query(default=None, description="Comma-separated question fields to return"),
+    limit: int = Query(default=20, ge=1, le=100)
+):
+    """
+    Search questions by title, content, tags and key points
+    
+    Results are ranked with BM25 over character bigrams.
+    """
+    include = None
+    if fields:
+        include = {"items": {"__all__": {"score": True, "question": _field_set(fields)}}, "total": True}
+    
+    service = get_question_service()
+    # Runs off the loop: a hot reload may hold the index briefly
+    hits, total = await asyncio.to_thread(service.search_questions, q, limit, q_type, difficulty)
+    result = QuestionSearchResult.model_construct(
+        items=[QuestionSearchHit.model_construct(score=score, question=question) for question, score in hits],
+        total=total
+    )
+    return Response(content=result.model_dump_json(include=include), media_type="application/json")
+
+
 @router.get("/{question_id}", response_model=Question)
-async def get_question(question_id: str):
+async def get_question(question_id: str, request: Request):
     """Get single question details"""
     service = get_question_service()
     question = service.get_question_by_id(question_id)
@@ -46,21 +134,59 @@ async def get_question(question_id: str):
             detail="Question not found"
         )
     
-    return question
+    return await _cached(request, service.get_view(f"question:{question_id}", lambda: question))
 
 
 @router.get("/by-type/{q_type}", response_model=List[Question])
-async def get_questions_by_type(q_type: QuestionType):
+async def get_questions_by_type(q_type: QuestionType, request: Request):
     """Get questions by type"""
     service = get_question_service()
-    return service.get_questions_by_type(q_type)
+    return await _cached(request, service.get_view(f"type:{q_type.value}", lambda: service.get_questions_by_type(q_type)))
 
 
 @router.get("/by-difficulty/{difficulty}", response_model=List[Question])
-async def get_questions_by_difficulty(difficulty: DifficultyLevel):
+async def get_questions_by_difficulty(difficulty: DifficultyLevel, request: Request):
     """Get questions by difficulty"""
     service = get_question_service()
-    return service.get_questions_by_difficulty(difficulty)
+    return await _cached(request, service.get_view(
+        f"difficulty:{difficulty.value}", lambda: service.get_questions_by_difficulty(difficulty)
+    ))
+
+
+def _split(value: Optional[str]) -> Optional[List[str]]:
+    """Split a comma-separated query parameter"""
+    if not value:
+        return None
+    return [item.strip() for item in value.split(",") if item.strip()] or None
+
+
+def _field_set(fields: str) -> set:
+    """Validate a `fields` projection parameter"""
+    field_set = set(_split(fields) or [])
+    unknown = field_set - QUESTION_FIELDS
+    if unknown:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unknown fields: {', '.join(sorted(unknown))}"
+        )
+    return field_set
+
+
+def _encode_cursor(question_id: Optional[str]) -> Optional[str]:
+    """Opaque page cursor for the last question of a page"""
+    if question_id is None:
+        return None
+    return base64.urlsafe_b64encode(question_id.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def _decode_cursor(cursor: Optional[str]) -> Optional[str]:
+    """Question ID encoded in a page cursor"""
+    if not cursor:
+        return None
+    try:
+        return base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode("utf-8")
+    except (binascii.Error, UnicodeDecodeError):
+        raise ValueError("malformed cursor")
 
 
 def get_type_label(t: QuestionType) -> str:
@@ -0,0 +1,168 @@
+"""
+Circuit breaker - fail fast while an upstream AI provider is degraded
+"""
+import time
+from collections import deque
+from enum import Enum
+from http import HTTPStatus
+from typing import Deque, Tuple
+
+
+# Client errors that mean every call will fail the same way (bad key, no access, quota)
+BREAKER_FAILURE_STATUS_CODES = {
+    HTTPStatus.UNAUTHORIZED,
+    HTTPStatus.FORBIDDEN,
+    HTTPStatus.TOO_MANY_REQUESTS,
+}
+
+
+def is_breaker_failure_status(status_code) -> bool:
+    """Check whether an error response counts against the upstream's breaker"""
+    try:
+        status_code = int(status_code)
+    except (TypeError, ValueError):
+        return True
+    return status_code in BREAKER_FAILURE_STATUS_CODES or status_code >= HTTPStatus.INTERNAL_SERVER_ERROR
+
+
+class CircuitState(str, Enum):
+    """Circuit breaker state enumeration"""
+    CLOSED = "closed"        # Calls flow normally
+    OPEN = "open"            # Calls are rejected immediately
+    HALF_OPEN = "half_open"  # A few probe calls decide whether to close again
+
+
+class CircuitOpenError(RuntimeError):
+    """Raised when a call is rejected because the circuit is open"""
+
+    def __init__(self, name: str):
+        super().__init__(f"{name} circuit is open")
+        self.name = name
+
+
+class CircuitBreaker:
+    """
+    Per-upstream circuit breaker with error-rate and latency thresholds
+
+    Outcomes of the last `window` calls are kept. Once at least `min_calls`
+    are recorded, the circuit opens when the failure rate or the slow-call
+    rate reaches its threshold. After `open_seconds` it lets
+    `half_open_calls` probes through; one failure re-opens the circuit,
+    all probes succeeding close it.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        failure_rate_threshold: float = 0.5,
+        slow_call_seconds: float = 10.0,
+        slow_call_rate_threshold: float = 0.8,
+        window: int = 20,
+        min_calls: int = 5,
+        open_seconds: float = 30.0,
+        half_open_calls: int = 1
+    ):
+        self.name = name
+        self.failure_rate_threshold = failure_rate_threshold
+        self.slow_call_seconds = slow_call_seconds
+        self.slow_call_rate_threshold = slow_call_rate_threshold
+        self.min_calls = min_calls
+        self.open_seconds = open_seconds
+        self.half_open_calls = half_open_calls
+
+        self._state = CircuitState.CLOSED
+        self._outcomes: Deque[Tuple[bool, bool]] = deque(maxlen=window)  # (failed, slow)
+        self._opened_at = 0.0
+        self._half_open_at = 0.0
+        self._probes_in_flight = 0
+        self._probes_succeeded = 0
+        self.open_count = 0
+
+    @property
+    def state(self) -> CircuitState:
+        """Current state (an expired OPEN state is reported as HALF_OPEN)"""
+        now = time.monotonic()
+        if self._state == CircuitState.OPEN and now - self._opened_at >= self.open_seconds:
+            self._enter_half_open(now)
+        elif self._state == CircuitState.HALF_OPEN and now - self._half_open_at >= self.open_seconds:
+            # Probes that never reported back (e.g. cancelled requests) must not wedge the breaker
+            self._enter_half_open(now)
+        return self._state
+
+    def _enter_half_open(self, now: float):
+        self._state = CircuitState.HALF_OPEN
+        self._half_open_at = now
+        self._probes_in_flight = 0
+        self._probes_succeeded = 0
+
+    def allow_request(self) -> bool:
+        """Check whether a call may go through (reserves a probe slot when half-open)"""
+        state = self.state
+        if state == CircuitState.CLOSED:
+            return True
+        if state == CircuitState.HALF_OPEN and self._probes_in_flight < self.half_open_calls:
+            self._probes_in_flight += 1
+            return True
+        return False
+
+    def record_success(self, latency: float):
+        """Record a successful call and its latency in seconds"""
+        slow = latency >= self.slow_call_seconds
+        if self._state == CircuitState.HALF_OPEN:
+            if slow:
+                self._trip()
+                return
+            self._probes_succeeded += 1
+            if self._probes_succeeded >= self.half_open_calls:
+                self._close()
+            return
+        self._outcomes.append((False, slow))
+        self._evaluate()
+
+    def record_failure(self):
+        """Record a failed call"""
+        if self._state == CircuitState.HALF_OPEN:
+            self._trip()
+            return
+        self._outcomes.append((True, False))
+        self._evaluate()
+
+    def record_ignored(self):
+        """Record a call that failed for its own reasons (frees its half-open probe slot)"""
+        if self._state == CircuitState.HALF_OPEN and self._probes_in_flight > 0:
+            self._probes_in_flight -= 1
+
+    def _evaluate(self):
+        """Open the circuit when a threshold is crossed"""
+        if self._state != CircuitState.CLOSED or len(self._outcomes) < self.min_calls:
+            return
+        total = len(self._outcomes)
+        failures = sum(1 for failed, _ in self._outcomes if failed)
+        slow_calls = sum(1 for _, slow in self._outcomes if slow)
+        if failures / total >= self.failure_rate_threshold or slow_calls / total >= self.slow_call_rate_threshold:
+            self._trip()
+
+    def _trip(self):
+        self._state = CircuitState.OPEN
+        self._opened_at = time.monotonic()
+        self._outcomes.clear()
+        self.open_count += 1
+        print(f"Circuit breaker '{self.name}' opened")
+
+    def _close(self):
+        self._state = CircuitState.CLOSED
+        self._outcomes.clear()
+        print(f"Circuit breaker '{self.name}' closed")
+
+    def snapshot(self) -> dict:
+        """Get breaker state for health reporting"""
+        total = len(self._outcomes)
+        failures = sum(1 for failed, _ in self._outcomes if failed)
+        slow_calls = sum(1 for _, slow in self._outcomes if slow)
+        return {
+            "state": self.state.value,
+            "window_calls": total,
+            "failure_rate": round(failures / total, 3) if total else 0.0,
+            "slow_call_rate": round(slow_calls / total, 3) if total else 0.0,
+            "open_count": self.open_count,
+        }
@@ -4,9 +4,6 @@ Application configuration module
 from pydantic_settings import BaseSettings
 from typing import Optional
 from functools import lru_cache
-import os
-import json
-import time
 
 
 class Settings(BaseSettings):
@@ -17,6 +14,9 @@ class Settings(BaseSettings):
     app_env: str = "development"
     debug: bool = True
     port: int = 8000
+    # Let gunicorn run WEB_CONCURRENCY > 1 workers. Sessions live in worker memory, so only
+    # enable behind session-affine routing (or once sessions are in shared storage)
+    allow_multiple_workers: bool = False
     
     # CORS configuration
     cors_origins: str = "http://localhost:5173,http://127.0.0.1:5173"
@@ -27,6 +27,85 @@ class Settings(BaseSettings):
     llm_api_base: str = "https://dashscope.aliyuncs.com/compatible-mode/v1"
     llm_model: str = "deepseek-v3"
     
+    # Tiered evaluation routing (fast model first, escalate to llm_model when needed)
+    llm_fast_model: Optional[str] = "qwen-flash"  # Empty disables the fast tier
+    routing_trivial_chars: int = 8           # Wrong option with a shorter reason -> rule engine
+    routing_long_chars: int = 300            # Longer explanations go straight to llm_model
+    routing_min_confidence: int = 70         # Escalate when the fast model is less confident
+    routing_max_disagreement: int = 30       # Escalate when fast model and rule scores differ more
+    
+    # LLM call resilience (seconds)
+    llm_timeout: float = 20.0             # Deadline for a single attempt
+    llm_request_budget: float = 30.0      # Overall budget for all attempts of one call
+    llm_max_retries: int = 2
+    llm_backoff_base: float = 0.5
+    llm_backoff_max: float = 4.0
+    llm_hedge_enabled: bool = False       # Fire a second attempt when the first exceeds p95
+    llm_hedge_min_delay: float = 1.0
+    
+    # Structured output
+    llm_stream_json: bool = False                 # Stream JSON calls; stop at the closing brace or once a fast answer will be escalated
+    llm_json_repair_model: Optional[str] = None   # Model for "continue the JSON" repair (fast model if not set)
+    
+    # Circuit breaker for AI providers (applied per service: llm / asr / tts)
+    breaker_failure_rate: float = 0.5        # Open when this share of recent calls failed
+    breaker_slow_call_seconds: float = 10.0  # Calls slower than this count as slow
+    breaker_slow_call_rate: float = 0.8      # Open when this share of recent calls was slow
+    breaker_window: int = 20                 # Number of recent calls considered
+    breaker_min_calls: int = 5               # Minimum calls before the breaker may open
+    breaker_open_seconds: float = 30.0       # Time before half-open probes are allowed
+    breaker_half_open_calls: int = 1         # Successful probes needed to close again
+    
+    # Cost accounting (estimated; prices in CNY, llm_model prices apply to llm_model only,
+    # fast prices to every other model)
+    cost_llm_input_per_1k: float = 0.002      # Per 1K input tokens
+    cost_llm_output_per_1k: float = 0.008     # Per 1K output tokens
+    cost_fast_input_per_1k: float = 0.00015
+    cost_fast_output_per_1k: float = 0.0015
+    cost_cached_input_ratio: float = 0.4      # Share of the input price billed for cached tokens
+    cost_asr_per_minute: float = 0.02         # Per minute of transcribed audio
+    cost_tts_per_10k_chars: float = 0.8       # Per 10K synthesized characters
+    
+    # Budgets (0 disables); above budget_degrade_ratio only the fast model is used,
+    # above the budget only rule-based and static paths
+    session_budget: float = 0.5
+    daily_budget: float = 0.0
+    budget_degrade_ratio: float = 0.8
+    
+    # Request tracing (spans are always timed for the Server-Timing header)
+    tracing_exporter: str = ""                       # "", "console", "file" or "otlp"
+    tracing_file_path: str = "./data/traces.jsonl"
+    tracing_otlp_endpoint: Optional[str] = None      # e.g. http://localhost:4318
+    tracing_sample_rate: float = 1.0                 # Share of traces exported
+    server_timing_enabled: bool = False              # Exposes internal stage timings to clients
+    
+    # Event-loop monitoring (stack traces of blocking calls are logged when debug is on)
+    loop_monitor_enabled: bool = True
+    loop_monitor_interval: float = 0.5       # Seconds between lag samples
+    loop_block_threshold: float = 0.1        # Loop stalls longer than this count as blocking
+    loop_monitor_strict: bool = False        # Fail requests that blocked the loop (for test runs)
+    
+    # Profiling (admin key required; nothing is installed while disabled)
+    profiling_enabled: bool = False
+    profiling_max_seconds: float = 60.0      # Upper bound of a sampling run
+    
+    # Start-up warm-up (reported by /ready)
+    warmup_enabled: bool = True
+    warmup_timeout: float = 10.0             # Upper bound for warming provider connections
+    warmup_llm_probe: bool = False           # Send a one-token generation to verify key and model
+    
+    # Provider cassette: "record" real AI traffic or "replay" it offline ("" disables)
+    cassette_mode: str = ""
+    cassette_path: str = "./data/cassettes/default.jsonl"  # ".gz" suffix compresses
+    cassette_time_scale: float = 1.0         # Replay timing factor (0 = no delays)
+    
+    # HTTP caching of question bank responses (ETag / If-None-Match, precompressed bodies)
+    http_cache_max_age: int = 60             # Cache-Control max-age in seconds (0 = revalidate every time)
+    http_compress_min_size: int = 1024       # Smaller bodies are sent uncompressed
+    
+    # Resume/JD question matching (hashed TF-IDF; uses NumPy when installed)
+    similarity_hash_bits: int = 18           # 2^bits hashed term columns
+    
     # ASR configuration (Speech to Text)
     asr_provider: str = "dashscope"
     asr_api_key: Optional[str] = None
@@ -40,11 +119,27 @@ class Settings(BaseSettings):
     tts_model: str = "qwen3-tts-flash-realtime"
     tts_voice: str = "Maia"
     
-    # Resume/JD parser service (reserved)
+    # Admin endpoints (disabled when no key is set)
+    admin_api_key: Optional[str] = None
+    
+    # Batch evaluation (offline re-grading)
+    batch_concurrency: int = 8
+    batch_cache_path: str = "./data/batch_eval_cache.jsonl"
+    
+    # Bulk session creation (campus drives)
+    bulk_max_candidates: int = 10000         # Rows accepted per upload
+    interview_link_base: str = "http://localhost:5173"  # Frontend origin for invitation links
+    
+    # Resume/JD parser service
     resume_parser_api_url: Optional[str] = None
     resume_parser_api_key: Optional[str] = None
     jd_parser_api_url: Optional[str] = None
     jd_parser_api_key: Optional[str] = None
+    parser_timeout: float = 30.0             # Read timeout of a parse call (connect: 5s)
+    parser_max_connections: int = 20         # Pooled keep-alive connections (HTTP/2 when h2 is installed)
+    parser_max_concurrency: int = 16         # Parse calls in flight at once per process
+    parser_cache_size: int = 2048            # Parse results kept, keyed by document content hash
+    parser_max_upload_mb: int = 20           # Larger documents are rejected (413)
     
     # Database configuration
     database_url: str = "sqlite:///./data/interview.db"
@@ -60,111 +155,7 @@ class Settings(BaseSettings):
         extra = "ignore"
 
 
-DEBUG_LOG_PATH = r"d:\DOCUMENTS\Company\AI_PreInterview\.cursor\debug.log"
-
-
-def _debug_log(message: str, data: dict, hypothesis_id: str, run_id: str = "run1") -> None:
-    """Write NDJSON debug logs to file without secrets."""
-    payload = {
-        "sessionId": "debug-session",
-        "runId": run_id,
-        "hypothesisId": hypothesis_id,
-        "location": "app/core/config.py",
-        "message": message,
-        "data": data,
-        "timestamp": int(time.time() * 1000),
-    }
-    try:
-        with open(DEBUG_LOG_PATH, "a", encoding="utf-8") as log_file:
-            log_file.write(json.dumps(payload, ensure_ascii=False) + "\n")
-    except Exception:
-        pass
-
-
 @lru_cache()
 def get_settings() -> Settings:
     """Get settings singleton"""
-    # #region agent log
-    _debug_log(
-        message="env_var_presence",
-        data={
-            "cwd": os.getcwd(),
-            "has_api_key": "api_key" in os.environ,
-            "has_API_KEY": "API_KEY" in os.environ,
-            "has_DASHSCOPE_API_KEY": "DASHSCOPE_API_KEY" in os.environ,
-            "has_LLM_API_KEY": "LLM_API_KEY" in os.environ,
-            "has_ASR_API_KEY": "ASR_API_KEY" in os.environ,
-            "has_TTS_API_KEY": "TTS_API_KEY" in os.environ,
-        },
-        hypothesis_id="H1",
-    )
-    # #endregion
-    # #region agent log
-    env_path = os.path.join(os.getcwd(), ".env")
-    env_keys = set()
-    if os.path.exists(env_path):
-        try:
-            with open(env_path, "r", encoding="utf-8") as env_file:
-                for line in env_file:
-                    line = line.strip()
-                    if not line or line.startswith("#") or "=" not in line:
-                        continue
-                    key = line.split("=", 1)[0].strip()
-                    env_keys.add(key)
-        except Exception:
-            pass
-    _debug_log(
-        message="dotenv_key_presence",
-        data={
-            "env_path": env_path,
-            "env_exists": os.path.exists(env_path),
-            "has_api_key": "api_key" in env_keys,
-            "has_API_KEY": "API_KEY" in env_keys,
-            "has_DASHSCOPE_API_KEY": "DASHSCOPE_API_KEY" in env_keys,
-            "has_LLM_API_KEY": "LLM_API_KEY" in env_keys,
-            "has_ASR_API_KEY": "ASR_API_KEY" in env_keys,
-            "has_TTS_API_KEY": "TTS_API_KEY" in env_keys,
-        },
-        hypothesis_id="H2",
-    )
-    # #endregion
-    try:
-        settings = Settings()
-        # #region agent log
-        _debug_log(
-            message="settings_init_success",
-            data={
-                "llm_provider": settings.llm_provider,
-                "llm_api_base": settings.llm_api_base,
-                "asr_api_base": settings.asr_api_base,
-                "tts_api_base": settings.tts_api_base,
-                "llm_api_key_set": bool(settings.llm_api_key),
-                "asr_api_key_set": bool(settings.asr_api_key),
-                "tts_api_key_set": bool(settings.tts_api_key),
-            },
-            hypothesis_id="H3",
-        )
-        # #endregion
-        return settings
-    except Exception as exc:
-        # #region agent log
-        error_list = []
-        try:
-            if hasattr(exc, "errors"):
-                for err in exc.errors():
-                    error_list.append(
-                        {"loc": err.get("loc"), "type": err.get("type"), "msg": err.get("msg")}
-                    )
-        except Exception:
-            error_list = []
-        _debug_log(
-            message="settings_init_error",
-            data={
-                "error_type": type(exc).__name__,
-                "error_count": len(error_list),
-                "errors": error_list,
-            },
-            hypothesis_id="H4",
-        )
-        # #endregion
-        raise
+    return Settings()
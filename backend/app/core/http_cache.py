@@ -0,0 +1,147 @@
+"""
+HTTP caching for static payloads - ETags, conditional GET and precompressed bodies
+
+A StaticPayload is built once per question bank version. Its strong ETag
+combines the bank version and a hash of the body, and compressed variants
+are produced once (at bank load, or in a worker thread on first use) and
+then reused, so repeated requests cost a header comparison (304) or a
+dictionary lookup.
+"""
+import asyncio
+import gzip
+import hashlib
+from typing import Dict, Optional
+
+from fastapi import Request, Response
+
+try:
+    import brotli
+except ImportError:  # Optional dependency
+    brotli = None
+
+# Preferred first when the client accepts several
+ENCODINGS = ("br", "gzip") if brotli is not None else ("gzip",)
+
+# Moderate levels: the highest ones cost several times the CPU for a few percent smaller bodies
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 5
+
+
+class StaticPayload:
+    """Immutable response body with its validators and compressed variants"""
+
+    def __init__(self, body: bytes, version: str, media_type: str = "application/json"):
+        self.body = body
+        self.media_type = media_type
+        self.etag = f'"{version}-{hashlib.sha256(body).hexdigest()[:16]}"'
+        self._encoded: Dict[str, bytes] = {}
+
+    def etag_for(self, encoding: Optional[str]) -> str:
+        """Strong ETag of one representation (each content coding gets its own)"""
+        return self.etag if not encoding else f'{self.etag[:-1]}-{encoding}"'
+
+    def encoded(self, encoding: Optional[str]) -> bytes:
+        """Body in the given content coding (compressed once, then cached; blocking)"""
+        if not encoding:
+            return self.body
+        body = self._encoded.get(encoding)
+        if body is None:
+            if encoding == "br":
+                body = brotli.compress(self.body, quality=BROTLI_QUALITY)
+            else:
+                body = gzip.compress(self.body, compresslevel=GZIP_LEVEL, mtime=0)
+            self._encoded[encoding] = body
+        return body
+
+    def is_encoded(self, encoding: Optional[str]) -> bool:
+        """Check whether the body in the given content coding is ready without compressing"""
+        return not encoding or encoding in self._encoded
+
+    def precompress(self, min_size: int = 0) -> "StaticPayload":
+        """Compress the body in every supported coding now (e.g. while loading the bank)"""
+        if len(self.body) >= min_size:
+            for encoding in ENCODINGS:
+                self.encoded(encoding)
+        return self
+
+    def matches(self, if_none_match: Optional[str]) -> bool:
+        """Check an If-None-Match header against every representation (weak comparison)"""
+        if not if_none_match:
+            return False
+        tags = {self.etag_for(None)} | {self.etag_for(e) for e in ENCODINGS}
+        for tag in if_none_match.split(","):
+            tag = tag.strip()
+            if tag == "*":
+                return True
+            if tag.startswith("W/"):
+                tag = tag[2:]
+            if tag in tags:
+                return True
+        return False
+
+
+def negotiate_encoding(accept_encoding: Optional[str]) -> Optional[str]:
+    """
+    Pick a supported content coding from an Accept-Encoding header
+
+    Returns:
+        "br", "gzip" or None for identity
+    """
+    if not accept_encoding:
+        return None
+    accepted = {}
+    for item in accept_encoding.split(","):
+        name, _, params = item.strip().partition(";")
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        accepted[name.strip().lower()] = quality
+    for encoding in ENCODINGS:
+        if accepted.get(encoding, accepted.get("*", 0.0)) > 0:
+            return encoding
+    return None
+
+
+async def cached_response(
+    request: Request,
+    payload: StaticPayload,
+    max_age: int = 0,
+    min_compress_size: int = 1024
+) -> Response:
+    """
+    Respond with a static payload, honoring If-None-Match and Accept-Encoding
+
+    A body not yet compressed in the negotiated coding is compressed in a
+    worker thread, so large views do not stall the event loop.
+
+    Args:
+        request: Incoming request
+        payload: Payload to send
+        max_age: Cache-Control max-age in seconds (0 = revalidate every time)
+        min_compress_size: Bodies smaller than this are sent uncompressed
+
+    Returns:
+        200 response with the (possibly compressed) body, or 304 without one
+    """
+    encoding = None
+    if len(payload.body) >= min_compress_size:
+        encoding = negotiate_encoding(request.headers.get("accept-encoding"))
+    headers = {
+        "ETag": payload.etag_for(encoding),
+        # Private: the bodies include correct answers and must not be stored by shared caches
+        "Cache-Control": f"private, max-age={max_age}" if max_age > 0 else "private, no-cache",
+        "Vary": "Accept-Encoding",
+    }
+    if payload.matches(request.headers.get("if-none-match")):
+        return Response(status_code=304, headers=headers)
+    if encoding:
+        headers["Content-Encoding"] = encoding
+    if payload.is_encoded(encoding):
+        body = payload.encoded(encoding)
+    else:
+        body = await asyncio.to_thread(payload.encoded, encoding)
+    return Response(content=body, media_type=payload.media_type, headers=headers)
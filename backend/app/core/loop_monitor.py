@@ -0,0 +1,259 @@
+"""
+Loop Monitor - Event-loop lag measurement and blocking-call detection
+"""
+import asyncio
+import collections.abc
+import contextvars
+import sys
+import threading
+import time
+import traceback
+from typing import List, Optional
+
+from .config import get_settings
+from .metrics import EVENT_LOOP_BLOCKS, EVENT_LOOP_LAG
+
+
+# Violations of the request the current task works for (strict mode)
+_request_violations: contextvars.ContextVar[Optional[List["BlockingViolation"]]] = contextvars.ContextVar(
+    "request_violations", default=None
+)
+
+
+class BlockingCallError(RuntimeError):
+    """Raised in strict mode when the event loop was blocked"""
+
+
+class BlockingViolation:
+    """One detected blocking of the event loop"""
+
+    def __init__(self, duration: float, stack: str):
+        self.duration = duration
+        self.stack = stack
+        self.detected_at = time.time()
+
+    def to_dict(self) -> dict:
+        return {
+            "duration_ms": round(self.duration * 1000, 1),
+            "stack": self.stack,
+            "detected_at": self.detected_at,
+        }
+
+
+class _OwnedCoroutine(collections.abc.Coroutine):
+    """
+    Coroutine wrapper that publishes its request's violations list while it runs
+
+    The flag is set and cleared on the loop thread around every step, so the
+    watchdog only has to read it; asking asyncio for the current task is not
+    supported outside the loop thread.
+    """
+
+    __slots__ = ("_coro", "_owner", "_monitor")
+
+    def __init__(self, coro, owner: List["BlockingViolation"], monitor: "LoopMonitor"):
+        self._coro = coro
+        self._owner = owner
+        self._monitor = monitor
+
+    def send(self, value):
+        self._monitor._running_owner = self._owner
+        try:
+            return self._coro.send(value)
+        finally:
+            self._monitor._running_owner = None
+
+    def throw(self, *args):
+        self._monitor._running_owner = self._owner
+        try:
+            return self._coro.throw(*args)
+        finally:
+            self._monitor._running_owner = None
+
+    def close(self):
+        return self._coro.close()
+
+    def __await__(self):
+        return self._coro.__await__()
+
+    def __getattr__(self, name):
+        # cr_frame, cr_code, __qualname__ ... for task reprs and debuggers
+        return getattr(self._coro, name)
+
+
+class LoopMonitor:
+    """
+    Measures event-loop lag and detects callbacks that block the loop
+
+    A task on the loop sleeps for `interval` and exports how late it woke up
+    as lag. With the watchdog enabled, a separate thread checks the task's
+    heartbeat; when the loop has not run for `block_threshold` seconds it
+    captures the loop thread's stack, i.e. the code that is blocking it.
+
+    In strict mode, tasks created for a request run their coroutine in a
+    wrapper that marks the request as running for the length of each step,
+    so a violation is charged to the request whose task blocked the loop
+    rather than to whatever other requests happened to be in flight.
+    """
+
+    def __init__(
+        self,
+        interval: float = 0.5,
+        block_threshold: float = 0.1,
+        watchdog: bool = False,
+        strict: bool = False,
+        max_violations: int = 100
+    ):
+        self.interval = interval
+        self.block_threshold = block_threshold
+        self.watchdog = watchdog or strict
+        self.strict = strict
+        self.max_violations = max_violations
+        self.violations: List[BlockingViolation] = []
+        self.violation_count = 0
+        self.last_lag = 0.0
+
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_thread_id: Optional[int] = None
+        self._heartbeat = time.monotonic()
+        self._task: Optional[asyncio.Task] = None
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        # Violations list of the request whose task step is running (set on the loop thread)
+        self._running_owner: Optional[List[BlockingViolation]] = None
+        self._previous_factory = None
+
+    def start(self):
+        """Start monitoring the running loop (call from the loop thread)"""
+        self._loop = asyncio.get_running_loop()
+        self._loop_thread_id = threading.get_ident()
+        self._heartbeat = time.monotonic()
+        self._stop.clear()
+        if self.strict:
+            self._previous_factory = self._loop.get_task_factory()
+            self._loop.set_task_factory(self._create_task)
+        self._task = self._loop.create_task(self._measure())
+        if self.watchdog:
+            self._thread = threading.Thread(target=self._watch, name="loop-watchdog", daemon=True)
+            self._thread.start()
+
+    async def stop(self):
+        """Stop monitoring"""
+        self._stop.set()
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self._thread:
+            self._thread.join(timeout=1.0)
+            self._thread = None
+        if self.strict and self._loop:
+            self._loop.set_task_factory(self._previous_factory)
+            self._previous_factory = None
+
+    def _create_task(self, loop, coro, context=None):
+        """Task factory (strict mode): run tasks created for a request under its owner mark"""
+        owner = _request_violations.get() if context is None else context.get(_request_violations)
+        if owner is not None:
+            coro = _OwnedCoroutine(coro, owner, self)
+        if self._previous_factory is not None:
+            return self._previous_factory(loop, coro, **({} if context is None else {"context": context}))
+        return asyncio.Task(coro, loop=loop, context=context)
+
+    async def _measure(self):
+        # With the watchdog, heartbeats are more frequent than lag samples so it reacts quickly
+        tick = min(self.interval, self.block_threshold / 2) if self.watchdog else self.interval
+        next_sample = time.monotonic() + self.interval
+        while True:
+            expected = time.monotonic() + tick
+            await asyncio.sleep(tick)
+            now = time.monotonic()
+            self._heartbeat = now
+            lag = max(0.0, now - expected)
+            if lag > self.block_threshold and not self.watchdog:
+                self._record(lag, "")
+            if now >= next_sample or lag > self.block_threshold:
+                self.last_lag = lag
+                EVENT_LOOP_LAG.observe(lag)
+                next_sample = now + self.interval
+
+    def _watch(self):
+        reported_heartbeat = None
+        while not self._stop.wait(self.block_threshold / 2):
+            heartbeat = self._heartbeat
+            blocked = time.monotonic() - heartbeat
+            if blocked < self.block_threshold or heartbeat == reported_heartbeat:
+                continue
+            reported_heartbeat = heartbeat
+            frame = sys._current_frames().get(self._loop_thread_id)
+            stack = "".join(traceback.format_stack(frame)) if frame else ""
+            violation = self._record(blocked, stack)
+            # The step running now is the one blocking the loop (None outside request tasks)
+            owner = self._running_owner
+            if owner is not None:
+                owner.append(violation)
+            print(f"Event loop blocked for over {blocked * 1000:.0f}ms:\n{stack}")
+
+    def _record(self, duration: float, stack: str) -> BlockingViolation:
+        EVENT_LOOP_BLOCKS.inc()
+        violation = BlockingViolation(duration, stack)
+        self.violation_count += 1
+        self.violations.append(violation)
+        del self.violations[:-self.max_violations]
+        return violation
+
+    def track_request(self) -> List[BlockingViolation]:
+        """
+        Start collecting the violations caused by the current request (strict mode)
+
+        Call from the request's task before creating its other tasks; blocking
+        in the tasks created afterwards (the app behind the middleware) is
+        charged to the request.
+
+        Returns:
+            List the request's violations are added to (pass to check)
+        """
+        violations: List[BlockingViolation] = []
+        _request_violations.set(violations)
+        return violations
+
+    def check(self, violations: List[BlockingViolation]):
+        """
+        Raise if the request blocked the loop (strict mode)
+
+        Raises:
+            BlockingCallError: A blocking call was detected in one of the request's tasks
+        """
+        if self.strict and violations:
+            latest = violations[-1]
+            raise BlockingCallError(
+                f"Event loop blocked for over {latest.duration * 1000:.0f}ms\n{latest.stack}"
+            )
+
+    def snapshot(self) -> dict:
+        return {
+            "lag_ms": round(self.last_lag * 1000, 2),
+            "blocking_calls": self.violation_count,
+            "recent": [v.to_dict() for v in self.violations[-5:]],
+        }
+
+
+# Singleton instance
+_loop_monitor: Optional[LoopMonitor] = None
+
+
+def get_loop_monitor() -> LoopMonitor:
+    """Get loop monitor singleton"""
+    global _loop_monitor
+    if _loop_monitor is None:
+        settings = get_settings()
+        _loop_monitor = LoopMonitor(
+            interval=settings.loop_monitor_interval,
+            block_threshold=settings.loop_block_threshold,
+            watchdog=settings.debug,
+            strict=settings.loop_monitor_strict
+        )
+    return _loop_monitor
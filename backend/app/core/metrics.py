@@ -0,0 +1,304 @@
+"""
+Metrics - Minimal Prometheus-style metric registry and text exposition
+"""
+import bisect
+import threading
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class _Metric:
+    """Base class of labelled metrics"""
+
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._children: Dict[Tuple[str, ...], object] = {}
+        self._lock = threading.Lock()
+
+    def labels(self, *values: str):
+        """Get the child metric for a label combination"""
+        if len(values) != len(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}")
+        key = tuple(str(v) for v in values)
+        child = self._children.get(key)
+        if child is None:
+            with self._lock:
+                child = self._children.setdefault(key, self._new_child())
+        return child
+
+    def _new_child(self):
+        raise NotImplementedError
+
+    def _samples(self) -> Iterable[str]:
+        raise NotImplementedError
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+        lines.extend(self._samples())
+        return lines
+
+
+class _CounterChild:
+    def __init__(self):
+        self.value = 0.0
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1.0):
+        with self._lock:
+            self.value += amount
+
+
+class Counter(_Metric):
+    """Monotonically increasing counter"""
+
+    kind = "counter"
+
+    def _new_child(self):
+        return _CounterChild()
+
+    def inc(self, amount: float = 1.0):
+        self.labels().inc(amount)
+
+    def _samples(self):
+        for key, child in list(self._children.items()):
+            yield f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(child.value)}"
+
+
+class _GaugeChild:
+    def __init__(self):
+        self.value = 0.0
+
+    def set(self, value: float):
+        self.value = value
+
+
+class Gauge(_Metric):
+    """
+    Gauge that is either set directly or computed at scrape time
+
+    A collect function returns {label_values_tuple: value} and replaces the
+    directly set values when present.
+    """
+
+    kind = "gauge"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._collect: Optional[Callable[[], Dict[Tuple[str, ...], float]]] = None
+
+    def _new_child(self):
+        return _GaugeChild()
+
+    def set(self, value: float):
+        self.labels().set(value)
+
+    def set_function(self, collect: Callable[[], Dict[Tuple[str, ...], float]]):
+        """Compute gauge values at scrape time"""
+        self._collect = collect
+
+    def _samples(self):
+        if self._collect is not None:
+            try:
+                values = self._collect()
+            except Exception as e:
+                print(f"Metric collect error ({self.name}): {e}")
+                values = {}
+        else:
+            values = {key: child.value for key, child in list(self._children.items())}
+        for key, value in values.items():
+            yield f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}"
+
+
+class _HistogramChild:
+    def __init__(self, buckets: Tuple[float, ...]):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.sum = 0.0
+        self.count = 0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float):
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            if index < len(self.counts):
+                self.counts[index] += 1
+            self.sum += value
+            self.count += 1
+
+
+class Histogram(_Metric):
+    """Histogram with cumulative buckets"""
+
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS
+    ):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def _new_child(self):
+        return _HistogramChild(self.buckets)
+
+    def observe(self, value: float):
+        self.labels().observe(value)
+
+    def _samples(self):
+        for key, child in list(self._children.items()):
+            cumulative = 0
+            for bound, count in zip(self.buckets, child.counts):
+                cumulative += count
+                le = f'le="{_format_value(bound)}"'
+                yield f"{self.name}_bucket{_format_labels(self.labelnames, key, le)} {cumulative}"
+            inf = 'le="+Inf"'
+            yield f"{self.name}_bucket{_format_labels(self.labelnames, key, inf)} {child.count}"
+            yield f"{self.name}_sum{_format_labels(self.labelnames, key)} {_format_value(child.sum)}"
+            yield f"{self.name}_count{_format_labels(self.labelnames, key)} {child.count}"
+
+
+class Registry:
+    """Collection of metrics rendered together"""
+
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+
+    def register(self, metric: _Metric) -> _Metric:
+        self._metrics[metric.name] = metric
+        return metric
+
+    def render(self) -> str:
+        """Render all metrics in Prometheus text exposition format"""
+        lines: List[str] = []
+        for metric in self._metrics.values():
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = Registry()
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+# ============ Application metrics ============
+
+HTTP_REQUEST_DURATION = REGISTRY.register(Histogram(
+    "http_request_duration_seconds",
+    "HTTP request latency by route template",
+    ["method", "route", "status"]
+))
+
+UPSTREAM_REQUEST_DURATION = REGISTRY.register(Histogram(
+    "upstream_request_duration_seconds",
+    "Latency of calls to AI providers (including retries)",
+    ["service", "outcome"]
+))
+
+UPSTREAM_ERRORS = REGISTRY.register(Counter(
+    "upstream_errors_total",
+    "Failed calls to AI providers",
+    ["service", "reason"]
+))
+
+UPSTREAM_RETRIES = REGISTRY.register(Counter(
+    "upstream_retries_total",
+    "Retried attempts of calls to AI providers",
+    ["service"]
+))
+
+UPSTREAM_FALLBACKS = REGISTRY.register(Counter(
+    "upstream_fallbacks_total",
+    "Responses served by a fallback path because the AI provider was unavailable",
+    ["service", "fallback"]
+))
+
+LLM_TOKENS = REGISTRY.register(Counter(
+    "llm_tokens_total",
+    "LLM tokens reported by the provider",
+    ["model", "type"]
+))
+
+AUDIO_SECONDS = REGISTRY.register(Counter(
+    "audio_seconds_total",
+    "Audio transcribed (asr) or synthesized (tts)",
+    ["service"]
+))
+
+ESTIMATED_COST = REGISTRY.register(Counter(
+    "ai_estimated_cost_total",
+    "Estimated AI provider spend in the currency of the cost settings",
+    ["service"]
+))
+
+DAILY_COST = REGISTRY.register(Gauge(
+    "ai_daily_estimated_cost",
+    "Estimated AI provider spend of the current day"
+))
+
+BUDGET_DEGRADATIONS = REGISTRY.register(Counter(
+    "budget_degradations_total",
+    "Sessions (or calls without one) moved to a degraded or exhausted budget level",
+    ["scope", "level"]
+))
+
+EVALUATION_TIER = REGISTRY.register(Counter(
+    "evaluation_tier_total",
+    "Answer evaluations by routing tier",
+    ["tier"]
+))
+
+EVENT_LOOP_LAG = REGISTRY.register(Histogram(
+    "event_loop_lag_seconds",
+    "How late the event loop ran a scheduled wake-up",
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+))
+
+EVENT_LOOP_BLOCKS = REGISTRY.register(Counter(
+    "event_loop_blocking_calls_total",
+    "Times the event loop was blocked longer than the threshold"
+))
+
+CIRCUIT_STATE = REGISTRY.register(Gauge(
+    "circuit_breaker_open",
+    "1 when the AI provider circuit breaker is not closed",
+    ["service"]
+))
+
+ACTIVE_SESSIONS = REGISTRY.register(Gauge(
+    "interview_sessions",
+    "Interview sessions held in memory by status",
+    ["status"]
+))
+
+PARSE_CACHE = REGISTRY.register(Counter(
+    "document_parse_cache_total",
+    "Resume/JD parse requests by cache outcome (hit, joined an in-flight parse, miss)",
+    ["kind", "result"]
+))
@@ -0,0 +1,164 @@
+"""
+Profiling - On-demand sampling profiler and per-request profile capture
+"""
+import cProfile
+import io
+import os
+import pstats
+import sys
+import threading
+import time
+import uuid
+from collections import Counter, OrderedDict
+from typing import Optional, Tuple
+
+try:
+    from pyinstrument import Profiler as PyinstrumentProfiler
+except ImportError:  # Optional dependency
+    PyinstrumentProfiler = None
+
+
+class ProfilerBusyError(RuntimeError):
+    """Raised when a sampling run is already in progress"""
+
+
+def _frame_label(frame) -> str:
+    code = frame.f_code
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+
+class SamplingProfiler:
+    """
+    Low-overhead statistical profiler over all threads
+
+    A background thread snapshots the stacks of every other thread at a
+    fixed interval. The result is in collapsed-stack format ("a;b;c count"
+    per line), which flamegraph.pl, speedscope and inferno read directly.
+    Nothing runs while no sampling run is active.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+
+    @property
+    def running(self) -> bool:
+        return self._lock.locked()
+
+    def sample(self, seconds: float, interval: float = 0.005) -> Tuple[str, int]:
+        """
+        Sample all threads for the given duration (blocking; run off the event loop)
+
+        Returns:
+            (Collapsed stacks, number of samples)
+
+        Raises:
+            ProfilerBusyError: Another sampling run is active
+        """
+        if not self._lock.acquire(blocking=False):
+            raise ProfilerBusyError("A profiling run is already in progress")
+        try:
+            stacks: Counter = Counter()
+            own_thread = threading.get_ident()
+            thread_names = {}
+            samples = 0
+            deadline = time.monotonic() + seconds
+            while time.monotonic() < deadline:
+                if samples % 100 == 0:
+                    thread_names = {t.ident: t.name for t in threading.enumerate()}
+                for thread_id, frame in sys._current_frames().items():
+                    if thread_id == own_thread:
+                        continue
+                    labels = []
+                    while frame is not None:
+                        labels.append(_frame_label(frame))
+                        frame = frame.f_back
+                    labels.append(thread_names.get(thread_id, str(thread_id)))
+                    stacks[";".join(reversed(labels))] += 1
+                samples += 1
+                time.sleep(interval)
+            lines = [f"{stack} {count}" for stack, count in stacks.most_common()]
+            return "\n".join(lines) + "\n", samples
+        finally:
+            self._lock.release()
+
+
+class RequestProfile:
+    """Profile of one request: a short summary for a header and the full report"""
+
+    def __init__(self, engine: str, summary: str, report: str):
+        self.id = uuid.uuid4().hex
+        self.engine = engine
+        self.summary = summary
+        self.report = report
+        self.created_at = time.time()
+
+
+class RequestProfiler:
+    """
+    Profiles a single request with pyinstrument (if installed) or cProfile
+
+    cProfile hooks the whole event-loop thread, so requests running at the
+    same time are included in the profile; pyinstrument's async mode only
+    follows the profiled request.
+    """
+
+    def __init__(self):
+        if PyinstrumentProfiler is not None:
+            self.engine = "pyinstrument"
+            self._profiler = PyinstrumentProfiler(async_mode="enabled")
+        else:
+            self.engine = "cprofile"
+            self._profiler = cProfile.Profile()
+
+    def start(self):
+        if self.engine == "pyinstrument":
+            self._profiler.start()
+        else:
+            self._profiler.enable()
+
+    def stop(self) -> RequestProfile:
+        if self.engine == "pyinstrument":
+            session = self._profiler.stop()
+            report = self._profiler.output_text(unicode=False, color=False)
+            root = session.root_frame()
+            children = sorted(root.children, key=lambda f: f.time, reverse=True) if root else []
+            summary = ", ".join(f"{f.function}={f.time * 1000:.1f}ms" for f in children[:5])
+            return RequestProfile(self.engine, summary, report)
+
+        self._profiler.disable()
+        stats = pstats.Stats(self._profiler)
+        stats.sort_stats(pstats.SortKey.CUMULATIVE)
+        buffer = io.StringIO()
+        stats.stream = buffer
+        stats.print_stats(40)
+
+        # Summary: slowest route handlers and service functions by cumulative time
+        app_dirs = tuple(f"{os.sep}app{os.sep}{name}{os.sep}" for name in ("api", "services"))
+        entries = []
+        for (filename, _, name), (_, _, _, cumulative, _) in stats.stats.items():
+            if any(directory in filename for directory in app_dirs):
+                entries.append((cumulative, name))
+        entries.sort(reverse=True)
+        summary = ", ".join(f"{name}={cumulative * 1000:.1f}ms" for cumulative, name in entries[:5])
+        return RequestProfile(self.engine, summary, buffer.getvalue())
+
+
+class ProfileStore:
+    """Keeps the most recent request profiles for download"""
+
+    def __init__(self, max_profiles: int = 50):
+        self.max_profiles = max_profiles
+        self._profiles: "OrderedDict[str, RequestProfile]" = OrderedDict()
+
+    def add(self, profile: RequestProfile):
+        self._profiles[profile.id] = profile
+        while len(self._profiles) > self.max_profiles:
+            self._profiles.popitem(last=False)
+
+    def get(self, profile_id: str) -> Optional[RequestProfile]:
+        return self._profiles.get(profile_id)
+
+
+# Singleton instances
+sampling_profiler = SamplingProfiler()
+profile_store = ProfileStore()
@@ -0,0 +1,208 @@
+"""
+Resilience helpers - deadlines, retry with jittered backoff and hedged requests
+"""
+import asyncio
+import random
+import time
+from collections import deque
+from http import HTTPStatus
+from typing import Any, Callable, Deque, Optional
+
+from .metrics import UPSTREAM_RETRIES
+
+
+# Status codes worth another attempt (throttling and transient server errors)
+RETRYABLE_STATUS_CODES = {
+    HTTPStatus.REQUEST_TIMEOUT,
+    HTTPStatus.TOO_MANY_REQUESTS,
+    HTTPStatus.INTERNAL_SERVER_ERROR,
+    HTTPStatus.BAD_GATEWAY,
+    HTTPStatus.SERVICE_UNAVAILABLE,
+    HTTPStatus.GATEWAY_TIMEOUT,
+}
+
+
+class DeadlineExceeded(TimeoutError):
+    """Raised when the overall request budget is used up"""
+
+
+class Deadline:
+    """Overall time budget shared by all attempts of one request"""
+
+    def __init__(self, budget: float):
+        self.budget = budget
+        self.expires_at = time.monotonic() + budget
+
+    def remaining(self) -> float:
+        """Seconds left before the budget is exhausted"""
+        return max(0.0, self.expires_at - time.monotonic())
+
+    @property
+    def expired(self) -> bool:
+        return self.remaining() <= 0
+
+
+class LatencyTracker:
+    """Sliding window of successful call latencies, used to pick the hedge delay"""
+
+    def __init__(self, window: int = 200):
+        self._samples: Deque[float] = deque(maxlen=window)
+
+    def record(self, seconds: float):
+        self._samples.append(seconds)
+
+    def percentile(self, pct: float) -> Optional[float]:
+        """Get latency percentile (None until enough samples are collected)"""
+        if len(self._samples) < 20:
+            return None
+        ordered = sorted(self._samples)
+        index = min(len(ordered) - 1, int(len(ordered) * pct / 100))
+        return ordered[index]
+
+
+class RetryPolicy:
+    """Retry / timeout / hedging configuration for one upstream"""
+
+    def __init__(
+        self,
+        attempt_timeout: float = 20.0,
+        max_retries: int = 2,
+        backoff_base: float = 0.5,
+        backoff_max: float = 4.0,
+        hedge_enabled: bool = False,
+        hedge_min_delay: float = 1.0
+    ):
+        self.attempt_timeout = attempt_timeout
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.hedge_enabled = hedge_enabled
+        self.hedge_min_delay = hedge_min_delay
+
+    def backoff(self, attempt: int) -> float:
+        """Exponential backoff with full jitter for the given retry number (1-based)"""
+        ceiling = min(self.backoff_max, self.backoff_base * (2 ** (attempt - 1)))
+        return random.uniform(0, ceiling)
+
+
+def is_retryable_response(response: Any) -> bool:
+    """Check whether a provider response should be retried"""
+    return getattr(response, "status_code", None) in RETRYABLE_STATUS_CODES
+
+
+def is_retryable_error(error: BaseException) -> bool:
+    """Check whether an exception raised by a provider call should be retried"""
+    return isinstance(error, (TimeoutError, ConnectionError, OSError))
+
+
+async def _run_attempt(func: Callable[[float], Any], timeout: float) -> Any:
+    """Run one blocking attempt in a worker thread bounded by timeout"""
+    return await asyncio.wait_for(asyncio.to_thread(func, timeout), timeout=timeout)
+
+
+async def _run_hedged(
+    func: Callable[[float], Any],
+    timeout: float,
+    hedge_delay: float
+) -> Any:
+    """
+    Run an attempt and fire a second one if the first is slower than hedge_delay
+
+    The first attempt to finish wins; a failed attempt only wins if the
+    other one fails too.
+    """
+    primary = asyncio.ensure_future(_run_attempt(func, timeout))
+    done, _ = await asyncio.wait({primary}, timeout=hedge_delay)
+    if done:
+        return primary.result()
+
+    remaining = max(0.0, timeout - hedge_delay)
+    hedge = asyncio.ensure_future(_run_attempt(func, remaining))
+    pending = {primary, hedge}
+    error: Optional[BaseException] = None
+    result: Any = None
+    has_result = False
+
+    while pending:
+        done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+        for task in done:
+            if task.exception() is not None:
+                error = task.exception()
+                continue
+            candidate = task.result()
+            if not is_retryable_response(candidate):
+                for other in pending:
+                    other.cancel()
+                return candidate
+            result, has_result = candidate, True
+
+    if has_result:
+        return result
+    raise error
+
+
+async def call_with_retry(
+    func: Callable[[float], Any],
+    policy: RetryPolicy,
+    deadline: Deadline,
+    latency: Optional[LatencyTracker] = None,
+    name: str = "upstream"
+) -> Any:
+    """
+    Call a blocking provider function with deadlines, retries and hedging
+
+    Args:
+        func: Blocking callable receiving the per-attempt timeout in seconds
+        policy: Retry policy
+        deadline: Overall request budget
+        latency: Latency tracker used to derive the hedge delay (p95)
+        name: Upstream name used in log messages and metric labels
+
+    Returns:
+        The provider response. A non-retryable error response is returned
+        as-is; when retries are exhausted the last response is returned or
+        the last error is raised.
+    """
+    last_error: Optional[BaseException] = None
+    last_response: Any = None
+
+    for attempt in range(policy.max_retries + 1):
+        timeout = min(policy.attempt_timeout, deadline.remaining())
+        if timeout <= 0:
+            break
+
+        started = time.monotonic()
+        try:
+            if policy.hedge_enabled:
+                p95 = latency.percentile(95) if latency else None
+                hedge_delay = max(policy.hedge_min_delay, p95 or 0.0)
+                response = await _run_hedged(func, timeout, hedge_delay)
+            else:
+                response = await _run_attempt(func, timeout)
+        except Exception as e:
+            if not is_retryable_error(e):
+                raise
+            last_error, last_response = e, None
+        else:
+            if not is_retryable_response(response):
+                if latency is not None:
+                    latency.record(time.monotonic() - started)
+                return response
+            last_error, last_response = None, response
+
+        if attempt >= policy.max_retries:
+            break
+
+        delay = policy.backoff(attempt + 1)
+        if delay >= deadline.remaining():
+            break
+        reason = repr(last_error) if last_error else getattr(last_response, "status_code", None)
+        print(f"{name} attempt {attempt + 1} failed ({reason}), retrying in {delay:.2f}s")
+        UPSTREAM_RETRIES.labels(name).inc()
+        await asyncio.sleep(delay)
+
+    if last_response is not None:
+        return last_response
+    if last_error is not None:
+        raise last_error
+    raise DeadlineExceeded(f"Request budget of {deadline.budget:.1f}s exhausted")
@@ -0,0 +1,332 @@
+"""
+Tracing - Lightweight request spans with console, file and OTLP exporters
+"""
+import functools
+import inspect
+import json
+import os
+import queue
+import random
+import re
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, Iterator, List, Optional
+
+
+_TRACEPARENT_RE = re.compile(r"^00-([0-9a-f]{32})-([0-9a-f]{16})-([0-9a-f]{2})$")
+
+
+def _new_id(length: int) -> str:
+    return os.urandom(length // 2).hex()
+
+
+class Span:
+    """One timed operation of a trace"""
+
+    def __init__(self, trace: "Trace", name: str, parent_id: Optional[str], attributes: Optional[dict] = None):
+        self.trace = trace
+        self.name = name
+        self.span_id = _new_id(16)
+        self.parent_id = parent_id
+        self.attributes: Dict[str, object] = dict(attributes or {})
+        self.error: Optional[str] = None
+        self.start_time = time.time()
+        self._started = time.perf_counter()
+        self.duration: Optional[float] = None
+
+    def set_attribute(self, key: str, value):
+        self.attributes[key] = value
+
+    def end(self):
+        if self.duration is None:
+            self.duration = time.perf_counter() - self._started
+            self.trace.finished.append(self)
+
+    def to_dict(self) -> dict:
+        return {
+            "trace_id": self.trace.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "name": self.name,
+            "start": self.start_time,
+            "duration_ms": round((self.duration or 0.0) * 1000, 3),
+            "attributes": self.attributes,
+            "error": self.error,
+        }
+
+
+class Trace:
+    """Spans of one request (finished spans are appended from any thread)"""
+
+    def __init__(self, trace_id: Optional[str] = None, parent_id: Optional[str] = None, sampled: bool = True):
+        self.trace_id = trace_id or _new_id(32)
+        self.remote_parent_id = parent_id
+        self.sampled = sampled
+        self.finished: List[Span] = []
+
+    def server_timing(self, root: Span) -> str:
+        """
+        Build a Server-Timing header value from the finished spans
+
+        Durations of spans with the same name are summed. "app" is the part
+        of the request not covered by any child span (routing, request
+        validation, response serialization).
+        """
+        totals: Dict[str, float] = {}
+        children = 0.0
+        for span in list(self.finished):
+            if span is root or span.duration is None:
+                continue
+            totals[span.name] = totals.get(span.name, 0.0) + span.duration
+            if span.parent_id == root.span_id:
+                children += span.duration
+        total = root.duration or 0.0
+        entries = [f"total;dur={total * 1000:.1f}"]
+        entries.append(f'app;dur={max(0.0, total - children) * 1000:.1f};desc="validation/serialization"')
+        entries.extend(f"{name};dur={duration * 1000:.1f}" for name, duration in totals.items())
+        return ", ".join(entries)
+
+
+_current_trace: ContextVar[Optional[Trace]] = ContextVar("current_trace", default=None)
+_current_span: ContextVar[Optional[Span]] = ContextVar("current_span", default=None)
+
+
+def current_span() -> Optional[Span]:
+    """Get the active span (None outside of a traced request)"""
+    return _current_span.get()
+
+
+def parse_traceparent(header: Optional[str]) -> Optional[tuple]:
+    """Parse a W3C traceparent header into (trace_id, parent_span_id, sampled)"""
+    if not header:
+        return None
+    match = _TRACEPARENT_RE.match(header.strip().lower())
+    if not match:
+        return None
+    return match.group(1), match.group(2), bool(int(match.group(3), 16) & 1)
+
+
+@contextmanager
+def start_trace(name: str, traceparent: Optional[str] = None, sample_rate: float = 1.0, **attributes) -> Iterator[Span]:
+    """
+    Start a trace with a root span (used by the request middleware)
+
+    An incoming W3C traceparent header continues the caller's trace and
+    sampling decision.
+    """
+    parent = parse_traceparent(traceparent)
+    if parent:
+        trace = Trace(trace_id=parent[0], parent_id=parent[1], sampled=parent[2])
+    else:
+        trace = Trace(sampled=random.random() < sample_rate)
+
+    root = Span(trace, name, trace.remote_parent_id, attributes)
+    trace_token = _current_trace.set(trace)
+    span_token = _current_span.set(root)
+    try:
+        yield root
+    except BaseException as e:
+        root.error = repr(e)
+        raise
+    finally:
+        root.end()
+        _current_span.reset(span_token)
+        _current_trace.reset(trace_token)
+
+
+@contextmanager
+def start_span(name: str, **attributes) -> Iterator[Optional[Span]]:
+    """
+    Time a stage as a child of the active span
+
+    Outside of a trace this is a no-op and yields None. Context is copied
+    into asyncio tasks and asyncio.to_thread, so spans opened in worker
+    threads are parented correctly.
+    """
+    trace = _current_trace.get()
+    if trace is None:
+        yield None
+        return
+
+    parent = _current_span.get()
+    span = Span(trace, name, parent.span_id if parent else trace.remote_parent_id, attributes)
+    token = _current_span.set(span)
+    try:
+        yield span
+    except BaseException as e:
+        span.error = repr(e)
+        raise
+    finally:
+        span.end()
+        _current_span.reset(token)
+
+
+def traced(name: str):
+    """Decorator that wraps a sync or async function in a span"""
+    def decorator(func):
+        if inspect.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                with start_span(name):
+                    return await func(*args, **kwargs)
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with start_span(name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+# ============ Exporters ============
+
+class SpanExporter:
+    """Base class of span exporters"""
+
+    def export(self, spans: List[Span]):
+        raise NotImplementedError
+
+
+class ConsoleExporter(SpanExporter):
+    """Print one line per span, indented by depth"""
+
+    def export(self, spans: List[Span]):
+        depth: Dict[Optional[str], int] = {}
+        for span in sorted(spans, key=lambda s: s.start_time):
+            level = depth.get(span.parent_id, -1) + 1
+            depth[span.span_id] = level
+            error = f" error={span.error}" if span.error else ""
+            print(f"[trace {span.trace.trace_id[:8]}] {'  ' * level}{span.name} "
+                  f"{(span.duration or 0.0) * 1000:.1f}ms{error}")
+
+
+class FileExporter(SpanExporter):
+    """Append spans as JSON lines to a local file"""
+
+    def __init__(self, path: str):
+        self.path = path
+
+    def export(self, spans: List[Span]):
+        with open(self.path, "a", encoding="utf-8") as f:
+            for span in spans:
+                f.write(json.dumps(span.to_dict(), ensure_ascii=False, default=str) + "\n")
+
+
+class OTLPExporter(SpanExporter):
+    """Send spans to an OpenTelemetry collector (OTLP/HTTP with JSON encoding)"""
+
+    def __init__(self, endpoint: str, service_name: str, timeout: float = 5.0):
+        import httpx  # Only needed when exporting over OTLP
+        self.url = endpoint.rstrip("/") + "/v1/traces"
+        self.service_name = service_name
+        self.timeout = timeout
+        self.client = httpx.Client(timeout=timeout)
+
+    def after_fork(self):
+        """Use a new connection pool in a forked worker"""
+        import httpx
+        self.client = httpx.Client(timeout=self.timeout)
+
+    @staticmethod
+    def _attribute(key: str, value) -> dict:
+        if isinstance(value, bool):
+            return {"key": key, "value": {"boolValue": value}}
+        if isinstance(value, int):
+            return {"key": key, "value": {"intValue": str(value)}}
+        if isinstance(value, float):
+            return {"key": key, "value": {"doubleValue": value}}
+        return {"key": key, "value": {"stringValue": str(value)}}
+
+    def _span(self, span: Span) -> dict:
+        start = int(span.start_time * 1e9)
+        result = {
+            "traceId": span.trace.trace_id,
+            "spanId": span.span_id,
+            "name": span.name,
+            "kind": 2 if span.parent_id == span.trace.remote_parent_id else 1,  # SERVER / INTERNAL
+            "startTimeUnixNano": str(start),
+            "endTimeUnixNano": str(start + int((span.duration or 0.0) * 1e9)),
+            "attributes": [self._attribute(k, v) for k, v in span.attributes.items()],
+            "status": {"code": 2, "message": span.error} if span.error else {"code": 1},
+        }
+        if span.parent_id:
+            result["parentSpanId"] = span.parent_id
+        return result
+
+    def export(self, spans: List[Span]):
+        payload = {"resourceSpans": [{
+            "resource": {"attributes": [self._attribute("service.name", self.service_name)]},
+            "scopeSpans": [{
+                "scope": {"name": "ai-preinterview"},
+                "spans": [self._span(span) for span in spans],
+            }],
+        }]}
+        response = self.client.post(self.url, json=payload)
+        response.raise_for_status()
+
+
+class BackgroundExporter:
+    """Hands finished traces to an exporter on a daemon thread (never blocks requests)"""
+
+    def __init__(self, exporter: SpanExporter, max_queue: int = 1000):
+        self.exporter = exporter
+        self.max_queue = max_queue
+        self._start()
+        # Threads do not survive fork (preloading servers): start a fresh one in each worker
+        os.register_at_fork(after_in_child=self._after_fork)
+
+    def _start(self):
+        self._queue: "queue.Queue[List[Span]]" = queue.Queue(maxsize=self.max_queue)
+        self._thread = threading.Thread(target=self._run, name="trace-exporter", daemon=True)
+        self._thread.start()
+
+    def _after_fork(self):
+        reset = getattr(self.exporter, "after_fork", None)
+        if reset:
+            reset()
+        self._start()
+
+    def submit(self, trace: Trace):
+        if not trace.sampled:
+            return
+        try:
+            self._queue.put_nowait(list(trace.finished))
+        except queue.Full:
+            pass  # Drop traces rather than slow down requests
+
+    def _run(self):
+        while True:
+            spans = self._queue.get()
+            try:
+                self.exporter.export(spans)
+            except Exception as e:
+                print(f"Trace export error: {e}")
+
+
+def create_exporter(kind: str, file_path: str, otlp_endpoint: Optional[str], service_name: str) -> Optional[BackgroundExporter]:
+    """
+    Create the configured exporter
+
+    Args:
+        kind: "console", "file", "otlp" or empty to disable exporting
+
+    Returns:
+        Background exporter, or None if exporting is disabled
+    """
+    kind = (kind or "").lower()
+    if not kind:
+        return None
+    if kind == "console":
+        return BackgroundExporter(ConsoleExporter())
+    if kind == "file":
+        return BackgroundExporter(FileExporter(file_path))
+    if kind == "otlp":
+        if not otlp_endpoint:
+            print("Tracing: OTLP exporter selected but TRACING_OTLP_ENDPOINT is not set")
+            return None
+        return BackgroundExporter(OTLPExporter(otlp_endpoint, service_name))
+    print(f"Tracing: unknown exporter '{kind}', exporting disabled")
+    return None
@@ -1,22 +1,64 @@
 """
 AI Pre-Interview Backend Application
 """
-from fastapi import FastAPI, Request, status
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from typing import Optional
+
+from fastapi import FastAPI, Request, Response, status
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.exceptions import RequestValidationError
 from fastapi.responses import JSONResponse
 from .core.config import get_settings
-from .api import interview, questions
+from .core.metrics import CONTENT_TYPE, HTTP_REQUEST_DURATION, REGISTRY
+from .core.tracing import create_exporter, start_trace
+from .core.loop_monitor import get_loop_monitor
+from .core.profiling import RequestProfiler, profile_store
+from .api import interview, questions, admin
+from .services.ai_service import get_ai_service
+from .services.interview_service import get_interview_service
+from .services.parser_service import get_parser_service
+from .services.warmup import readiness, warm_services, warm_up
 
 settings = get_settings()
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Warm up services, start and stop background monitors"""
+    warmup_task = None
+    if settings.warmup_enabled:
+        # Build the singletons before serving so no request pays for it
+        await asyncio.to_thread(warm_services, readiness)
+        # Provider connections are warmed in the background; /ready reports when done
+        warmup_task = asyncio.create_task(warm_up(readiness, settings))
+    else:
+        readiness.complete()
+    
+    monitor = get_loop_monitor() if settings.loop_monitor_enabled else None
+    if monitor:
+        monitor.start()
+    yield
+    readiness.stopping = True
+    if warmup_task:
+        warmup_task.cancel()
+    if monitor:
+        await monitor.stop()
+    await get_parser_service().aclose()
+    cassette = get_ai_service().cassette
+    if cassette:
+        cassette.close()
+
+
 # Create FastAPI application
 app = FastAPI(
     title=settings.app_name,
     description="AI Quick Interview System - Logical Thinking Assessment",
     version="0.1.0",
     docs_url="/docs",
-    redoc_url="/redoc"
+    redoc_url="/redoc",
+    lifespan=lifespan
 )
 
 # Configure CORS
@@ -29,6 +71,110 @@ app.add_middleware(
 )
 
 
+def _route_template(request: Request) -> Optional[str]:
+    """Get the matched route path template, including router prefixes"""
+    route = request.scope.get("route")
+    path_format = getattr(route, "path_format", None)
+    if not path_format:
+        return None
+    # Routes of included routers may hold their path without the prefix; the prefix is
+    # the part of the request path in front of what the route itself matches
+    path = request.scope.get("path", "")
+    for i, char in enumerate(path):
+        if char == "/" and route.path_regex.match(path[i:]):
+            return path[:i] + path_format
+    return path_format
+
+
+@app.middleware("http")
+async def record_request_metrics(request: Request, call_next):
+    """Record request latency per route template"""
+    started = time.perf_counter()
+    status_code = 500
+    try:
+        response = await call_next(request)
+        status_code = response.status_code
+        return response
+    finally:
+        route_path = _route_template(request) or "unmatched"
+        HTTP_REQUEST_DURATION.labels(request.method, route_path, str(status_code)).observe(
+            time.perf_counter() - started
+        )
+
+
+trace_exporter = create_exporter(
+    settings.tracing_exporter,
+    file_path=settings.tracing_file_path,
+    otlp_endpoint=settings.tracing_otlp_endpoint,
+    service_name=settings.app_name
+)
+
+
+@app.middleware("http")
+async def trace_requests(request: Request, call_next):
+    """Trace the request and report per-stage timings in the Server-Timing header"""
+    with start_trace(
+        f"{request.method} {request.url.path}",
+        traceparent=request.headers.get("traceparent"),
+        sample_rate=settings.tracing_sample_rate,
+        **{"http.method": request.method, "http.target": request.url.path}
+    ) as root:
+        try:
+            response = await call_next(request)
+            root.set_attribute("http.status_code", response.status_code)
+        finally:
+            route_path = _route_template(request)
+            if route_path:
+                root.name = f"{request.method} {route_path}"
+    
+    if trace_exporter:
+        trace_exporter.submit(root.trace)
+    if settings.server_timing_enabled:
+        response.headers["Server-Timing"] = root.trace.server_timing(root)
+    response.headers["X-Trace-Id"] = root.trace.trace_id
+    return response
+
+
+@app.middleware("http")
+async def check_blocking_calls(request: Request, call_next):
+    """Fail requests during which the event loop was blocked (strict loop monitoring only)"""
+    if not (settings.loop_monitor_enabled and settings.loop_monitor_strict):
+        return await call_next(request)
+    monitor = get_loop_monitor()
+    violations = monitor.track_request()
+    response = await call_next(request)
+    monitor.check(violations)
+    return response
+
+
+async def profile_request(request: Request, call_next):
+    """Profile one request when asked with an X-Profile header (admin key required)"""
+    if "x-profile" not in request.headers or not admin.is_admin_key(request.headers.get("x-admin-key")):
+        return await call_next(request)
+    
+    profiler = RequestProfiler()
+    try:
+        profiler.start()
+    except (RuntimeError, ValueError):
+        # Another profiler is active on this thread
+        return await call_next(request)
+    try:
+        response = await call_next(request)
+    finally:
+        profile = profiler.stop()
+        profile_store.add(profile)
+    
+    summary = f"{profile.engine}: {profile.summary}".encode("ascii", "replace").decode("ascii")
+    response.headers["X-Profile-Id"] = profile.id
+    response.headers["X-Profile-Summary"] = summary
+    return response
+
+
+# Only installed when enabled, so there is no per-request cost otherwise
+if settings.profiling_enabled:
+    app.middleware("http")(profile_request)
+
+
 # Add exception handler for validation errors
 @app.exception_handler(RequestValidationError)
 async def validation_exception_handler(request: Request, exc: RequestValidationError):
@@ -54,6 +200,7 @@ async def validation_exception_handler(request: Request, exc: RequestValidationE
 # Register routers
 app.include_router(interview.router, prefix="/api")
 app.include_router(questions.router, prefix="/api")
+app.include_router(admin.router, prefix="/api")
 
 
 @app.get("/")
@@ -69,8 +216,43 @@ async def root():
 
 @app.get("/health")
 async def health_check():
-    """Health check endpoint"""
-    return {"status": "healthy"}
+    """
+    Health check endpoint
+    
+    Reports "degraded" while any AI provider circuit breaker is not closed
+    (rule-based fallbacks are served during that time)
+    """
+    ai_service = get_ai_service()
+    breakers = ai_service.get_breaker_states()
+    degraded = any(b["state"] != "closed" for b in breakers.values())
+    return {
+        "status": "degraded" if degraded else "healthy",
+        "circuit_breakers": breakers,
+        "event_loop": get_loop_monitor().snapshot(),
+        "evaluation_routing": ai_service.get_routing_stats()
+    }
+
+
+@app.get("/ready")
+async def readiness_check(response: Response):
+    """
+    Readiness check endpoint
+    
+    Returns 503 until the start-up warm-up has finished (and while shutting
+    down), so load balancers only route traffic to warm workers
+    """
+    result = readiness.snapshot()
+    if result["status"] != "ready":
+        response.status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    return result
+
+
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    """Prometheus metrics endpoint"""
+    # Make sure session gauges are registered even before the first interview request
+    get_interview_service()
+    return Response(content=REGISTRY.render(), media_type=CONTENT_TYPE)
 
 
 if __name__ == "__main__":
@@ -2,7 +2,7 @@
 Interview related data models
 """
 from pydantic import BaseModel, Field
-from typing import Optional, List
+from typing import Optional, List, Dict
 from enum import Enum
 from datetime import datetime
 
@@ -50,6 +50,7 @@ class Question(BaseModel):
     explanation: str                    # Answer explanation
     key_points: List[str]               # Key evaluation points
     tags: List[str] = []                # Tags
+    synonyms: Dict[str, List[str]] = {}  # Extra surface forms per key point (rule-based matching)
 
 
 class QuestionDisplay(BaseModel):
@@ -63,6 +64,41 @@ class QuestionDisplay(BaseModel):
     key_points: List[str]               # Key evaluation points
 
 
+class QuestionPage(BaseModel):
+    """One page of a question listing (with `fields`, items hold only those fields)"""
+    items: List[Question] = []
+    next_cursor: Optional[str] = None   # Pass as `cursor` for the next page; None on the last page
+    total: int                          # Number of questions matching the filters
+
+
+class QuestionSearchHit(BaseModel):
+    """Search result entry"""
+    score: float                        # BM25 relevance
+    question: Question
+
+
+class QuestionSearchResult(BaseModel):
+    """Full-text search results, best first"""
+    items: List[QuestionSearchHit] = []
+    total: int                          # Number of matching questions
+
+
+# ============ Usage Models ============
+
+class SessionUsage(BaseModel):
+    """AI provider usage and estimated cost accumulated by a session"""
+    llm_calls: int = 0
+    input_tokens: int = 0
+    output_tokens: int = 0
+    cached_tokens: int = 0              # Input tokens served from the provider cache
+    asr_seconds: float = 0.0            # Audio transcribed
+    tts_characters: int = 0             # Text synthesized
+    tts_seconds: float = 0.0            # Audio synthesized
+    estimated_cost: float = 0.0         # In the currency of the cost_* settings
+    degraded: bool = False              # Cheaper paths were used because of a budget
+    budget_level: str = "ok"            # Budget level at the last check (ok / degraded / exhausted)
+
+
 # ============ Interview Session Models ============
 
 class CreateInterviewRequest(BaseModel):
@@ -84,6 +120,7 @@ class InterviewSession(BaseModel):
     current_question_index: int = 0
     questions: List[Question] = []
     answers: List["AnswerRecord"] = []
+    usage: SessionUsage = Field(default_factory=SessionUsage)
     created_at: datetime
     completed_at: Optional[datetime] = None
 
@@ -176,6 +213,9 @@ class InterviewReport(BaseModel):
     # Time information
     interview_duration: int     # Interview duration (seconds)
     created_at: datetime
+    
+    # AI usage of the session (including this report)
+    usage: Optional[SessionUsage] = None
 
 
 # ============ Common Response Models ============
@@ -2,39 +2,104 @@
 AI Service - Provides LLM, ASR, TTS capabilities using DashScope SDK
 """
 import os
-import json
+import math
 import base64
+import time
 import asyncio
+import functools
+import importlib
 import threading
-from typing import Optional, List, Callable
+from typing import Optional, List, Callable, Tuple
 from http import HTTPStatus
-
-import dashscope
-from dashscope import Generation
-from dashscope.audio.qwen_tts_realtime import QwenTtsRealtime, QwenTtsRealtimeCallback, AudioFormat
-from dashscope.audio.qwen_omni import OmniRealtimeConversation, OmniRealtimeCallback, MultiModality
-from dashscope.audio.qwen_omni.omni_realtime import TranscriptionParams
+from types import SimpleNamespace
 
 from ..core.config import get_settings
+from ..core.resilience import (
+    Deadline, LatencyTracker, RetryPolicy, call_with_retry, is_retryable_error
+)
+from ..core.tracing import current_span, start_span, traced
+from ..core.circuit_breaker import (
+    CircuitBreaker, CircuitOpenError, CircuitState, is_breaker_failure_status
+)
+from ..core.metrics import (
+    CIRCUIT_STATE, LLM_TOKENS, UPSTREAM_ERRORS, UPSTREAM_FALLBACKS, UPSTREAM_REQUEST_DURATION
+)
+from .model_router import ModelRouter, EvaluationTier
+from .cost_service import BudgetExceededError, BudgetLevel, CostTracker
+from .cassette import create_cassette
+from .keypoint_matcher import get_matcher
+from .llm_json import IncrementalJSONParser, coerce_evaluation, parse_json_lenient, valid_json_prefix
 from ..schemas.interview import (
     Question, AnswerEvaluation, InterviewReport, 
-    QuestionReport, AnswerRecord
+    QuestionReport, AnswerRecord, SessionUsage
 )
 
 
+# TTS output is PCM 24kHz mono 16-bit
+TTS_BYTES_PER_SECOND = 24000 * 2
+
+
 class AIService:
     """AI service wrapper using DashScope SDK for LLM, ASR, TTS"""
     
     def __init__(self):
         self.settings = get_settings()
-        self._init_dashscope()
+        self.llm_retry_policy = RetryPolicy(
+            attempt_timeout=self.settings.llm_timeout,
+            max_retries=self.settings.llm_max_retries,
+            backoff_base=self.settings.llm_backoff_base,
+            backoff_max=self.settings.llm_backoff_max,
+            hedge_enabled=self.settings.llm_hedge_enabled,
+            hedge_min_delay=self.settings.llm_hedge_min_delay
+        )
+        self.llm_latency = LatencyTracker()
+        self.breakers = {
+            service: self._create_breaker(service)
+            for service in ("llm", "asr", "tts")
+        }
+        self.router = ModelRouter(
+            fast_model=self.settings.llm_fast_model,
+            trivial_chars=self.settings.routing_trivial_chars,
+            long_chars=self.settings.routing_long_chars,
+            min_confidence=self.settings.routing_min_confidence,
+            max_disagreement=self.settings.routing_max_disagreement
+        )
+        self.costs = CostTracker(self.settings)
+        self.cassette = create_cassette(
+            self.settings.cassette_mode,
+            self.settings.cassette_path,
+            self.settings.cassette_time_scale
+        )
+        CIRCUIT_STATE.set_function(lambda: {
+            (service,): int(breaker.state != CircuitState.CLOSED)
+            for service, breaker in self.breakers.items()
+        })
+    
+    def _create_breaker(self, service: str) -> CircuitBreaker:
+        """Create circuit breaker for a provider service"""
+        return CircuitBreaker(
+            name=service,
+            failure_rate_threshold=self.settings.breaker_failure_rate,
+            slow_call_seconds=self.settings.breaker_slow_call_seconds,
+            slow_call_rate_threshold=self.settings.breaker_slow_call_rate,
+            window=self.settings.breaker_window,
+            min_calls=self.settings.breaker_min_calls,
+            open_seconds=self.settings.breaker_open_seconds,
+            half_open_calls=self.settings.breaker_half_open_calls
+        )
     
-    def _init_dashscope(self):
-        """Initialize DashScope API key"""
-        # Priority: llm_api_key > DASHSCOPE_API_KEY env var
-        api_key = self.settings.llm_api_key or os.environ.get('DASHSCOPE_API_KEY')
-        if api_key:
-            dashscope.api_key = api_key
+    def get_breaker_states(self) -> dict:
+        """Get circuit breaker state of each provider service"""
+        return {service: breaker.snapshot() for service, breaker in self.breakers.items()}
+    
+    def get_routing_stats(self) -> dict:
+        """Get per-tier evaluation routing metrics"""
+        return self.router.snapshot()
+    
+    @property
+    def llm_configured(self) -> bool:
+        """Whether an LLM API key is set (answers are graded by the rule engine without one)"""
+        return bool(self._get_api_key("llm"))
     
     def _get_api_key(self, service: str = "llm") -> Optional[str]:
         """Get API key for specific service"""
@@ -45,13 +110,38 @@ class AIService:
         else:
             return self.settings.llm_api_key or os.environ.get('DASHSCOPE_API_KEY')
     
+    def _realtime_client(self, factory, service: str, callback, **kwargs):
+        """Create a realtime SDK client (recorded or replayed when a cassette is active)"""
+        if self.cassette:
+            return self.cassette.realtime(factory, service, callback, **kwargs)
+        return factory(callback=callback, **kwargs)
+    
     # ============ LLM Service ============
     
+    def _generation_base_address(self) -> Optional[str]:
+        """
+        Native DashScope API base derived from Settings.llm_api_base
+        
+        The setting holds the OpenAI-compatible endpoint; the Generation API
+        lives under /api/v1 of the same host. Pointing llm_api_base at another
+        host (e.g. the local stand-in in bench/) redirects all LLM calls.
+        """
+        base = (self.settings.llm_api_base or "").rstrip("/")
+        if not base:
+            return None
+        if base.endswith("/compatible-mode/v1"):
+            base = base[:-len("/compatible-mode/v1")] + "/api/v1"
+        return base
+    
+    @traced("dashscope.generation")
     def _call_llm(
         self,
         messages: List[dict],
         response_format: Optional[dict] = None,
-        stream: bool = False
+        stream: bool = False,
+        timeout: Optional[float] = None,
+        model: Optional[str] = None,
+        max_tokens: Optional[int] = None
     ):
         """
         Call LLM using DashScope Generation API
@@ -60,14 +150,18 @@ class AIService:
             messages: Chat messages
             response_format: Response format (e.g., {'type': 'json_object'})
             stream: Whether to use streaming
+            timeout: Request timeout in seconds (SDK default if not set)
+            model: Model name (Settings.llm_model if not set)
+            max_tokens: Output token limit (model default if not set)
         
         Returns:
             Response object or generator for streaming
         """
         kwargs = {
-            "model": self.settings.llm_model,
+            "model": model or self.settings.llm_model,
             "messages": messages,
             "result_format": "message",
+            "api_key": self._get_api_key("llm"),
         }
         
         if response_format:
@@ -77,34 +171,345 @@ class AIService:
             kwargs["stream"] = True
             kwargs["incremental_output"] = True
         
-        return Generation.call(**kwargs)
+        if timeout:
+            kwargs["request_timeout"] = max(1, math.ceil(timeout))
+        
+        if max_tokens:
+            kwargs["max_tokens"] = max_tokens
+        
+        base_address = self._generation_base_address()
+        if base_address:
+            kwargs["base_address"] = base_address
+        
+        span = current_span()
+        if span:
+            span.set_attribute("model", kwargs["model"])
+        if self.cassette:
+            return self.cassette.generation(_generation_call, kwargs)
+        return _generation_call(**kwargs)
+    
+    @traced("dashscope.generation_stream")
+    def _collect_stream(
+        self,
+        messages: List[dict],
+        response_format: Optional[dict] = None,
+        timeout: Optional[float] = None,
+        model: Optional[str] = None,
+        max_tokens: Optional[int] = None,
+        stop_when: Optional[Callable[[dict], bool]] = None
+    ):
+        """
+        Stream an LLM call and collect it into a response-like object
+        
+        JSON output is parsed chunk by chunk. Reading stops at the closing
+        brace, or as soon as stop_when (called from the worker thread with
+        the fields complete so far) returns True; the response then has
+        `stopped=True` and its `fields` hold what arrived. If the stream
+        breaks after some content arrived, the partial content is returned
+        with status 206 so it can be repaired or continued.
+        """
+        parser = IncrementalJSONParser()
+        parts = []
+        last_chunk = None
+        status_code = HTTPStatus.OK
+        code = message = ""
+        stopped = False
+        
+        try:
+            for chunk in self._call_llm(
+                messages=messages,
+                response_format=response_format,
+                stream=True,
+                timeout=timeout,
+                model=model,
+                max_tokens=max_tokens
+            ):
+                if chunk.status_code != HTTPStatus.OK:
+                    if not parts:
+                        return chunk
+                    status_code, code, message = HTTPStatus.PARTIAL_CONTENT, chunk.code, chunk.message
+                    break
+                last_chunk = chunk
+                text = chunk.output.choices[0].message.content or ""
+                parts.append(text)
+                # Closing the stream early also stops generation (and billing) upstream
+                if parser.feed(text) and stop_when and stop_when(parser.fields):
+                    stopped = True
+                    break
+                if parser.done:
+                    break
+        except Exception as e:
+            if not parts:
+                raise
+            status_code, code, message = HTTPStatus.PARTIAL_CONTENT, type(e).__name__, str(e)
+        
+        return SimpleNamespace(
+            status_code=status_code,
+            code=code,
+            message=message,
+            output=SimpleNamespace(choices=[
+                SimpleNamespace(message=SimpleNamespace(content="".join(parts)))
+            ]),
+            usage=getattr(last_chunk, "usage", None),
+            fields=parser.fields,
+            stopped=stopped
+        )
+    
+    @traced("llm.call")
+    async def _call_llm_async(
+        self,
+        messages: List[dict],
+        response_format: Optional[dict] = None,
+        deadline: Optional[Deadline] = None,
+        model: Optional[str] = None,
+        stream: bool = False,
+        usage: Optional[SessionUsage] = None,
+        max_tokens: Optional[int] = None,
+        stop_when: Optional[Callable[[dict], bool]] = None
+    ):
+        """
+        Call LLM off the event loop with per-attempt deadlines, retries and hedging
+        
+        Args:
+            messages: Chat messages
+            response_format: Response format (e.g., {'type': 'json_object'})
+            deadline: Overall request budget (llm_request_budget if not set)
+            model: Model name (Settings.llm_model if not set)
+            stream: Stream the output and collect it into one response
+                (an interrupted stream yields status 206 with the partial content)
+            usage: Session usage the tokens and cost are added to
+            max_tokens: Output token limit (model default if not set)
+            stop_when: With stream, stop reading once this returns True for the
+                JSON fields received so far (see _collect_stream)
+        
+        Returns:
+            Response object of the winning attempt
+        
+        Raises:
+            CircuitOpenError: LLM circuit breaker is open
+        """
+        breaker = self.breakers["llm"]
+        if not breaker.allow_request():
+            UPSTREAM_ERRORS.labels("llm", "circuit_open").inc()
+            raise CircuitOpenError("LLM")
+        
+        if deadline is None:
+            deadline = Deadline(self.settings.llm_request_budget)
+        
+        started = time.monotonic()
+        try:
+            if stream:
+                call = functools.partial(self._collect_stream, stop_when=stop_when)
+            else:
+                call = self._call_llm
+            response = await call_with_retry(
+                lambda timeout: call(
+                    messages=messages,
+                    response_format=response_format,
+                    timeout=timeout,
+                    model=model,
+                    max_tokens=max_tokens
+                ),
+                policy=self.llm_retry_policy,
+                deadline=deadline,
+                latency=self.llm_latency,
+                name="llm"
+            )
+        except Exception as e:
+            # Timeouts and connection errors say the provider is unhealthy; a rejected
+            # request (bad input, SDK validation) says nothing about it
+            if is_retryable_error(e):
+                breaker.record_failure()
+            else:
+                breaker.record_ignored()
+            UPSTREAM_ERRORS.labels("llm", type(e).__name__).inc()
+            UPSTREAM_REQUEST_DURATION.labels("llm", "error").observe(time.monotonic() - started)
+            raise
+        
+        elapsed = time.monotonic() - started
+        if response.status_code in (HTTPStatus.OK, HTTPStatus.PARTIAL_CONTENT):
+            breaker.record_success(elapsed)
+            UPSTREAM_REQUEST_DURATION.labels("llm", "ok").observe(elapsed)
+            self._record_token_usage(response, model or self.settings.llm_model, usage)
+        else:
+            # With a revoked key or an exhausted quota (401/403/429) every call fails the same
+            # way, so the breaker must open instead of paying for them. Other 4xx responses
+            # (DataInspectionFailed, oversized input) are this request's fault, not the provider's
+            if is_breaker_failure_status(response.status_code):
+                breaker.record_failure()
+            else:
+                breaker.record_ignored()
+            UPSTREAM_REQUEST_DURATION.labels("llm", "error").observe(elapsed)
+            UPSTREAM_ERRORS.labels("llm", f"http_{int(response.status_code)}").inc()
+        return response
+    
+    def _record_token_usage(self, response, model: str, session_usage: Optional[SessionUsage] = None):
+        """Export token usage reported by the provider and account its cost"""
+        usage = getattr(response, "usage", None)
+        if not usage:
+            return
+        details = _usage_value(usage, "prompt_tokens_details") or {}
+        tokens = {
+            "input": int(_usage_value(usage, "input_tokens") or 0),
+            "output": int(_usage_value(usage, "output_tokens") or 0),
+            "cached": int(_usage_value(details, "cached_tokens") or 0),
+        }
+        for token_type, value in tokens.items():
+            if value:
+                LLM_TOKENS.labels(model, token_type).inc(value)
+        self.costs.record_llm(
+            session_usage, model,
+            input_tokens=tokens["input"],
+            output_tokens=tokens["output"],
+            cached_tokens=tokens["cached"]
+        )
+    
+    def _budget_model(self, usage: Optional[SessionUsage]) -> Optional[str]:
+        """Get the model for a feedback/report call under the current budget (None: skip the LLM)"""
+        budget, _ = self.costs.check(usage)
+        if budget == BudgetLevel.EXHAUSTED:
+            return None
+        if budget == BudgetLevel.DEGRADED and self.settings.llm_fast_model:
+            return self.settings.llm_fast_model
+        return self.settings.llm_model
     
     async def evaluate_answer(
         self,
         question: Question,
         selected_option: Optional[str],
-        explanation: str
+        explanation: str,
+        usage: Optional[SessionUsage] = None
     ) -> AnswerEvaluation:
         """
-        Evaluate user's answer using LLM
+        Evaluate user's answer using LLM (see evaluate_answer_with_tier)
         
         Args:
             question: The question
             selected_option: User's selected option
             explanation: User's explanation of solution approach
+            usage: Session usage to account the calls to and check budgets against
         
         Returns:
             Evaluation result
         """
+        evaluation, _ = await self.evaluate_answer_with_tier(question, selected_option, explanation, usage)
+        return evaluation
+    
+    @traced("ai.evaluate_answer")
+    async def evaluate_answer_with_tier(
+        self,
+        question: Question,
+        selected_option: Optional[str],
+        explanation: str,
+        usage: Optional[SessionUsage] = None
+    ) -> Tuple[AnswerEvaluation, EvaluationTier]:
+        """
+        Evaluate user's answer and report which tier produced the result
+        
+        Easy cases are decided by the rule engine or the fast model; the large
+        model is only used for long explanations or when the fast model is
+        unsure or disagrees with the rule engine (see ModelRouter). Near a
+        budget only the fast model is used; over it, the rule engine.
+        
+        Args:
+            question: The question
+            selected_option: User's selected option
+            explanation: User's explanation of solution approach
+            usage: Session usage to account the calls to and check budgets against
+        
+        Returns:
+            (evaluation, tier) - RULE also for rule-based fallbacks after a failed LLM call
+        """
         # Check if answer is correct
         is_correct = selected_option == question.correct_answer if selected_option else False
         
         if not self._get_api_key("llm"):
             # Fallback to rule-based evaluation if no API key
-            return self._rule_based_evaluation(question, selected_option, explanation, is_correct)
+            return self._rule_based_evaluation(question, selected_option, explanation, is_correct), EvaluationTier.RULE
+        
+        budget, _ = self.costs.check(usage)
+        if budget == BudgetLevel.EXHAUSTED:
+            return self._rule_based_evaluation(question, selected_option, explanation, is_correct), EvaluationTier.RULE
+        fast_only = budget == BudgetLevel.DEGRADED and bool(self.settings.llm_fast_model)
+        
+        tier = self.router.route(explanation, is_correct)
+        if fast_only and tier == EvaluationTier.LARGE:
+            tier = EvaluationTier.FAST
+        span = current_span()
+        if span:
+            span.set_attribute("tier", tier.value)
+        
+        if tier == EvaluationTier.RULE:
+            started = time.monotonic()
+            evaluation = self._rule_based_evaluation(question, selected_option, explanation, is_correct)
+            self.router.record(tier, time.monotonic() - started)
+            return evaluation, tier
+        
+        if tier == EvaluationTier.FAST:
+            rule_evaluation = self._rule_based_evaluation(question, selected_option, explanation, is_correct)
+            
+            def will_escalate(fields: dict) -> bool:
+                # score and confidence come first: once they call for the large model,
+                # the rest of the fast model's answer would be thrown away
+                return (
+                    "score" in fields and "confidence" in fields
+                    and self.router.should_escalate(fields, rule_evaluation)
+                )
+            
+            result = await self._llm_evaluate(
+                question, selected_option, explanation,
+                tier=EvaluationTier.FAST,
+                model=self.settings.llm_fast_model,
+                usage=usage,
+                stop_when=None if fast_only else will_escalate
+            )
+            if result is not None:
+                evaluation = self._to_answer_evaluation(result, is_correct)
+                if evaluation and (fast_only or not self.router.should_escalate(result, rule_evaluation)):
+                    return evaluation, EvaluationTier.FAST
+            if not fast_only:
+                self.router.record_escalation()
+        
+        if not fast_only:
+            result = await self._llm_evaluate(
+                question, selected_option, explanation,
+                tier=EvaluationTier.LARGE,
+                model=self.settings.llm_model,
+                usage=usage
+            )
+            evaluation = self._to_answer_evaluation(result, is_correct) if result is not None else None
+            if evaluation is not None:
+                return evaluation, EvaluationTier.LARGE
         
-        # Build evaluation prompt
-        prompt = self._build_evaluation_prompt(question, selected_option, explanation)
+        # Fallback to rule-based evaluation
+        UPSTREAM_FALLBACKS.labels("llm", "rule_based_evaluation").inc()
+        return self._rule_based_evaluation(question, selected_option, explanation, is_correct), EvaluationTier.RULE
+    
+    async def _llm_evaluate(
+        self,
+        question: Question,
+        selected_option: Optional[str],
+        explanation: str,
+        tier: EvaluationTier,
+        model: str,
+        usage: Optional[SessionUsage] = None,
+        stop_when: Optional[Callable[[dict], bool]] = None
+    ) -> Optional[dict]:
+        """
+        Run one LLM evaluation on the given tier
+        
+        Args:
+            stop_when: With streaming on, stop reading the answer once this
+                returns True for its fields; those fields are then the result
+        
+        Returns:
+            Parsed JSON result, or None if the call failed
+        """
+        with start_span("ai.build_prompt"):
+            prompt = self._build_evaluation_prompt(
+                question, selected_option, explanation,
+                with_confidence=tier == EvaluationTier.FAST
+            )
         
         messages = [
             {
@@ -114,42 +519,114 @@ class AIService:
             {"role": "user", "content": prompt}
         ]
         
+        started = time.monotonic()
         try:
-            response = self._call_llm(
+            response = await self._call_llm_async(
                 messages=messages,
-                response_format={"type": "json_object"}
+                response_format={"type": "json_object"},
+                model=model,
+                stream=self.settings.llm_stream_json,
+                usage=usage,
+                stop_when=stop_when
             )
             
-            if response.status_code == HTTPStatus.OK:
+            if getattr(response, "stopped", False):
+                self.router.record(tier, time.monotonic() - started)
+                return dict(response.fields)
+            if response.status_code in (HTTPStatus.OK, HTTPStatus.PARTIAL_CONTENT):
                 content = response.output.choices[0].message.content
-                result = json.loads(content)
-                return AnswerEvaluation(
-                    is_correct=is_correct,
-                    score=result.get("score", 60 if is_correct else 30),
-                    feedback=result.get("feedback", ""),
-                    hints=result.get("hints", []),
-                    key_points_hit=result.get("key_points_hit", []),
-                    key_points_missed=result.get("key_points_missed", [])
+                result = await self._recover_json(
+                    messages, content, required=("score", "feedback"), usage=usage
                 )
+                if result is not None:
+                    self.router.record(tier, time.monotonic() - started)
+                    return result
+                print(f"LLM evaluation returned unusable JSON ({model})")
             else:
-                print(f"LLM evaluation failed: {response.code} - {response.message}")
+                print(f"LLM evaluation failed ({model}): {response.code} - {response.message}")
+        except CircuitOpenError:
+            return None
         except Exception as e:
-            print(f"LLM evaluation error: {e}")
+            print(f"LLM evaluation error ({model}): {e}")
         
-        # Fallback to rule-based evaluation
-        return self._rule_based_evaluation(question, selected_option, explanation, is_correct)
+        self.router.record(tier, time.monotonic() - started, failed=True)
+        return None
+    
+    def _to_answer_evaluation(self, result: dict, is_correct: bool) -> Optional[AnswerEvaluation]:
+        """Convert LLM JSON result to evaluation model (None if it does not validate)"""
+        return coerce_evaluation(result, is_correct)
+    
+    @traced("llm.parse_json")
+    async def _recover_json(
+        self,
+        messages: List[dict],
+        content: Optional[str],
+        required: tuple,
+        usage: Optional[SessionUsage] = None
+    ) -> Optional[dict]:
+        """
+        Parse JSON output of an LLM call without throwing the call away
+        
+        Common defects (fences, trailing text, truncation) are repaired
+        locally. If required fields are still missing, the model is asked to
+        continue from the last complete field using partial (prefix) mode.
+        
+        Args:
+            messages: Messages of the original call
+            content: Raw output content
+            required: Fields the result must contain
+            usage: Session usage the continuation call is accounted to
+        
+        Returns:
+            Parsed object, or None if nothing usable could be recovered
+        """
+        def usable(result: Optional[dict]) -> bool:
+            return result is not None and all(key in result for key in required)
+        
+        result = parse_json_lenient(content, allow_truncated=False)
+        if usable(result):
+            return result
+        
+        prefix = valid_json_prefix(content or "")
+        if prefix:
+            try:
+                response = await self._call_llm_async(
+                    messages=messages + [{"role": "assistant", "content": prefix, "partial": True}],
+                    model=self.settings.llm_json_repair_model or self.settings.llm_fast_model,
+                    usage=usage
+                )
+                if response.status_code == HTTPStatus.OK:
+                    continued = parse_json_lenient(prefix + (response.output.choices[0].message.content or ""))
+                    if usable(continued):
+                        return continued
+                else:
+                    print(f"JSON continuation failed: {response.code} - {response.message}")
+            except CircuitOpenError:
+                pass
+            except Exception as e:
+                print(f"JSON continuation error: {e}")
+        
+        # Keep whatever complete fields survived truncation
+        result = parse_json_lenient(content)
+        return result if usable(result) else None
     
     def _build_evaluation_prompt(
         self,
         question: Question,
         selected_option: Optional[str],
-        explanation: str
+        explanation: str,
+        with_confidence: bool = False
     ) -> str:
-        """Build evaluation prompt"""
+        """Build evaluation prompt (with_confidence asks for a self-reported confidence)"""
         options_text = ""
         if question.options:
             options_text = "\n".join([f"{o.key}. {o.content}" for o in question.options])
         
+        # Right after the score: a streamed answer can be cut off once both decide escalation
+        confidence_field = ""
+        if with_confidence:
+            confidence_field = '\n    "confidence": 0-100, how confident you are in this score,'
+        
         return f"""Please evaluate the following interview answer:
 
 ## Question
@@ -170,13 +647,14 @@ Problem-solving Approach: {explanation}
 
 ## Please output JSON format evaluation result (respond in Chinese)
 {{
-    "score": 0-100 score,
+    "score": 0-100 score,{confidence_field}
     "feedback": "Feedback for the candidate, friendly and professional tone, point out errors if any, acknowledge good approaches",
     "hints": ["Hints if candidate is stuck or has wrong approach"],
     "key_points_hit": ["Key points the candidate mentioned or got right"],
     "key_points_missed": ["Key points the candidate missed"]
 }}"""
     
+    @traced("ai.rule_based")
     def _rule_based_evaluation(
         self,
         question: Question,
@@ -185,39 +663,59 @@ Problem-solving Approach: {explanation}
         is_correct: bool
     ) -> AnswerEvaluation:
         """Rule-based evaluation (fallback when LLM unavailable)"""
-        score = 0
-        feedback = ""
+        key_points_hit = get_matcher(question).match(explanation)
+        return self._score_rule_based(question, is_correct, key_points_hit)
+    
+    def rule_based_evaluate_many(
+        self,
+        question: Question,
+        answers: List[tuple]
+    ) -> List[AnswerEvaluation]:
+        """
+        Rule-based evaluation of many answers to the same question
+        
+        Args:
+            question: The question
+            answers: List of (selected_option, explanation)
+        
+        Returns:
+            Evaluation results in input order
+        """
+        matcher = get_matcher(question)
+        hits = matcher.match_many(explanation for _, explanation in answers)
+        return [
+            self._score_rule_based(
+                question,
+                selected_option == question.correct_answer if selected_option else False,
+                key_points_hit
+            )
+            for (selected_option, _), key_points_hit in zip(answers, hits)
+        ]
+    
+    def _score_rule_based(
+        self,
+        question: Question,
+        is_correct: bool,
+        key_points_hit: List[str]
+    ) -> AnswerEvaluation:
+        """Build rule-based evaluation from matched key points"""
         hints = []
-        key_points_hit = []
-        key_points_missed = question.key_points.copy()
+        hit = set(key_points_hit)
+        key_points_missed = [point for point in question.key_points if point not in hit]
         
         if is_correct:
-            score = 70
+            score = min(70 + 10 * len(key_points_hit), 100)
             feedback = "Correct answer!"
             
-            for point in question.key_points:
-                if point.lower() in explanation.lower():
-                    key_points_hit.append(point)
-                    key_points_missed.remove(point)
-                    score += 10
-            
             if key_points_hit:
                 feedback += f" Your approach mentioned {', '.join(key_points_hit)}, well done!"
             
             if key_points_missed:
                 feedback += f" You could also consider {', '.join(key_points_missed)}."
-            
-            score = min(score, 100)
         else:
-            score = 30
+            score = 30 + 5 * len(key_points_hit)
             feedback = f"Not quite right. The correct answer is {question.correct_answer}."
             
-            for point in question.key_points:
-                if point.lower() in explanation.lower():
-                    key_points_hit.append(point)
-                    key_points_missed.remove(point)
-                    score += 5
-            
             if key_points_hit:
                 feedback += f" However, you mentioned {', '.join(key_points_hit)}, showing the right direction."
             
@@ -232,10 +730,12 @@ Problem-solving Approach: {explanation}
             key_points_missed=key_points_missed
         )
     
+    @traced("ai.generate_feedback")
     async def generate_interview_feedback(
         self,
         question: Question,
-        evaluation: AnswerEvaluation
+        evaluation: AnswerEvaluation,
+        usage: Optional[SessionUsage] = None
     ) -> str:
         """
         Generate interviewer's verbal feedback using LLM
@@ -243,6 +743,7 @@ Problem-solving Approach: {explanation}
         Args:
             question: The question
             evaluation: Evaluation result
+            usage: Session usage to account the call to and check budgets against
         
         Returns:
             Conversational feedback text
@@ -250,6 +751,10 @@ Problem-solving Approach: {explanation}
         if not self._get_api_key("llm"):
             return evaluation.feedback
         
+        model = self._budget_model(usage)
+        if model is None:
+            return evaluation.feedback
+        
         messages = [
             {
                 "role": "system", 
@@ -276,13 +781,16 @@ Please output the feedback text directly, no other formatting."""
         ]
         
         try:
-            response = self._call_llm(messages=messages)
+            response = await self._call_llm_async(messages=messages, model=model, usage=usage)
             
             if response.status_code == HTTPStatus.OK:
                 return response.output.choices[0].message.content.strip()
+        except CircuitOpenError:
+            pass
         except Exception as e:
             print(f"Generate feedback error: {e}")
         
+        UPSTREAM_FALLBACKS.labels("llm", "static_feedback").inc()
         return evaluation.feedback
     
     async def generate_report(
@@ -292,7 +800,8 @@ Please output the feedback text directly, no other formatting."""
         position: Optional[str],
         questions: List[Question],
         answers: List[AnswerRecord],
-        duration: int
+        duration: int,
+        usage: Optional[SessionUsage] = None
     ) -> InterviewReport:
         """
         Generate interview report
@@ -304,6 +813,7 @@ Please output the feedback text directly, no other formatting."""
             questions: Question list
             answers: Answer records
             duration: Interview duration (seconds)
+            usage: Session usage (accounted, checked against budgets and included in the report)
         
         Returns:
             Interview report
@@ -342,7 +852,7 @@ Please output the feedback text directly, no other formatting."""
         
         # Generate detailed analysis using LLM
         strengths, weaknesses, overall_comment, recommendation = await self._generate_report_analysis(
-            questions, answers, avg_score, correct_count, total_questions
+            questions, answers, avg_score, correct_count, total_questions, usage=usage
         )
         
         return InterviewReport(
@@ -361,21 +871,28 @@ Please output the feedback text directly, no other formatting."""
             overall_comment=overall_comment,
             recommendation=recommendation,
             interview_duration=duration,
-            created_at=datetime.now()
+            created_at=datetime.now(),
+            usage=usage.model_copy() if usage is not None else None
         )
     
+    @traced("ai.report_analysis")
     async def _generate_report_analysis(
         self,
         questions: List[Question],
         answers: List[AnswerRecord],
         avg_score: int,
         correct_count: int,
-        total_questions: int
+        total_questions: int,
+        usage: Optional[SessionUsage] = None
     ) -> tuple:
         """Generate report analysis content using LLM"""
         if not self._get_api_key("llm"):
             return self._rule_based_report_analysis(avg_score, correct_count, total_questions)
         
+        model = self._budget_model(usage)
+        if model is None:
+            return self._rule_based_report_analysis(avg_score, correct_count, total_questions)
+        
         # Build analysis prompt
         answers_summary = []
         for i, (q, a) in enumerate(zip(questions, answers)):
@@ -410,23 +927,33 @@ Please output in JSON format:
         ]
         
         try:
-            response = self._call_llm(
+            response = await self._call_llm_async(
                 messages=messages,
-                response_format={"type": "json_object"}
+                response_format={"type": "json_object"},
+                model=model,
+                stream=self.settings.llm_stream_json,
+                usage=usage
             )
             
-            if response.status_code == HTTPStatus.OK:
+            if response.status_code in (HTTPStatus.OK, HTTPStatus.PARTIAL_CONTENT):
                 content = response.output.choices[0].message.content
-                result = json.loads(content)
+                result = await self._recover_json(
+                    messages, content, required=("strengths", "overall_comment"), usage=usage
+                )
+                if result is None:
+                    raise ValueError("unusable JSON in report analysis")
                 return (
                     result.get("strengths", []),
                     result.get("weaknesses", []),
                     result.get("overall_comment", ""),
                     result.get("recommendation", "")
                 )
+        except CircuitOpenError:
+            pass
         except Exception as e:
             print(f"Generate report analysis error: {e}")
         
+        UPSTREAM_FALLBACKS.labels("llm", "rule_based_report").inc()
         return self._rule_based_report_analysis(avg_score, correct_count, total_questions)
     
     def _rule_based_report_analysis(
@@ -472,12 +999,14 @@ Please output in JSON format:
     
     # ============ ASR Service (Speech to Text) ============
     
+    @traced("dashscope.asr")
     async def speech_to_text(
         self, 
         audio_data: bytes, 
         sample_rate: int = 16000,
         audio_format: str = "pcm",
-        language: str = "zh"
+        language: str = "zh",
+        usage: Optional[SessionUsage] = None
     ) -> str:
         """
         Speech to text using DashScope ASR
@@ -487,20 +1016,43 @@ Please output in JSON format:
             sample_rate: Audio sample rate (default 16000)
             audio_format: Audio format (pcm, wav)
             language: Language code (zh, en)
+            usage: Session usage to account the audio to and check budgets against
         
         Returns:
             Transcribed text
+        
+        Raises:
+            BudgetExceededError: Session or daily budget is exhausted
         """
         api_key = self._get_api_key("asr")
         if not api_key:
             raise ValueError("ASR API key not configured")
         
+        if self.costs.check(usage)[0] == BudgetLevel.EXHAUSTED:
+            raise BudgetExceededError("ASR")
+        
+        breaker = self.breakers["asr"]
+        if not breaker.allow_request():
+            UPSTREAM_ERRORS.labels("asr", "circuit_open").inc()
+            raise CircuitOpenError("ASR")
+        started = time.monotonic()
+        
+        await asyncio.to_thread(import_realtime_sdk)
+        import dashscope
+        from dashscope.audio.qwen_omni import OmniRealtimeConversation, OmniRealtimeCallback, MultiModality
+        from dashscope.audio.qwen_omni.omni_realtime import TranscriptionParams
+        
         # Set API key for this request
         dashscope.api_key = api_key
         
         result_text = ""
         complete_event = asyncio.Event()
         error_message = None
+        loop = asyncio.get_running_loop()
+        
+        def complete():
+            # Callbacks run on the SDK's websocket thread
+            loop.call_soon_threadsafe(complete_event.set)
         
         class ASRCallback(OmniRealtimeCallback):
             def __init__(self):
@@ -518,27 +1070,28 @@ Please output in JSON format:
                     event_type = response.get('type', '')
                     if event_type == 'conversation.item.input_audio_transcription.completed':
                         result_text = response.get('transcript', '')
-                        complete_event.set()
+                        complete()
                     elif event_type == 'error':
                         error_message = response.get('error', {}).get('message', 'Unknown error')
-                        complete_event.set()
+                        complete()
                 except Exception as e:
                     error_message = str(e)
-                    complete_event.set()
+                    complete()
         
         callback = ASRCallback()
         
         # Use URL from config
         asr_url = self.settings.asr_api_base
         
-        conversation = OmniRealtimeConversation(
+        conversation = self._realtime_client(
+            OmniRealtimeConversation, "asr", callback,
             model=self.settings.asr_model,
-            url=asr_url,
-            callback=callback
+            url=asr_url
         )
         
         try:
-            conversation.connect()
+            # Connecting and the session handshake block on the network
+            await asyncio.to_thread(conversation.connect)
             
             transcription_params = TranscriptionParams(
                 language=language,
@@ -546,7 +1099,8 @@ Please output in JSON format:
                 input_audio_format=audio_format
             )
             
-            conversation.update_session(
+            await asyncio.to_thread(
+                conversation.update_session,
                 output_modalities=[MultiModality.TEXT],
                 enable_input_audio_transcription=True,
                 transcription_params=transcription_params
@@ -560,7 +1114,8 @@ Please output in JSON format:
                 conversation.append_audio(audio_b64)
                 await asyncio.sleep(0.05)
             
-            conversation.end_session()
+            # end_session blocks until the server confirms the session finished
+            await asyncio.to_thread(conversation.end_session)
             
             # Wait for completion with timeout
             try:
@@ -571,27 +1126,54 @@ Please output in JSON format:
             if error_message:
                 raise RuntimeError(f"ASR error: {error_message}")
             
+            breaker.record_success(time.monotonic() - started)
+            UPSTREAM_REQUEST_DURATION.labels("asr", "ok").observe(time.monotonic() - started)
+            # 16-bit mono samples
+            self.costs.record_asr(usage, len(audio_data) / (sample_rate * 2))
             return result_text
             
+        except Exception as e:
+            breaker.record_failure()
+            UPSTREAM_ERRORS.labels("asr", type(e).__name__).inc()
+            UPSTREAM_REQUEST_DURATION.labels("asr", "error").observe(time.monotonic() - started)
+            raise
         finally:
-            conversation.close()
+            await asyncio.to_thread(conversation.close)
     
     # ============ TTS Service (Text to Speech) ============
     
-    async def text_to_speech(self, text: str) -> bytes:
+    @traced("dashscope.tts")
+    async def text_to_speech(self, text: str, usage: Optional[SessionUsage] = None) -> bytes:
         """
         Text to speech using DashScope TTS
         
         Args:
             text: Text content to convert
+            usage: Session usage to account the speech to and check budgets against
         
         Returns:
             Audio data bytes (PCM 24kHz format)
+        
+        Raises:
+            BudgetExceededError: Session or daily budget is exhausted
         """
         api_key = self._get_api_key("tts")
         if not api_key:
             raise ValueError("TTS API key not configured")
         
+        if self.costs.check(usage)[0] == BudgetLevel.EXHAUSTED:
+            raise BudgetExceededError("TTS")
+        
+        breaker = self.breakers["tts"]
+        if not breaker.allow_request():
+            UPSTREAM_ERRORS.labels("tts", "circuit_open").inc()
+            raise CircuitOpenError("TTS")
+        started = time.monotonic()
+        
+        await asyncio.to_thread(import_realtime_sdk)
+        import dashscope
+        from dashscope.audio.qwen_tts_realtime import QwenTtsRealtime, QwenTtsRealtimeCallback, AudioFormat
+        
         # Set API key for this request
         dashscope.api_key = api_key
         
@@ -628,15 +1210,17 @@ Please output in JSON format:
         # Use URL from config
         tts_url = self.settings.tts_api_base
         
-        tts = QwenTtsRealtime(
+        tts = self._realtime_client(
+            QwenTtsRealtime, "tts", callback,
             model=self.settings.tts_model,
-            callback=callback,
             url=tts_url
         )
         
         try:
-            tts.connect()
-            tts.update_session(
+            # Connecting and the session handshake block on the network
+            await asyncio.to_thread(tts.connect)
+            await asyncio.to_thread(
+                tts.update_session,
                 voice=self.settings.tts_voice,
                 response_format=AudioFormat.PCM_24000HZ_MONO_16BIT,
                 mode='server_commit'
@@ -651,34 +1235,67 @@ Please output in JSON format:
             
             tts.finish()
             
-            # Wait for completion with timeout
-            complete_event.wait(timeout=60.0)
+            # Wait for completion with timeout (threading.Event, set by the SDK thread)
+            await asyncio.to_thread(complete_event.wait, 60.0)
             
             if error_message:
                 raise RuntimeError(f"TTS error: {error_message}")
             
-            return b''.join(audio_chunks)
+            breaker.record_success(time.monotonic() - started)
+            UPSTREAM_REQUEST_DURATION.labels("tts", "ok").observe(time.monotonic() - started)
+            audio = b''.join(audio_chunks)
+            self.costs.record_tts(usage, len(text), len(audio) / TTS_BYTES_PER_SECOND)
+            return audio
             
+        except Exception as e:
+            breaker.record_failure()
+            UPSTREAM_ERRORS.labels("tts", type(e).__name__).inc()
+            UPSTREAM_REQUEST_DURATION.labels("tts", "error").observe(time.monotonic() - started)
+            raise
         finally:
             pass  # Connection will be closed automatically
     
-    async def text_to_speech_stream(self, text: str, on_audio_chunk: Callable[[bytes], None]):
+    @traced("dashscope.tts_stream")
+    async def text_to_speech_stream(
+        self,
+        text: str,
+        on_audio_chunk: Callable[[bytes], None],
+        usage: Optional[SessionUsage] = None
+    ):
         """
         Streaming text to speech for real-time playback
         
         Args:
             text: Text content to convert
             on_audio_chunk: Callback function for each audio chunk
+            usage: Session usage to account the speech to and check budgets against
+        
+        Raises:
+            BudgetExceededError: Session or daily budget is exhausted
         """
         api_key = self._get_api_key("tts")
         if not api_key:
             raise ValueError("TTS API key not configured")
         
+        if self.costs.check(usage)[0] == BudgetLevel.EXHAUSTED:
+            raise BudgetExceededError("TTS")
+        
+        breaker = self.breakers["tts"]
+        if not breaker.allow_request():
+            UPSTREAM_ERRORS.labels("tts", "circuit_open").inc()
+            raise CircuitOpenError("TTS")
+        started = time.monotonic()
+        
+        await asyncio.to_thread(import_realtime_sdk)
+        import dashscope
+        from dashscope.audio.qwen_tts_realtime import QwenTtsRealtime, QwenTtsRealtimeCallback, AudioFormat
+        
         # Set API key for this request
         dashscope.api_key = api_key
         
         complete_event = threading.Event()
         error_message = None
+        audio_bytes = 0
         
         class TTSStreamCallback(QwenTtsRealtimeCallback):
             def on_open(self):
@@ -688,13 +1305,15 @@ Please output in JSON format:
                 pass
             
             def on_event(self, response):
-                nonlocal error_message
+                nonlocal error_message, audio_bytes
                 try:
                     event_type = response.get('type', '')
                     if event_type == 'response.audio.delta':
                         audio_b64 = response.get('delta', '')
                         if audio_b64:
-                            on_audio_chunk(base64.b64decode(audio_b64))
+                            chunk = base64.b64decode(audio_b64)
+                            audio_bytes += len(chunk)
+                            on_audio_chunk(chunk)
                     elif event_type == 'session.finished':
                         complete_event.set()
                     elif event_type == 'error':
@@ -709,15 +1328,17 @@ Please output in JSON format:
         # Use URL from config
         tts_url = self.settings.tts_api_base
         
-        tts = QwenTtsRealtime(
+        tts = self._realtime_client(
+            QwenTtsRealtime, "tts", callback,
             model=self.settings.tts_model,
-            callback=callback,
             url=tts_url
         )
         
         try:
-            tts.connect()
-            tts.update_session(
+            # Connecting and the session handshake block on the network
+            await asyncio.to_thread(tts.connect)
+            await asyncio.to_thread(
+                tts.update_session,
                 voice=self.settings.tts_voice,
                 response_format=AudioFormat.PCM_24000HZ_MONO_16BIT,
                 mode='server_commit'
@@ -727,16 +1348,57 @@ Please output in JSON format:
             tts.append_text(text)
             tts.finish()
             
-            # Wait for completion
-            complete_event.wait(timeout=60.0)
+            # Wait for completion (threading.Event, set by the SDK thread)
+            await asyncio.to_thread(complete_event.wait, 60.0)
             
             if error_message:
                 raise RuntimeError(f"TTS stream error: {error_message}")
             
+            breaker.record_success(time.monotonic() - started)
+            UPSTREAM_REQUEST_DURATION.labels("tts", "ok").observe(time.monotonic() - started)
+            self.costs.record_tts(usage, len(text), audio_bytes / TTS_BYTES_PER_SECOND)
+            
+        except Exception as e:
+            breaker.record_failure()
+            UPSTREAM_ERRORS.labels("tts", type(e).__name__).inc()
+            UPSTREAM_REQUEST_DURATION.labels("tts", "error").observe(time.monotonic() - started)
+            raise
         finally:
             pass
 
 
+_REALTIME_SDK_MODULES = (
+    "dashscope.audio.qwen_tts_realtime",
+    "dashscope.audio.qwen_omni",
+    "dashscope.audio.qwen_omni.omni_realtime",
+)
+
+
+def import_realtime_sdk():
+    """
+    Import the realtime audio SDK (blocking; run off the event loop)
+    
+    The DashScope SDK takes about half a second to import, so it is loaded
+    on first use rather than at module import: workers and tools that
+    never call a provider skip the cost entirely.
+    """
+    for name in _REALTIME_SDK_MODULES:
+        importlib.import_module(name)
+
+
+def _generation_call(**kwargs):
+    """DashScope Generation.call (runs in a worker thread, where the SDK is imported on first use)"""
+    from dashscope import Generation
+    return Generation.call(**kwargs)
+
+
+def _usage_value(usage, key: str):
+    """Read a usage field from a dict-like or attribute-style usage object"""
+    if isinstance(usage, dict):
+        return usage.get(key)
+    return getattr(usage, key, None)
+
+
 # Singleton instance
 _ai_service: Optional[AIService] = None
 
@@ -0,0 +1,284 @@
+"""
+Batch Service - Offline re-grading of stored answers
+"""
+import asyncio
+import hashlib
+import json
+from pathlib import Path
+from typing import AsyncIterable, AsyncIterator, Dict, Iterable, List, Optional, Set, Tuple, Union
+
+from ..schemas.interview import Question
+from .ai_service import AIService, get_ai_service
+from .model_router import EvaluationTier
+from .question_service import QuestionService, get_question_service
+
+# Records per rule-engine block (graded in one worker-thread call, grouped by question)
+RULE_BLOCK_SIZE = 256
+
+
+class EvaluationCache:
+    """
+    Result cache keyed by answer content, question rubric and model
+
+    Entries are kept in memory and appended to a JSONL file (if a path is
+    given) so later runs can reuse them.
+    """
+
+    def __init__(self, path: Optional[Path] = None):
+        self.path = path
+        self._entries: Dict[str, dict] = {}
+        if path and path.exists():
+            # Binary lines: a record cut off mid-character must not fail the whole load
+            with open(path, "rb") as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                        self._entries[entry["key"]] = entry["evaluation"]
+                    except (ValueError, KeyError, TypeError):
+                        continue  # Skip a line truncated by an interrupted run
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: str) -> Optional[dict]:
+        return self._entries.get(key)
+
+    def put(self, key: str, evaluation: dict):
+        self._entries[key] = evaluation
+        if self.path:
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(json.dumps({"key": key, "evaluation": evaluation}, ensure_ascii=False) + "\n")
+
+
+class BatchEvaluator:
+    """Run evaluate_answer over many (question_id, option, explanation) records"""
+
+    def __init__(
+        self,
+        concurrency: int = 8,
+        cache: Optional[EvaluationCache] = None,
+        ai_service: Optional[AIService] = None,
+        question_service: Optional[QuestionService] = None
+    ):
+        self.concurrency = max(1, concurrency)
+        self.cache = cache
+        self.ai_service = ai_service or get_ai_service()
+        self.question_service = question_service or get_question_service()
+
+    def cache_key(self, question: Question, selected_option: Optional[str], explanation: str) -> str:
+        """Key covering the answer, the question rubric and the configured models"""
+        settings = self.ai_service.settings
+        material = json.dumps(
+            [
+                question.id, question.correct_answer, question.explanation, question.key_points,
+                settings.llm_model, settings.llm_fast_model,
+                selected_option, explanation
+            ],
+            ensure_ascii=False
+        )
+        return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+    def _prepare(self, line: int, record: dict) -> Union[dict, Tuple[Question, Optional[str], str, str]]:
+        """
+        Look up the question of an input record
+
+        Returns:
+            The final result (error or cache hit), or
+            (question, selected option, explanation, cache key) to evaluate
+        """
+        question_id = record.get("question_id")
+        if not isinstance(question_id, str):
+            return {"line": line, "error": "question_id must be a string"}
+        question = self.question_service.get_question_by_id(question_id)
+        if not question:
+            return {"line": line, "question_id": question_id, "error": "Question not found"}
+
+        selected_option = record.get("selected_option", record.get("option"))
+        explanation = record.get("explanation") or ""
+
+        key = self.cache_key(question, selected_option, explanation)
+        if self.cache is not None:
+            cached = self.cache.get(key)
+            if cached is not None:
+                return {"line": line, "question_id": question_id, "evaluation": cached, "cached": True}
+        return question, selected_option, explanation, key
+
+    async def _evaluate_record(self, line: int, record: dict) -> dict:
+        """Evaluate one input record"""
+        prepared = self._prepare(line, record)
+        if isinstance(prepared, dict):
+            return prepared
+        question, selected_option, explanation, key = prepared
+        question_id = question.id
+
+        try:
+            evaluation, tier = await self.ai_service.evaluate_answer_with_tier(
+                question=question,
+                selected_option=selected_option,
+                explanation=explanation
+            )
+        except Exception as e:
+            return {"line": line, "question_id": question_id, "error": str(e)}
+
+        result = evaluation.model_dump()
+        # Only persist LLM grades; rule-based results include fallbacks after a timeout,
+        # an open circuit or unusable output, which must be re-graded on the next run
+        if self.cache is not None and tier in (EvaluationTier.FAST, EvaluationTier.LARGE):
+            self.cache.put(key, result)
+        return {"line": line, "question_id": question_id, "evaluation": result, "cached": False}
+
+    def _evaluate_rule_based(self, block: List[Tuple[int, dict]]) -> List[dict]:
+        """
+        Grade a block of input records with the rule engine (blocking)
+
+        Records are grouped by question so each question's matcher runs once
+        over all of its answers. Results are not cached: they would shadow
+        the LLM grades of a later run with an API key.
+        """
+        results: Dict[int, dict] = {}
+        groups: Dict[str, Tuple[Question, List[Tuple[int, Optional[str], str]]]] = {}
+        for line, record in block:
+            prepared = self._prepare(line, record)
+            if isinstance(prepared, dict):
+                results[line] = prepared
+                continue
+            question, selected_option, explanation, _ = prepared
+            groups.setdefault(question.id, (question, []))[1].append((line, selected_option, explanation))
+
+        for question, answers in groups.values():
+            try:
+                evaluations = self.ai_service.rule_based_evaluate_many(
+                    question, [(selected_option, explanation) for _, selected_option, explanation in answers]
+                )
+            except Exception as e:
+                for line, _, _ in answers:
+                    results[line] = {"line": line, "question_id": question.id, "error": str(e)}
+                continue
+            for (line, _, _), evaluation in zip(answers, evaluations):
+                results[line] = {
+                    "line": line, "question_id": question.id,
+                    "evaluation": evaluation.model_dump(), "cached": False
+                }
+        return [results[line] for line, _ in block]
+
+    async def run(
+        self,
+        lines: Union[Iterable[str], AsyncIterable[str]],
+        skip_lines: Optional[Set[int]] = None
+    ) -> AsyncIterator[dict]:
+        """
+        Evaluate JSONL records with bounded concurrency
+
+        Args:
+            lines: JSONL lines (sync or async iterable)
+            skip_lines: Line numbers already processed (resume from checkpoint)
+
+        Yields:
+            Result dicts in completion order, each carrying its input line number
+        """
+        # Without an LLM every answer goes to the rule engine: grade records in blocks
+        # off the event loop instead of one coroutine and matcher call each
+        rule_based = not self.ai_service.llm_configured
+        block_size = RULE_BLOCK_SIZE if rule_based else 1
+        # Both queues are bounded so a slow consumer applies backpressure to the input
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.concurrency * 2)
+        results: asyncio.Queue = asyncio.Queue(maxsize=self.concurrency * 2)
+        skip_lines = skip_lines or set()
+        block: List[Tuple[int, dict]] = []
+
+        async def produce():
+            nonlocal block
+            line_no = 0
+            try:
+                if hasattr(lines, "__aiter__"):
+                    async for raw in lines:
+                        line_no += 1
+                        await enqueue(line_no, raw)
+                else:
+                    for raw in lines:
+                        line_no += 1
+                        await enqueue(line_no, raw)
+                if block:
+                    await queue.put(block)
+                    block = []
+            finally:
+                for _ in range(self.concurrency):
+                    await queue.put(None)
+
+        async def enqueue(line_no: int, raw: str):
+            nonlocal block
+            if line_no in skip_lines or not raw.strip():
+                return
+            try:
+                record = json.loads(raw)
+            except ValueError:
+                await results.put({"line": line_no, "error": "Invalid JSON"})
+                return
+            if not isinstance(record, dict):
+                await results.put({"line": line_no, "error": "Expected a JSON object"})
+                return
+            block.append((line_no, record))
+            if len(block) >= block_size:
+                await queue.put(block)
+                block = []
+
+        async def work():
+            while True:
+                items = await queue.get()
+                if items is None:
+                    break
+                if rule_based:
+                    for result in await asyncio.to_thread(self._evaluate_rule_based, items):
+                        await results.put(result)
+                    continue
+                for item in items:
+                    await results.put(await self._evaluate_record(*item))
+
+        async def supervise():
+            try:
+                await asyncio.gather(producer, *workers)
+            finally:
+                await results.put(None)
+
+        producer = asyncio.create_task(produce())
+        workers = [asyncio.create_task(work()) for _ in range(self.concurrency)]
+        supervisor = asyncio.create_task(supervise())
+
+        try:
+            while True:
+                result = await results.get()
+                if result is None:
+                    break
+                yield result
+            await supervisor
+        finally:
+            for task in [producer, *workers, supervisor]:
+                task.cancel()
+
+
+def load_checkpoint(output_path: Path) -> Set[int]:
+    """
+    Get line numbers already evaluated in an output file (errors are retried)
+
+    A last line left half-written by an interrupted run is cut off, so new
+    results appended to the file start on a line of their own. Lines that
+    do not decode or parse are skipped and their records evaluated again.
+    """
+    done: Set[int] = set()
+    if not output_path.exists():
+        return done
+    with open(output_path, "rb+") as f:
+        complete = 0  # Offset just past the last newline
+        for line in f:
+            if not line.endswith(b"\n"):
+                break
+            complete += len(line)
+            try:
+                result = json.loads(line)
+                if "evaluation" in result:
+                    done.add(int(result["line"]))
+            except (ValueError, KeyError, TypeError):
+                # UnicodeDecodeError is a ValueError
+                continue
+        f.truncate(complete)
+    return done
@@ -0,0 +1,397 @@
+"""
+Cassette - Record and replay of AI provider traffic
+
+In record mode the real DashScope calls go through and every interaction
+(Generation responses and stream chunks, realtime TTS/ASR events) is
+appended to a JSON-lines cassette, with its timing. In replay mode no
+network is used: interactions are looked up by a hash of the request and
+played back with the original timing multiplied by a time scale.
+"""
+import atexit
+import gzip
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import defaultdict
+from http import HTTPStatus
+from types import SimpleNamespace
+from typing import Dict, Iterator, List, Optional
+
+
+class CassetteMissError(RuntimeError):
+    """Raised in replay mode when no recording matches a request"""
+
+
+def _open(path: str, mode: str):
+    if path.endswith(".gz"):
+        return gzip.open(path, mode + "t", encoding="utf-8")
+    return open(path, mode, encoding="utf-8")
+
+
+def _hash(payload) -> str:
+    text = json.dumps(payload, ensure_ascii=False, sort_keys=True, default=str)
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def generation_key(kwargs: dict) -> str:
+    """Key of a Generation call (everything that influences the answer)"""
+    return _hash({
+        "model": kwargs.get("model"),
+        "messages": kwargs.get("messages"),
+        "response_format": kwargs.get("response_format"),
+        "stream": bool(kwargs.get("stream")),
+    })
+
+
+def _field(obj, name: str, default=None):
+    """Read a field from SDK responses (dict-like) or SimpleNamespace"""
+    if obj is None:
+        return default
+    if isinstance(obj, dict):
+        return obj.get(name, default)
+    try:
+        return obj[name]
+    except (KeyError, TypeError, IndexError):
+        return getattr(obj, name, default)
+
+
+def _dump_response(response) -> dict:
+    """Compact form of a Generation response or stream chunk"""
+    output = _field(response, "output")
+    choices = _field(output, "choices") or []
+    choice = choices[0] if choices else None
+    message = _field(choice, "message")
+    usage = _field(response, "usage")
+    return {
+        "status_code": int(_field(response, "status_code", HTTPStatus.OK)),
+        "code": _field(response, "code", "") or "",
+        "message": _field(response, "message", "") or "",
+        "content": _field(message, "content") if message is not None else None,
+        "finish_reason": _field(choice, "finish_reason"),
+        "usage": json.loads(json.dumps(usage, default=lambda o: dict(o))) if usage else None,
+    }
+
+
+def _load_response(data: dict):
+    """Rebuild a response object with the attributes AIService reads"""
+    choices = []
+    if data.get("content") is not None:
+        choices.append(SimpleNamespace(
+            finish_reason=data.get("finish_reason"),
+            message=SimpleNamespace(role="assistant", content=data["content"])
+        ))
+    return SimpleNamespace(
+        status_code=data["status_code"],
+        code=data.get("code", ""),
+        message=data.get("message", ""),
+        output=SimpleNamespace(choices=choices) if choices else None,
+        usage=data.get("usage")
+    )
+
+
+class Cassette:
+    """
+    Recorded provider interactions of one cassette file
+
+    Recordings with the same key (e.g. the same prompt asked twice) are
+    replayed in recording order and wrap around. While recording, one writer
+    stays open (a single gzip stream for .gz cassettes) until close().
+    """
+
+    def __init__(self, path: str, mode: str, time_scale: float = 1.0):
+        if mode not in ("record", "replay"):
+            raise ValueError(f"Unknown cassette mode: {mode}")
+        self.path = path
+        self.mode = mode
+        self.time_scale = time_scale
+        self._lock = threading.Lock()
+        self._recordings: Dict[str, List[dict]] = defaultdict(list)
+        self._cursor: Dict[str, int] = defaultdict(int)
+        self._writer = None
+        if mode == "replay":
+            self._load()
+        elif os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+
+    def _load(self):
+        try:
+            with _open(self.path, "r") as f:
+                for line in f:
+                    if line.strip():
+                        entry = json.loads(line)
+                        self._recordings[entry["key"]].append(entry)
+        except FileNotFoundError:
+            print(f"Warning: Cassette not found at {self.path}, every provider call will miss")
+
+    def _append(self, entry: dict):
+        line = json.dumps(entry, ensure_ascii=False) + "\n"
+        with self._lock:
+            if self._writer is None:
+                self._writer = _open(self.path, "a")
+                atexit.register(self.close)
+            self._writer.write(line)
+            if not self.path.endswith(".gz"):
+                # Plain cassettes stay readable while recording; gzip data is complete on close
+                self._writer.flush()
+
+    def close(self):
+        """Finish writing the cassette (application shutdown)"""
+        with self._lock:
+            writer, self._writer = self._writer, None
+        if writer is not None:
+            writer.close()
+            atexit.unregister(self.close)
+
+    def _next(self, key: str, kind: str) -> dict:
+        with self._lock:
+            entries = self._recordings.get(key)
+            if not entries:
+                raise CassetteMissError(f"No recorded {kind} interaction for key {key[:12]}")
+            index = self._cursor[key] % len(entries)
+            self._cursor[key] += 1
+            return entries[index]
+
+    def _sleep(self, seconds: float):
+        if seconds > 0 and self.time_scale > 0:
+            time.sleep(seconds * self.time_scale)
+
+    # ============ Generation ============
+
+    def generation(self, call, kwargs: dict):
+        """
+        Run a Generation call through the cassette (blocking; runs in a worker thread)
+
+        Args:
+            call: The real call (Generation.call), used in record mode
+            kwargs: Call arguments
+
+        Returns:
+            Response object, or an iterator of chunks for streaming calls
+        """
+        key = generation_key(kwargs)
+        stream = bool(kwargs.get("stream"))
+        if self.mode == "replay":
+            entry = self._next(key, "generation")
+            if stream:
+                return self._replay_stream(entry)
+            self._sleep(entry["elapsed"])
+            return _load_response(entry["response"])
+
+        started = time.monotonic()
+        result = call(**kwargs)
+        if stream:
+            return self._record_stream(key, kwargs.get("model"), result, started)
+        self._append({
+            "kind": "generation",
+            "key": key,
+            "model": kwargs.get("model"),
+            "stream": False,
+            "elapsed": round(time.monotonic() - started, 4),
+            "response": _dump_response(result),
+        })
+        return result
+
+    def _record_stream(self, key: str, model: Optional[str], chunks, started: float) -> Iterator:
+        recorded = []
+        try:
+            for chunk in chunks:
+                item = _dump_response(chunk)
+                item["t"] = round(time.monotonic() - started, 4)
+                recorded.append(item)
+                yield chunk
+        except Exception as e:
+            recorded.append({"t": round(time.monotonic() - started, 4), "exception": f"{type(e).__name__}: {e}"})
+            raise
+        finally:
+            # Also keep interrupted streams so failures replay as well
+            self._append({"kind": "generation", "key": key, "model": model, "stream": True, "chunks": recorded})
+
+    def _replay_stream(self, entry: dict) -> Iterator:
+        previous = 0.0
+        for item in entry["chunks"]:
+            self._sleep(item["t"] - previous)
+            previous = item["t"]
+            if "exception" in item:
+                raise RuntimeError(f"Replayed stream failure ({item['exception']})")
+            yield _load_response(item)
+
+    # ============ Realtime (TTS / ASR) ============
+
+    def realtime(self, factory, service: str, callback, **kwargs):
+        """
+        Create a realtime client (QwenTtsRealtime / OmniRealtimeConversation) through the cassette
+
+        Args:
+            factory: SDK client class, used in record mode
+            service: "tts" or "asr"
+            callback: SDK callback receiving the events
+            kwargs: Client arguments (model, url)
+        """
+        if self.mode == "replay":
+            return _ReplayRealtime(self, service, kwargs.get("model"), callback)
+        recorder = _RecordingCallback(self, service, kwargs.get("model"), callback)
+        return _RecordingRealtime(factory(callback=recorder, **kwargs), recorder)
+
+
+class _RecordingCallback:
+    """Forwards SDK events to the real callback and records them with their offset"""
+
+    def __init__(self, cassette: Cassette, service: str, model: Optional[str], callback):
+        self.cassette = cassette
+        self.service = service
+        self.model = model
+        self.callback = callback
+        self.started = time.monotonic()
+        self.inputs = hashlib.sha256()
+        self.timings: Dict[str, float] = {}
+        self.events: List[dict] = []
+        self._saved = False
+
+    def on_open(self):
+        self.callback.on_open()
+
+    def on_close(self, code, msg):
+        self.callback.on_close(code, msg)
+
+    def on_event(self, response):
+        self.events.append({"t": round(time.monotonic() - self.started, 4), "event": response})
+        event_type = response.get("type", "") if isinstance(response, dict) else ""
+        if event_type in ("session.finished", "error"):
+            self.save()
+        self.callback.on_event(response)
+
+    def save(self):
+        if self._saved:
+            return
+        self._saved = True
+        self.cassette._append({
+            "kind": self.service,
+            "key": _realtime_key(self.service, self.model, self.inputs.hexdigest()),
+            "model": self.model,
+            "timings": self.timings,
+            "events": self.events,
+        })
+
+
+def _realtime_key(service: str, model: Optional[str], inputs: str) -> str:
+    return _hash({"service": service, "model": model, "inputs": inputs})
+
+
+class _RecordingRealtime:
+    """Proxy of a realtime SDK client that hashes the inputs and times the handshake"""
+
+    def __init__(self, client, recorder: _RecordingCallback):
+        self._client = client
+        self._recorder = recorder
+
+    def __getattr__(self, name):
+        return getattr(self._client, name)
+
+    def _timed(self, name: str, *args, **kwargs):
+        started = time.monotonic()
+        result = getattr(self._client, name)(*args, **kwargs)
+        self._recorder.timings[name] = round(time.monotonic() - started, 4)
+        return result
+
+    def connect(self):
+        return self._timed("connect")
+
+    def update_session(self, *args, **kwargs):
+        return self._timed("update_session", *args, **kwargs)
+
+    def append_text(self, text: str):
+        self._recorder.inputs.update(text.encode("utf-8"))
+        return self._client.append_text(text)
+
+    def append_audio(self, audio_b64: str):
+        self._recorder.inputs.update(audio_b64.encode("ascii"))
+        return self._client.append_audio(audio_b64)
+
+    def finish(self):
+        self._recorder.timings["finish_at"] = round(time.monotonic() - self._recorder.started, 4)
+        return self._client.finish()
+
+    def end_session(self, *args, **kwargs):
+        self._recorder.timings["finish_at"] = round(time.monotonic() - self._recorder.started, 4)
+        return self._client.end_session(*args, **kwargs)
+
+
+class _ReplayRealtime:
+    """
+    Stand-in for a realtime SDK client that replays recorded events
+
+    The recording is chosen when the input is complete (finish/end_session);
+    events recorded before that point are delivered right away, later ones
+    with their original spacing.
+    """
+
+    def __init__(self, cassette: Cassette, service: str, model: Optional[str], callback):
+        self.cassette = cassette
+        self.service = service
+        self.model = model
+        self.callback = callback
+        self.inputs = hashlib.sha256()
+        self._timings: Dict[str, float] = {}
+        self._thread: Optional[threading.Thread] = None
+
+    def connect(self):
+        self.callback.on_open()
+
+    def update_session(self, *args, **kwargs):
+        pass
+
+    def append_text(self, text: str):
+        self.inputs.update(text.encode("utf-8"))
+
+    def append_audio(self, audio_b64: str):
+        self.inputs.update(audio_b64.encode("ascii"))
+
+    def _start(self) -> threading.Thread:
+        key = _realtime_key(self.service, self.model, self.inputs.hexdigest())
+        entry = self.cassette._next(key, self.service)
+        self._thread = threading.Thread(target=self._play, args=(entry,), name=f"cassette-{self.service}", daemon=True)
+        self._thread.start()
+        return self._thread
+
+    def _play(self, entry: dict):
+        timings = entry.get("timings", {})
+        # The handshake happened before the input was known; charge it here
+        self.cassette._sleep(timings.get("connect", 0.0) + timings.get("update_session", 0.0))
+        previous = timings.get("finish_at", 0.0)
+        for item in entry["events"]:
+            if item["t"] > previous:
+                self.cassette._sleep(item["t"] - previous)
+                previous = item["t"]
+            self.callback.on_event(item["event"])
+
+    def finish(self):
+        self._start()
+
+    def end_session(self, timeout: int = 20):
+        # The SDK blocks until the session is finished
+        self._start().join(timeout)
+
+    def close(self):
+        self.callback.on_close(1000, "")
+
+
+def create_cassette(mode: str, path: str, time_scale: float = 1.0) -> Optional[Cassette]:
+    """
+    Create the configured cassette
+
+    Args:
+        mode: "record", "replay" or empty to disable
+
+    Returns:
+        Cassette, or None if disabled
+    """
+    mode = (mode or "").lower()
+    if not mode:
+        return None
+    try:
+        return Cassette(path, mode, time_scale)
+    except ValueError as e:
+        print(f"Cassette disabled: {e}")
+        return None
@@ -0,0 +1,150 @@
+"""
+Cost Service - Attributes AI provider usage to sessions and enforces budgets
+"""
+from datetime import date
+from enum import Enum
+from typing import Optional, Tuple
+
+from ..core.config import Settings
+from ..core.metrics import AUDIO_SECONDS, BUDGET_DEGRADATIONS, DAILY_COST, ESTIMATED_COST
+from ..schemas.interview import SessionUsage
+
+
+class BudgetLevel(str, Enum):
+    """Budget level enumeration"""
+    OK = "ok"                  # Normal model selection
+    DEGRADED = "degraded"      # Near a budget: fast model only, no escalation
+    EXHAUSTED = "exhausted"    # Over a budget: rule-based and static paths only
+
+
+class BudgetExceededError(RuntimeError):
+    """Raised when a paid call is refused because a budget is exhausted"""
+
+    def __init__(self, service: str):
+        super().__init__(f"{service} budget exhausted")
+        self.service = service
+
+
+class CostTracker:
+    """
+    Estimates the cost of AI provider calls from reported usage
+
+    Usage is added to the SessionUsage of the calling session (when one is
+    given) and to a running total for the current day, which together
+    decide the BudgetLevel of the next call.
+    """
+
+    def __init__(self, settings: Settings):
+        self.settings = settings
+        self._day = date.today()
+        self._daily_cost = 0.0
+        self._unattributed_level = BudgetLevel.OK  # Level of the last check without a session
+        DAILY_COST.set_function(lambda: {(): round(self.daily_cost, 6)})
+
+    @property
+    def daily_cost(self) -> float:
+        self._roll_day()
+        return self._daily_cost
+
+    def _roll_day(self):
+        today = date.today()
+        if today != self._day:
+            self._day = today
+            self._daily_cost = 0.0
+
+    def _add_cost(self, service: str, cost: float, usage: Optional[SessionUsage]):
+        self._roll_day()
+        self._daily_cost += cost
+        ESTIMATED_COST.labels(service).inc(cost)
+        if usage is not None:
+            usage.estimated_cost += cost
+
+    def record_llm(
+        self,
+        usage: Optional[SessionUsage],
+        model: str,
+        input_tokens: int,
+        output_tokens: int,
+        cached_tokens: int = 0
+    ) -> float:
+        """
+        Record one LLM call
+
+        Returns:
+            Estimated cost of the call
+        """
+        settings = self.settings
+        if model == settings.llm_model:
+            input_price, output_price = settings.cost_llm_input_per_1k, settings.cost_llm_output_per_1k
+        else:
+            input_price, output_price = settings.cost_fast_input_per_1k, settings.cost_fast_output_per_1k
+
+        cached_tokens = min(cached_tokens, input_tokens)
+        billed_input = (input_tokens - cached_tokens) + cached_tokens * settings.cost_cached_input_ratio
+        cost = (billed_input * input_price + output_tokens * output_price) / 1000
+
+        if usage is not None:
+            usage.llm_calls += 1
+            usage.input_tokens += input_tokens
+            usage.output_tokens += output_tokens
+            usage.cached_tokens += cached_tokens
+        self._add_cost("llm", cost, usage)
+        return cost
+
+    def record_asr(self, usage: Optional[SessionUsage], seconds: float) -> float:
+        """Record transcribed audio"""
+        cost = seconds / 60 * self.settings.cost_asr_per_minute
+        if usage is not None:
+            usage.asr_seconds += seconds
+        AUDIO_SECONDS.labels("asr").inc(seconds)
+        self._add_cost("asr", cost, usage)
+        return cost
+
+    def record_tts(self, usage: Optional[SessionUsage], characters: int, seconds: float) -> float:
+        """Record synthesized speech"""
+        cost = characters / 10000 * self.settings.cost_tts_per_10k_chars
+        if usage is not None:
+            usage.tts_characters += characters
+            usage.tts_seconds += seconds
+        AUDIO_SECONDS.labels("tts").inc(seconds)
+        self._add_cost("tts", cost, usage)
+        return cost
+
+    def _level(self, spent: float, budget: float) -> BudgetLevel:
+        if budget <= 0:
+            return BudgetLevel.OK
+        if spent >= budget:
+            return BudgetLevel.EXHAUSTED
+        if spent >= budget * self.settings.budget_degrade_ratio:
+            return BudgetLevel.DEGRADED
+        return BudgetLevel.OK
+
+    def check(self, usage: Optional[SessionUsage]) -> Tuple[BudgetLevel, str]:
+        """
+        Get the budget level for the next call of a session
+
+        Degradations are counted once per level change of the session (or
+        of calls without one), not on every check at the same level.
+
+        Returns:
+            (Level, scope of the budget that decided it: "session" or "daily")
+        """
+        session_spent = usage.estimated_cost if usage is not None else 0.0
+        levels = [
+            (self._level(session_spent, self.settings.session_budget), "session"),
+            (self._level(self.daily_cost, self.settings.daily_budget), "daily"),
+        ]
+        order = [BudgetLevel.OK, BudgetLevel.DEGRADED, BudgetLevel.EXHAUSTED]
+        level, scope = max(levels, key=lambda item: order.index(item[0]))
+
+        previous = usage.budget_level if usage is not None else self._unattributed_level
+        if level != previous:
+            if level != BudgetLevel.OK:
+                BUDGET_DEGRADATIONS.labels(scope, level.value).inc()
+            if usage is not None:
+                usage.budget_level = level.value
+            else:
+                self._unattributed_level = level
+        if level != BudgetLevel.OK and usage is not None:
+            usage.degraded = True
+        return level, scope
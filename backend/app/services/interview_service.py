@@ -7,10 +7,18 @@ from typing import Dict, Optional, List
 from ..schemas.interview import (
     InterviewSession, InterviewStatus, CreateInterviewRequest,
     SubmitAnswerRequest, AnswerRecord, Question,
-    InterviewReport, AnswerEvaluation, DifficultyLevel
+    InterviewReport, AnswerEvaluation, DifficultyLevel, QuestionDisplay
 )
 from .question_service import get_question_service
 from .ai_service import get_ai_service
+from ..core.metrics import ACTIVE_SESSIONS
+from ..core.tracing import traced
+
+_DIFFICULTY_ORDER = {
+    DifficultyLevel.EASY: 1,
+    DifficultyLevel.MEDIUM: 2,
+    DifficultyLevel.HARD: 3
+}
 
 
 class InterviewService:
@@ -21,7 +29,16 @@ class InterviewService:
         self.sessions: Dict[str, InterviewSession] = {}
         self.question_service = get_question_service()
         self.ai_service = get_ai_service()
+        ACTIVE_SESSIONS.set_function(self._count_sessions_by_status)
+    
+    def _count_sessions_by_status(self) -> Dict[tuple, int]:
+        """Count in-memory sessions per status (metrics gauge)"""
+        counts = {(status.value,): 0 for status in InterviewStatus}
+        for session in list(self.sessions.values()):
+            counts[(session.status.value,)] += 1
+        return counts
     
+    @traced("interview.create_session")
     def create_session(self, request: CreateInterviewRequest) -> InterviewSession:
         """
         Create interview session
@@ -32,6 +49,31 @@ class InterviewService:
         Returns:
             Interview session
         """
+        session = self._build_session(request, datetime.now())
+        self.sessions[session.id] = session
+        return session
+    
+    @traced("interview.create_sessions")
+    def create_sessions(self, requests: List[CreateInterviewRequest]) -> List[InterviewSession]:
+        """
+        Create sessions for many candidates at once (bulk invitations)
+        
+        Sessions share one creation timestamp and are stored in a single
+        update once all of them are built.
+        
+        Args:
+            requests: Create requests
+        
+        Returns:
+            Interview sessions, in request order
+        """
+        created_at = datetime.now()
+        sessions = [self._build_session(request, created_at) for request in requests]
+        self.sessions.update((session.id, session) for session in sessions)
+        return sessions
+    
+    def _build_session(self, request: CreateInterviewRequest, created_at: datetime) -> InterviewSession:
+        """Select and order the questions of a new session (not stored)"""
         session_id = str(uuid.uuid4())
         
         # Select questions automatically based on difficulty
@@ -56,14 +98,9 @@ class InterviewService:
             )
         
         # Sort questions by difficulty: easy -> medium -> hard
-        difficulty_order = {
-            DifficultyLevel.EASY: 1,
-            DifficultyLevel.MEDIUM: 2,
-            DifficultyLevel.HARD: 3
-        }
-        questions = sorted(questions, key=lambda q: difficulty_order.get(q.difficulty, 99))
-        
-        session = InterviewSession(
+        questions = sorted(questions, key=lambda q: _DIFFICULTY_ORDER.get(q.difficulty, 99))
+        
+        return InterviewSession(
             id=session_id,
             candidate_name=request.candidate_name,
             position=request.position,
@@ -72,11 +109,8 @@ class InterviewService:
             current_question_index=0,
             questions=questions,
             answers=[],
-            created_at=datetime.now()
+            created_at=created_at
         )
-        
-        self.sessions[session_id] = session
-        return session
     
     def get_session(self, session_id: str) -> Optional[InterviewSession]:
         """Get session by ID"""
@@ -100,18 +134,11 @@ class InterviewService:
         
         return session.questions[session.current_question_index]
     
-    def get_question_for_display(self, question: Question) -> dict:
-        """Get question for display (hide answer)"""
-        return {
-            "id": question.id,
-            "type": question.type,
-            "difficulty": question.difficulty,
-            "title": question.title,
-            "content": question.content,
-            "options": [{"key": o.key, "content": o.content} for o in question.options] if question.options else None,
-            "key_points": question.key_points  # Show evaluation points as hints
-        }
+    def get_question_for_display(self, question: Question) -> QuestionDisplay:
+        """Get question for display (hide answer; shared instance, do not modify)"""
+        return self.question_service.get_display(question)
     
+    @traced("interview.submit_answer")
     async def submit_answer(
         self, 
         session_id: str,
@@ -144,7 +171,8 @@ class InterviewService:
         evaluation = await self.ai_service.evaluate_answer(
             question=current_question,
             selected_option=selected_option,
-            explanation=explanation
+            explanation=explanation,
+            usage=session.usage
         )
         
         # Record answer
@@ -173,6 +201,7 @@ class InterviewService:
         
         return evaluation, has_next, next_question
     
+    @traced("interview.feedback")
     async def get_feedback_text(
         self,
         session_id: str,
@@ -190,11 +219,13 @@ class InterviewService:
                 if question:
                     return await self.ai_service.generate_interview_feedback(
                         question=question,
-                        evaluation=answer.evaluation
+                        evaluation=answer.evaluation,
+                        usage=session.usage
                     )
         
         return ""
     
+    @traced("interview.generate_report")
     async def generate_report(self, session_id: str) -> Optional[InterviewReport]:
         """Generate interview report"""
         session = self.sessions.get(session_id)
@@ -212,7 +243,8 @@ class InterviewService:
             position=session.position,
             questions=session.questions,
             answers=session.answers,
-            duration=duration
+            duration=duration,
+            usage=session.usage
         )
     
     def get_welcome_message(self, session: InterviewSession) -> str:
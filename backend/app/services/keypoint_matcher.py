@@ -0,0 +1,166 @@
+"""
+Key Point Matcher - Precompiled matching of key points in explanations
+"""
+import json
+import re
+import unicodedata
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set
+
+from ..schemas.interview import Question
+
+
+# Common traditional characters in key points, mapped to simplified form
+_TRADITIONAL_TO_SIMPLIFIED = str.maketrans(
+    "邏輯導數學歸納論計態規劃優設條機貝葉幾對稱環組並發處進製碼檢測緩貪證轉遞獨衝權與間錯誤問題擇選應約補"
+    "樣圖線區變況壞經驗預則運結構資訊價歷義實現號統標簽輪換種類觀點說讀準確斷後過還這們個為會來時無關係戰"
+    "維據較將專業簡單複雜範圍兩僅難頭腦層級佈詞語勢參貨幣遊戲盤節動",
+    "逻辑导数学归纳论计态规划优设条机贝叶几对称环组并发处进制码检测缓贪证转递独冲权与间错误问题择选应约补"
+    "样图线区变况坏经验预则运结构资讯价历义实现号统标签轮换种类观点说读准确断后过还这们个为会来时无关系战"
+    "维据较将专业简单复杂范围两仅难头脑层级布词语势参货币游戏盘节动"
+)
+
+# Full-width punctuation typed by Chinese IMEs, with its NFKC form
+_IME_PUNCTUATION = tuple((char, unicodedata.normalize("NFKC", char)) for char in "，；：！？（）　")
+
+_TRADITIONAL_RE = re.compile("[" + "".join(map(chr, _TRADITIONAL_TO_SIMPLIFIED)) + "]")
+
+# Suffixes that candidates commonly drop when describing an approach ("排除法" -> "排除")
+_DROPPABLE_SUFFIXES = ("思想", "思维", "策略", "方法", "分析", "计算", "定理", "法")
+
+_SYNONYMS_PATH = Path(__file__).parent.parent.parent / "data" / "keypoint_synonyms.json"
+_shared_synonyms: Optional[Dict[str, List[str]]] = None
+
+
+def to_simplified(text: str) -> str:
+    """Map common traditional characters to simplified form"""
+    # translate() looks up every character; skip it for the usual all-simplified text
+    if _TRADITIONAL_RE.search(text):
+        return text.translate(_TRADITIONAL_TO_SIMPLIFIED)
+    return text
+
+
+def fold(text: str) -> str:
+    """Fold width, case and traditional characters (whitespace is kept)"""
+    if not unicodedata.is_normalized("NFKC", text):
+        # Chinese text fails the quick check on IME punctuation alone; mapping that first
+        # (as NFKC would) avoids a full normalization, ~1ms for 4k characters
+        for full_width, ascii_form in _IME_PUNCTUATION:
+            text = text.replace(full_width, ascii_form)
+        if not unicodedata.is_normalized("NFKC", text):
+            text = unicodedata.normalize("NFKC", text)
+    return to_simplified(text.casefold())
+
+
+def normalize(text: str) -> str:
+    """Normalize text for matching: width, case, traditional characters, whitespace"""
+    return "".join(fold(text).split())
+
+
+def _load_shared_synonyms() -> Dict[str, List[str]]:
+    """Load bank-wide key point synonyms (data/keypoint_synonyms.json)"""
+    global _shared_synonyms
+    if _shared_synonyms is None:
+        try:
+            with open(_SYNONYMS_PATH, "r", encoding="utf-8") as f:
+                _shared_synonyms = json.load(f).get("synonyms", {})
+        except FileNotFoundError:
+            _shared_synonyms = {}
+        except Exception as e:
+            print(f"Error loading key point synonyms: {e}")
+            _shared_synonyms = {}
+    return _shared_synonyms
+
+
+def expand_key_point(key_point: str, extra_synonyms: Iterable[str] = ()) -> Set[str]:
+    """Get all normalized surface forms of a key point"""
+    forms = {key_point, *extra_synonyms, *_load_shared_synonyms().get(key_point, [])}
+    variants = set()
+    for form in forms:
+        normalized = normalize(form)
+        if not normalized:
+            continue
+        variants.add(normalized)
+        for suffix in _DROPPABLE_SUFFIXES:
+            stem = normalized[:-len(suffix)]
+            if normalized.endswith(suffix) and len(stem) >= 2:
+                variants.add(stem)
+                break
+    return variants
+
+
+class KeyPointMatcher:
+    """
+    Precomputed normalized forms of the key points of one question
+
+    Key points and synonyms are normalized once, at compile time; each
+    explanation is normalized with the same function (width, case,
+    traditional characters, whitespace) and searched with plain substring
+    checks, so "DP", "dp" and "ＤＰ" or "排 除法" and "排除法" match alike.
+    """
+
+    def __init__(self, key_points: List[str], synonyms: Optional[Dict[str, List[str]]] = None):
+        self.key_points = key_points
+        self.synonyms = synonyms = synonyms or {}
+        self._variants: List[List[str]] = []
+        self._ascii_variants: List[List[str]] = []
+        for point in key_points:
+            # A variant containing a shorter one can never be the only one found.
+            # Shortest first: the most likely to occur, so the search stops early
+            variants = sorted(expand_key_point(point, synonyms.get(point, [])), key=len)
+            variants = [
+                variant for i, variant in enumerate(variants)
+                if not any(shorter in variant for shorter in variants[:i])
+            ]
+            self._variants.append(variants)
+            self._ascii_variants.append([variant for variant in variants if variant.isascii()])
+
+    def match(self, explanation: str) -> List[str]:
+        """Get key points mentioned in explanation (in key point order)"""
+        return self._match_normalized(normalize(explanation))
+
+    def match_many(self, explanations: Iterable[str]) -> List[List[str]]:
+        """Match many explanations against this question's key points"""
+        return [self._match_normalized(normalize(explanation)) for explanation in explanations]
+
+    def _match_normalized(self, text: str) -> List[str]:
+        # Only ASCII variants can occur in ASCII text (checked in C, ~0.1µs for 4k chars)
+        table = self._ascii_variants if text.isascii() else self._variants
+        return [
+            point for point, variants in zip(self.key_points, table)
+            if any(variant in text for variant in variants)
+        ]
+
+
+# Compiled matchers by question ID (built at bank load, compiled lazily otherwise)
+_matchers: Dict[str, KeyPointMatcher] = {}
+
+
+def compile_matchers(questions: Iterable[Question]) -> None:
+    """
+    Compile matchers for a question bank, replacing any previous ones
+
+    Matchers are read-only once built: questions with the same key points
+    and synonyms share one, and unchanged questions keep theirs on reload.
+    """
+    compiled = {}
+    shared: Dict[tuple, KeyPointMatcher] = {}
+    for q in questions:
+        matcher = _matchers.get(q.id)
+        if matcher is None or matcher.key_points != q.key_points or matcher.synonyms != (q.synonyms or {}):
+            key = (tuple(q.key_points), tuple((point, tuple(forms)) for point, forms in sorted(q.synonyms.items())))
+            matcher = shared.get(key)
+            if matcher is None:
+                matcher = shared[key] = KeyPointMatcher(q.key_points, q.synonyms)
+        compiled[q.id] = matcher
+    _matchers.clear()
+    _matchers.update(compiled)
+
+
+def get_matcher(question: Question) -> KeyPointMatcher:
+    """Get compiled matcher for a question"""
+    matcher = _matchers.get(question.id)
+    if matcher is None or matcher.key_points != question.key_points:
+        matcher = KeyPointMatcher(question.key_points, question.synonyms)
+        _matchers[question.id] = matcher
+    return matcher
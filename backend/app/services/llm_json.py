@@ -0,0 +1,279 @@
+"""
+LLM JSON - Tolerant and incremental parsing of structured LLM output
+"""
+import json
+import re
+from typing import Any, Dict, List, Optional
+
+from pydantic import ValidationError
+
+from ..schemas.interview import AnswerEvaluation
+
+
+_FENCE_RE = re.compile(r"```(?:json)?\s*(.*?)(?:```|$)", re.DOTALL | re.IGNORECASE)
+# Strings (possibly unterminated) are matched first and kept as they are, so the
+# repairs only apply to the JSON structure around them
+_REPAIR_RE = re.compile(r'"(?:[^"\\]|\\.)*"?|\b(True|False|None)\b|,(\s*[}\]])', re.DOTALL)
+_PY_LITERALS = {"True": "true", "False": "false", "None": "null"}
+
+
+class IncrementalJSONParser:
+    """
+    Incremental parser for a streamed JSON object
+
+    Feed chunks as they arrive; top-level fields are returned as soon as
+    their value is complete, before the closing brace is received. Text
+    before the first '{' (e.g. a markdown fence) is ignored.
+    """
+
+    def __init__(self):
+        self.buffer = ""
+        self.fields: Dict[str, Any] = {}
+        self._pos = 0              # Next character to scan
+        self._started = False      # Seen the opening brace
+        self._done = False         # Seen the closing brace
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self._field_start = 0      # Start of the current top-level "key": value
+        self.last_complete = 0     # Buffer offset just after the last complete field
+
+    @property
+    def done(self) -> bool:
+        return self._done
+
+    def feed(self, chunk: str) -> Dict[str, Any]:
+        """
+        Feed a chunk of streamed text
+
+        Returns:
+            Fields completed by this chunk
+        """
+        self.buffer += chunk
+        completed: Dict[str, Any] = {}
+        buf = self.buffer
+
+        while self._pos < len(buf) and not self._done:
+            char = buf[self._pos]
+            if not self._started:
+                if char == "{":
+                    self._started = True
+                    self._depth = 1
+                    self._field_start = self._pos + 1
+                    self.last_complete = self._pos + 1
+            elif self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif char == "\\":
+                    self._escape = True
+                elif char == '"':
+                    self._in_string = False
+            elif char == '"':
+                self._in_string = True
+            elif char in "{[":
+                self._depth += 1
+            elif char in "}]":
+                self._depth -= 1
+                if self._depth == 0:
+                    completed.update(self._close_field(self._pos))
+                    self._done = True
+            elif char == "," and self._depth == 1:
+                completed.update(self._close_field(self._pos))
+                self._field_start = self._pos + 1
+            self._pos += 1
+
+        self.fields.update(completed)
+        return completed
+
+    def _close_field(self, end: int) -> Dict[str, Any]:
+        segment = self.buffer[self._field_start:end].strip()
+        if not segment:
+            return {}
+        parsed = _loads_object("{" + segment + "}")
+        if parsed is None:
+            return {}
+        self.last_complete = end + 1
+        return parsed
+
+    def complete_prefix(self) -> str:
+        """Text up to and including the last complete field (for prefix continuation)"""
+        return self.buffer[:self.last_complete]
+
+
+def _loads_object(text: str) -> Optional[dict]:
+    """json.loads that only accepts an object"""
+    try:
+        result = json.loads(text)
+    except ValueError:
+        return None
+    return result if isinstance(result, dict) else None
+
+
+def _strip_fences(text: str) -> str:
+    """Remove markdown code fences around JSON"""
+    match = _FENCE_RE.search(text)
+    return match.group(1) if match else text
+
+
+def _extract_object(text: str) -> str:
+    """Get text from the first '{' to its matching '}' (or to the end if unbalanced)"""
+    start = text.find("{")
+    if start < 0:
+        return ""
+    depth = 0
+    in_string = escape = False
+    for i in range(start, len(text)):
+        char = text[i]
+        if in_string:
+            if escape:
+                escape = False
+            elif char == "\\":
+                escape = True
+            elif char == '"':
+                in_string = False
+        elif char == '"':
+            in_string = True
+        elif char in "{[":
+            depth += 1
+        elif char in "}]":
+            depth -= 1
+            if depth == 0:
+                return text[start:i + 1]
+    return text[start:]
+
+
+def _repair(text: str) -> str:
+    """Fix trailing commas and Python literals outside JSON strings"""
+    def replace(match: re.Match) -> str:
+        if match.group(1):
+            return _PY_LITERALS[match.group(1)]
+        if match.group(2) is not None:
+            return match.group(2)
+        return match.group(0)
+    return _REPAIR_RE.sub(replace, text)
+
+
+def _close_truncated(text: str) -> str:
+    """Close an unterminated string and any open brackets of truncated JSON"""
+    stack: List[str] = []
+    in_string = escape = False
+    for char in text:
+        if in_string:
+            if escape:
+                escape = False
+            elif char == "\\":
+                escape = True
+            elif char == '"':
+                in_string = False
+        elif char == '"':
+            in_string = True
+        elif char in "{[":
+            stack.append("}" if char == "{" else "]")
+        elif char in "}]" and stack:
+            stack.pop()
+    if in_string:
+        text += '"'
+    text = text.rstrip().rstrip(",")
+    if text.endswith(":"):
+        text += "null"
+    return text + "".join(reversed(stack))
+
+
+def parse_json_lenient(text: Optional[str], allow_truncated: bool = True) -> Optional[dict]:
+    """
+    Parse a JSON object from LLM output, repairing common defects
+
+    Handles markdown fences, leading/trailing prose, trailing commas and
+    Python literals (True/False/None). With allow_truncated, output cut off
+    mid-object is closed and whatever fields survive are returned.
+
+    Returns:
+        Parsed object, or None if nothing could be recovered
+    """
+    if not text:
+        return None
+
+    result = _loads_object(text)
+    if result is not None:
+        return result
+
+    candidate = _extract_object(_strip_fences(text))
+    if not candidate:
+        return None
+
+    attempts = [candidate]
+    repaired = _repair(candidate)
+    attempts.append(repaired)
+    if allow_truncated:
+        attempts.append(_repair(_close_truncated(repaired)))
+
+    for attempt in attempts:
+        result = _loads_object(attempt)
+        if result is not None:
+            return result
+
+    if not allow_truncated:
+        return None
+
+    # Last resort: keep whatever top-level fields were complete
+    parser = IncrementalJSONParser()
+    parser.feed(candidate)
+    return parser.fields or None
+
+
+def valid_json_prefix(text: str) -> Optional[str]:
+    """
+    Get the prefix of broken JSON output that ends after its last complete field
+
+    Used to ask the model to continue from where the output went wrong.
+    """
+    text = _strip_fences(text)
+    start = text.find("{")
+    if start < 0:
+        return None
+    parser = IncrementalJSONParser()
+    parser.feed(text[start:])
+    if not parser.fields:
+        return None
+    prefix = parser.complete_prefix().rstrip()
+    if prefix.endswith("}"):
+        return None  # Object already complete, nothing to continue
+    return prefix if prefix.endswith(",") else prefix + ","
+
+
+def coerce_evaluation(result: dict, is_correct: bool) -> Optional[AnswerEvaluation]:
+    """
+    Validate an LLM evaluation result against the AnswerEvaluation schema
+
+    Scores are clamped to 0-100 and single strings are wrapped into lists.
+
+    Returns:
+        Evaluation, or None if the result does not contain a usable evaluation
+    """
+    if "score" not in result and "feedback" not in result:
+        return None
+
+    def as_list(value: Any) -> List[str]:
+        if value is None:
+            return []
+        if isinstance(value, (list, tuple)):
+            return [str(v) for v in value if v is not None]
+        return [str(value)]
+
+    score = result.get("score", 60 if is_correct else 30)
+    try:
+        score = max(0, min(100, int(round(float(score)))))
+    except (TypeError, ValueError):
+        score = 60 if is_correct else 30
+
+    try:
+        return AnswerEvaluation(
+            is_correct=is_correct,
+            score=score,
+            feedback=str(result.get("feedback") or ""),
+            hints=as_list(result.get("hints")),
+            key_points_hit=as_list(result.get("key_points_hit")),
+            key_points_missed=as_list(result.get("key_points_missed"))
+        )
+    except ValidationError:
+        return None
@@ -0,0 +1,100 @@
+"""
+Model Router - Picks the cheapest evaluation tier that can grade an answer
+"""
+from enum import Enum
+from typing import Dict, Optional
+
+from ..core.metrics import EVALUATION_TIER
+from ..schemas.interview import AnswerEvaluation
+
+
+class EvaluationTier(str, Enum):
+    """Evaluation tier enumeration"""
+    RULE = "rule"    # Rule-based engine, no LLM call
+    FAST = "fast"    # Small fast model (e.g. qwen-flash)
+    LARGE = "large"  # Large model (Settings.llm_model)
+
+
+class TierStats:
+    """Per-tier call counters and latency totals"""
+
+    def __init__(self):
+        self.calls = 0
+        self.failures = 0
+        self.total_latency = 0.0
+
+    def to_dict(self) -> dict:
+        return {
+            "calls": self.calls,
+            "failures": self.failures,
+            "avg_latency_ms": round(self.total_latency / self.calls * 1000, 1) if self.calls else 0.0,
+        }
+
+
+class ModelRouter:
+    """
+    Routes answer evaluation to the rule engine, fast model or large model
+
+    - Empty explanations and wrong options with a near-empty reason are
+      decided by the rule engine
+    - Long explanations go straight to the large model
+    - Everything else goes to the fast model and is escalated to the large
+      model when it reports low confidence or disagrees with the rule engine
+    """
+
+    def __init__(
+        self,
+        fast_model: Optional[str],
+        trivial_chars: int = 8,
+        long_chars: int = 300,
+        min_confidence: int = 70,
+        max_disagreement: int = 30
+    ):
+        self.fast_model = fast_model
+        self.trivial_chars = trivial_chars
+        self.long_chars = long_chars
+        self.min_confidence = min_confidence
+        self.max_disagreement = max_disagreement
+        self.stats: Dict[EvaluationTier, TierStats] = {tier: TierStats() for tier in EvaluationTier}
+        self.escalations = 0
+
+    def route(self, explanation: str, is_correct: bool) -> EvaluationTier:
+        """Pick the initial tier for an answer"""
+        length = len(explanation.strip())
+        if length == 0:
+            return EvaluationTier.RULE
+        if not is_correct and length < self.trivial_chars:
+            return EvaluationTier.RULE
+        if not self.fast_model or length > self.long_chars:
+            return EvaluationTier.LARGE
+        return EvaluationTier.FAST
+
+    def should_escalate(self, result: dict, rule_evaluation: AnswerEvaluation) -> bool:
+        """Check whether a fast-model result needs a second opinion from the large model"""
+        try:
+            confidence = int(result.get("confidence", 0))
+            score = int(result.get("score", 0))
+        except (TypeError, ValueError):
+            return True
+        if confidence < self.min_confidence:
+            return True
+        return abs(score - rule_evaluation.score) > self.max_disagreement
+
+    def record(self, tier: EvaluationTier, latency: float, failed: bool = False):
+        """Record one call on a tier"""
+        stats = self.stats[tier]
+        stats.calls += 1
+        stats.total_latency += latency
+        if failed:
+            stats.failures += 1
+        EVALUATION_TIER.labels(tier.value).inc()
+
+    def record_escalation(self):
+        self.escalations += 1
+
+    def snapshot(self) -> dict:
+        """Get per-tier metrics"""
+        return {
+            "tiers": {tier.value: stats.to_dict() for tier, stats in self.stats.items()},
+            "escalations": self.escalations,
+        }
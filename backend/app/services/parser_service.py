@@ -0,0 +1,276 @@
+"""
+Parser Service - Resume/JD parsing through the external parser APIs
+
+Calls go through one pooled httpx.AsyncClient per process (keep-alive,
+HTTP/2 when the optional h2 package is installed, bounded concurrency).
+Results are cached by a hash of the document content: the same JD is
+parsed once for every candidate applying to it, and concurrent requests
+for a document that is being parsed wait for that call instead of making
+their own. Uploads are hashed and forwarded in chunks from Starlette's
+spooled file, so they are never held in memory as a whole; the file is
+read in worker threads, never on the event loop.
+"""
+import asyncio
+import hashlib
+import importlib.util
+import time
+import uuid
+from collections import OrderedDict
+from typing import AsyncIterator, BinaryIO, Dict, Optional, Tuple
+
+from ..core.config import get_settings
+from ..core.metrics import PARSE_CACHE, UPSTREAM_ERRORS, UPSTREAM_REQUEST_DURATION
+
+HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+CHUNK_SIZE = 64 * 1024
+
+# Parser service per document kind: (URL setting, API key setting)
+PARSERS = {
+    "resume": ("resume_parser_api_url", "resume_parser_api_key"),
+    "jd": ("jd_parser_api_url", "jd_parser_api_key"),
+}
+
+
+class ParserNotConfiguredError(Exception):
+    """No parser service URL is configured for the document kind"""
+
+
+class DocumentTooLargeError(Exception):
+    """The uploaded document exceeds the configured size limit"""
+
+
+class ParserError(Exception):
+    """The parser service failed or returned an unusable response"""
+
+
+class ParserService:
+    """Parse resumes and JDs with a shared connection pool and a result cache"""
+
+    def __init__(self):
+        self.settings = get_settings()
+        self._client = None  # httpx.AsyncClient
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._cache: "OrderedDict[str, dict]" = OrderedDict()
+        self._in_flight: Dict[str, asyncio.Task] = {}
+
+    def is_configured(self, kind: str) -> bool:
+        """Check whether a parser URL is set for the document kind"""
+        return bool(getattr(self.settings, PARSERS[kind][0]))
+
+    def _get_client(self):
+        """Shared httpx.AsyncClient, created on first use in the serving event loop"""
+        if self._client is None:
+            import httpx  # Takes ~0.1s to import; only needed once a parser is called
+            limit = self.settings.parser_max_connections
+            self._client = httpx.AsyncClient(
+                http2=HTTP2_AVAILABLE,
+                limits=httpx.Limits(
+                    max_connections=limit,
+                    max_keepalive_connections=limit,
+                    keepalive_expiry=60.0
+                ),
+                timeout=httpx.Timeout(self.settings.parser_timeout, connect=5.0)
+            )
+            self._semaphore = asyncio.Semaphore(self.settings.parser_max_concurrency)
+        return self._client
+
+    async def aclose(self):
+        """Close pooled connections (application shutdown)"""
+        client, self._client = self._client, None
+        if client is not None:
+            await client.aclose()
+
+    def reset(self):
+        """Forget the client without closing it (forked worker; the pool belongs to the parent)"""
+        self._client = None
+        self._semaphore = None
+        self._in_flight.clear()
+
+    def cache_info(self) -> dict:
+        """Cache size and parses currently in flight"""
+        return {"entries": len(self._cache), "in_flight": len(self._in_flight)}
+
+    async def parse_text(self, kind: str, text: str) -> Tuple[dict, bool]:
+        """
+        Parse a pasted document
+
+        Args:
+            kind: "resume" or "jd"
+            text: Document text
+
+        Returns:
+            (parsed data, whether it came from the cache)
+
+        Raises:
+            ParserNotConfiguredError: No parser URL is set for the kind
+            DocumentTooLargeError: Text exceeds the upload limit
+            ParserError: The parser call failed
+        """
+        body = text.encode("utf-8")
+        if len(body) > self.settings.parser_max_upload_mb * 1024 * 1024:
+            raise DocumentTooLargeError()
+        key = f"{kind}:text:{hashlib.sha256(body).hexdigest()}"
+        return await self._parse(kind, key, lambda client, url, headers: client.post(
+            url, json={"text": text}, headers=headers
+        ))
+
+    async def parse_file(
+        self,
+        kind: str,
+        file: BinaryIO,
+        filename: str,
+        content_type: Optional[str] = None
+    ) -> Tuple[dict, bool]:
+        """
+        Parse an uploaded document (PDF, Word, ...)
+
+        Args:
+            kind: "resume" or "jd"
+            file: Seekable file holding the upload (read in chunks)
+            filename: Original file name (sent to the parser, not part of the cache key)
+            content_type: Upload content type
+
+        Returns:
+            (parsed data, whether it came from the cache)
+
+        Raises:
+            ParserNotConfiguredError: No parser URL is set for the kind
+            DocumentTooLargeError: File exceeds the upload limit
+            ParserError: The parser call failed
+        """
+        digest, size = await asyncio.to_thread(self._hash_file, file)
+        key = f"{kind}:file:{digest}"
+
+        def send(client, url: str, headers: dict):
+            # httpx only reads sync file objects on the calling thread, i.e. the event loop;
+            # the multipart body is streamed from an async generator instead
+            boundary = uuid.uuid4().hex
+            name = filename.replace("\\", "\\\\").replace('"', "%22").replace("\r", "%0D").replace("\n", "%0A")
+            head = (
+                f"--{boundary}\r\n"
+                f'Content-Disposition: form-data; name="file"; filename="{name}"\r\n'
+                f"Content-Type: {content_type or 'application/octet-stream'}\r\n\r\n"
+            ).encode("utf-8")
+            tail = f"\r\n--{boundary}--\r\n".encode("ascii")
+            return client.post(
+                url,
+                content=_multipart_body(file, head, tail),
+                headers={
+                    **headers,
+                    "Content-Type": f"multipart/form-data; boundary={boundary}",
+                    "Content-Length": str(len(head) + size + len(tail)),
+                }
+            )
+
+        return await self._parse(kind, key, send)
+
+    def _hash_file(self, file: BinaryIO) -> Tuple[str, int]:
+        """Hash a file in chunks, enforcing the size limit (returns digest and size)"""
+        limit = self.settings.parser_max_upload_mb * 1024 * 1024
+        sha = hashlib.sha256()
+        size = 0
+        file.seek(0)
+        while True:
+            chunk = file.read(CHUNK_SIZE)
+            if not chunk:
+                break
+            size += len(chunk)
+            if size > limit:
+                raise DocumentTooLargeError()
+            sha.update(chunk)
+        return sha.hexdigest(), size
+
+    async def _parse(self, kind: str, key: str, send) -> Tuple[dict, bool]:
+        """Serve from the cache, join a parse in flight, or call the parser"""
+        url_setting, key_setting = PARSERS[kind]
+        url = getattr(self.settings, url_setting)
+        if not url:
+            raise ParserNotConfiguredError(kind)
+
+        cached = self._cache.get(key)
+        if cached is not None:
+            self._cache.move_to_end(key)
+            PARSE_CACHE.labels(kind, "hit").inc()
+            return cached, True
+        task = self._in_flight.get(key)
+        joined = task is not None
+        if joined:
+            PARSE_CACHE.labels(kind, "joined").inc()
+        else:
+            PARSE_CACHE.labels(kind, "miss").inc()
+            # The call runs in its own task, so it does not depend on the request that started it
+            task = asyncio.create_task(self._fetch(kind, key, url, getattr(self.settings, key_setting), send))
+            self._in_flight[key] = task
+            task.add_done_callback(lambda done: self._fetched(key, done))
+        # Shielded: one caller giving up (e.g. client disconnect) must not cancel the call for the others
+        return await asyncio.shield(task), joined
+
+    async def _fetch(self, kind: str, key: str, url: str, api_key: Optional[str], send) -> dict:
+        """Call the parser and cache the result (runs as the in-flight task of a document)"""
+        try:
+            data = await self._call(kind, url, api_key, send)
+        except ParserError:
+            raise
+        except Exception as e:
+            raise ParserError(str(e) or type(e).__name__) from e
+        self._cache[key] = data
+        while len(self._cache) > self.settings.parser_cache_size:
+            self._cache.popitem(last=False)
+        return data
+
+    def _fetched(self, key: str, task: asyncio.Task):
+        """Done callback of an in-flight task"""
+        if self._in_flight.get(key) is task:  # Not replaced after reset()
+            del self._in_flight[key]
+        if not task.cancelled():
+            task.exception()  # Retrieved here so a failure nobody waits for anymore is not logged
+
+    async def _call(self, kind: str, url: str, api_key: Optional[str], send) -> dict:
+        """One parser call through the shared pool"""
+        import httpx
+        client = self._get_client()
+        headers = {"Authorization": f"Bearer {api_key}"} if api_key else {}
+        service = f"{kind}_parser"
+        started = time.monotonic()
+        try:
+            async with self._semaphore:
+                response = await send(client, url, headers)
+            response.raise_for_status()
+            payload = response.json()
+        except (httpx.HTTPError, ValueError) as e:
+            print(f"{kind} parser call failed: {e}")
+            UPSTREAM_ERRORS.labels(service, type(e).__name__).inc()
+            UPSTREAM_REQUEST_DURATION.labels(service, "error").observe(time.monotonic() - started)
+            raise ParserError(str(e) or type(e).__name__) from e
+        UPSTREAM_REQUEST_DURATION.labels(service, "ok").observe(time.monotonic() - started)
+
+        # Parsers commonly wrap the result as {"data": {...}}
+        if isinstance(payload, dict) and isinstance(payload.get("data"), dict):
+            payload = payload["data"]
+        if not isinstance(payload, dict):
+            raise ParserError("unexpected response")
+        return payload
+
+
+async def _multipart_body(file: BinaryIO, head: bytes, tail: bytes) -> AsyncIterator[bytes]:
+    """Multipart body of one file part, reading the file in worker threads"""
+    yield head
+    await asyncio.to_thread(file.seek, 0)
+    while True:
+        chunk = await asyncio.to_thread(file.read, CHUNK_SIZE)
+        if not chunk:
+            break
+        yield chunk
+    yield tail
+
+
+# Singleton instance
+_parser_service: Optional[ParserService] = None
+
+
+def get_parser_service() -> ParserService:
+    """Get parser service singleton"""
+    global _parser_service
+    if _parser_service is None:
+        _parser_service = ParserService()
+    return _parser_service
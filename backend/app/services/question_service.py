@@ -1,52 +1,325 @@
 """
 Question Service - Manages interview questions
 """
+import hashlib
 import json
 import random
+from bisect import bisect_right
 from pathlib import Path
-from typing import List, Optional
-from ..schemas.interview import Question, QuestionType, DifficultyLevel
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+from pydantic import TypeAdapter
+from ..core.config import get_settings
+from ..core.http_cache import StaticPayload
+from ..schemas.interview import Question, QuestionDisplay, QuestionType, DifficultyLevel
+from .keypoint_matcher import compile_matchers
+from .search_index import SearchIndex
+from .similarity_index import SimilarityIndex
+
+_QUESTION_LIST = TypeAdapter(List[Question])
+_MATCH_CACHE_SIZE = 32  # Combined-filter results kept per bank version
+_PROFILE_CACHE_SIZE = 256  # Resume/JD rankings kept per bank version (many candidates share a JD)
+_DATA_PATH = Path(__file__).parent.parent.parent / "data" / "questions.json"
+
+# Resume/JD matching: bonus on cosine similarity for the difficulty suited to the
+# candidate's experience, and random damping so candidates with the same profile
+# do not all get the same questions
+_DIFFICULTY_BONUS = 0.1
+_MATCH_JITTER = 0.15
+_PROFILE_EMPHASIS = ("skills", "requirements")  # Profile fields counted twice
+
+
+class _Bank:
+    """
+    One version of the question bank with the indexes and caches derived from it
+    
+    Built completely before it is published and then replaced as a whole, so
+    a request that reads the bank once sees a single version even while a
+    reload runs in another thread. Caches filled by requests stay with the
+    version they were built for.
+    """
+    
+    def __init__(self, questions: List[Question], version: str = "", views: Optional[Dict[str, StaticPayload]] = None):
+        self.questions = questions
+        self.version = version
+        self.by_id: Dict[str, Question] = {q.id: q for q in questions}
+        # Bank positions by type, difficulty and tag (ascending, so pages follow bank order)
+        self.positions: Dict[str, int] = {}
+        self.by_type: Dict[QuestionType, List[int]] = {}
+        self.by_difficulty: Dict[DifficultyLevel, List[int]] = {}
+        self.by_tag: Dict[str, List[int]] = {}
+        for position, q in enumerate(questions):
+            self.positions[q.id] = position
+            self.by_type.setdefault(q.type, []).append(position)
+            self.by_difficulty.setdefault(q.difficulty, []).append(position)
+            for tag in dict.fromkeys(q.tags):
+                self.by_tag.setdefault(tag, []).append(position)
+        self.match_cache: Dict[tuple, List[int]] = {}
+        self.profile_matches: Dict[tuple, List[Tuple[Question, float]]] = {}
+        self.views: Dict[str, StaticPayload] = views or {}
+        self.displays: Dict[str, QuestionDisplay] = {}
 
 
 class QuestionService:
     """Question bank service"""
     
     def __init__(self):
-        self.questions: List[Question] = []
+        self._bank = _Bank([])
+        self.search_index = SearchIndex()
+        self.similarity_index = SimilarityIndex(get_settings().similarity_hash_bits)
         self._load_questions()
     
+    @property
+    def questions(self) -> List[Question]:
+        """Questions of the current bank version"""
+        return self._bank.questions
+    
+    @property
+    def version(self) -> str:
+        """Current bank version (hash of the serialized questions)"""
+        return self._bank.version
+    
+    def _read_questions(self) -> List[Question]:
+        """Read and validate the question file"""
+        with open(_DATA_PATH, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        return [Question(**q) for q in data.get("questions", [])]
+    
     def _load_questions(self):
         """Load questions from JSON file"""
-        data_path = Path(__file__).parent.parent.parent / "data" / "questions.json"
+        questions = []
         try:
-            with open(data_path, "r", encoding="utf-8") as f:
-                data = json.load(f)
-                self.questions = [Question(**q) for q in data.get("questions", [])]
+            questions = self._read_questions()
         except FileNotFoundError:
-            print(f"Warning: Question file not found at {data_path}")
-            self.questions = []
+            print(f"Warning: Question file not found at {_DATA_PATH}")
         except Exception as e:
             print(f"Error loading questions: {e}")
-            self.questions = []
+        
+        self.set_questions(questions)
+    
+    def reload(self) -> dict:
+        """
+        Reload the question file without restarting (hot reload)
+        
+        Returns:
+            New bank version, question count and search index changes
+        
+        Raises:
+            Exception: If the file cannot be read or validated (the current bank is kept)
+        """
+        questions = self._read_questions()
+        changes = self.set_questions(questions)
+        return {"version": self.version, "questions": len(questions), "search_index": changes}
+    
+    def set_questions(self, questions: List[Question]) -> Dict[str, int]:
+        """
+        Replace the question bank and rebuild derived data
+        
+        The bank version is a hash of the serialized questions; cached views
+        and display models belong to one version and are dropped here. The
+        search index is updated incrementally. Requests keep reading the
+        previous version until the new one is complete.
+        
+        Args:
+            questions: New list of questions
+        
+        Returns:
+            Counts of questions added, updated and removed in the search index
+        """
+        all_json = _QUESTION_LIST.dump_json(questions)
+        version = hashlib.sha256(all_json).hexdigest()[:16]
+        # Compressed here (startup or reload thread) rather than by the first request
+        views = {"all": StaticPayload(all_json, version).precompress(get_settings().http_compress_min_size)}
+        bank = _Bank(questions, version, views)
+        compile_matchers(questions)
+        changes = self.search_index.update(questions)
+        self.similarity_index.build(questions, self.search_index, bank.positions)
+        self._bank = bank
+        return changes
     
     def get_all_questions(self) -> List[Question]:
         """Get all questions"""
-        return self.questions
+        return self._bank.questions
     
     def get_question_by_id(self, question_id: str) -> Optional[Question]:
         """Get question by ID"""
-        for q in self.questions:
-            if q.id == question_id:
-                return q
-        return None
+        return self._bank.by_id.get(question_id)
+    
+    def get_view(self, name: str, build: Callable[[], object]) -> StaticPayload:
+        """
+        Get a read-only view of the bank serialized as JSON
+        
+        Views are serialized once per bank version; the payload carries
+        an ETag tied to that version.
+        
+        Args:
+            name: Cache key of the view (e.g. "all", "type:logic")
+            build: Returns the questions (or a single question) in the view
+        
+        Returns:
+            Serialized view
+        """
+        bank = self._bank
+        payload = bank.views.get(name)
+        if payload is None:
+            value = build()
+            if isinstance(value, Question):
+                body = value.model_dump_json().encode()
+            else:
+                body = _QUESTION_LIST.dump_json(value)
+            payload = StaticPayload(body, bank.version)
+            bank.views[name] = payload
+        return payload
+    
+    def get_display(self, question: Question) -> QuestionDisplay:
+        """
+        Get the candidate-facing view of a question (answer hidden)
+        
+        The model is validated once per question and bank version and
+        shared between requests; callers must not modify it.
+        
+        Args:
+            question: Question to display
+        
+        Returns:
+            Question display model
+        """
+        displays = self._bank.displays
+        display = displays.get(question.id)
+        if display is None:
+            display = QuestionDisplay(
+                id=question.id,
+                type=question.type,
+                difficulty=question.difficulty,
+                title=question.title,
+                content=question.content,
+                options=[{"key": o.key, "content": o.content} for o in question.options] if question.options else None,
+                key_points=question.key_points  # Show evaluation points as hints
+            )
+            displays[question.id] = display
+        return display
     
     def get_questions_by_type(self, q_type: QuestionType) -> List[Question]:
         """Get questions by type"""
-        return [q for q in self.questions if q.type == q_type]
+        bank = self._bank
+        return [bank.questions[i] for i in bank.by_type.get(q_type, [])]
     
     def get_questions_by_difficulty(self, difficulty: DifficultyLevel) -> List[Question]:
         """Get questions by difficulty"""
-        return [q for q in self.questions if q.difficulty == difficulty]
+        bank = self._bank
+        return [bank.questions[i] for i in bank.by_difficulty.get(difficulty, [])]
+    
+    def _match_positions(
+        self,
+        bank: _Bank,
+        q_type: Optional[QuestionType],
+        difficulty: Optional[DifficultyLevel],
+        tags: Optional[List[str]]
+    ) -> Sequence[int]:
+        """Bank positions matching all filters (any of the tags), in ascending order"""
+        candidates = []
+        if q_type:
+            candidates.append(bank.by_type.get(q_type, []))
+        if difficulty:
+            candidates.append(bank.by_difficulty.get(difficulty, []))
+        if tags:
+            if len(tags) == 1:
+                candidates.append(bank.by_tag.get(tags[0], []))
+            else:
+                candidates.append(sorted(set().union(*(bank.by_tag.get(tag, []) for tag in tags))))
+        if not candidates:
+            return range(len(bank.questions))
+        if len(candidates) == 1:
+            return candidates[0]
+        
+        key = (q_type, difficulty, tuple(sorted(tags)) if tags else None)
+        cached = bank.match_cache.get(key)
+        if cached is not None:
+            return cached
+        
+        # Walk the most selective index and check the other filters on each question
+        tag_set = set(tags) if tags else None
+        matched = []
+        for position in min(candidates, key=len):
+            q = bank.questions[position]
+            if q_type and q.type != q_type:
+                continue
+            if difficulty and q.difficulty != difficulty:
+                continue
+            if tag_set and tag_set.isdisjoint(q.tags):
+                continue
+            matched.append(position)
+        
+        if len(bank.match_cache) >= _MATCH_CACHE_SIZE:
+            bank.match_cache.pop(next(iter(bank.match_cache)), None)
+        bank.match_cache[key] = matched
+        return matched
+    
+    def search_questions(
+        self,
+        query: str,
+        limit: int = 20,
+        q_type: Optional[QuestionType] = None,
+        difficulty: Optional[DifficultyLevel] = None
+    ) -> Tuple[List[Tuple[Question, float]], int]:
+        """
+        Full-text search over title, content, tags and key points (BM25)
+        
+        Args:
+            query: Search text
+            limit: Maximum number of results
+            q_type: Type filter
+            difficulty: Difficulty filter
+        
+        Returns:
+            ([(question, score)] best first, total number of matches)
+        """
+        return self.search_index.search(query, limit=limit, q_type=q_type, difficulty=difficulty)
+    
+    def count_questions(
+        self,
+        q_type: Optional[QuestionType] = None,
+        difficulty: Optional[DifficultyLevel] = None,
+        tags: Optional[List[str]] = None
+    ) -> int:
+        """Count questions matching the filters"""
+        return len(self._match_positions(self._bank, q_type, difficulty, tags))
+    
+    def query_questions(
+        self,
+        q_type: Optional[QuestionType] = None,
+        difficulty: Optional[DifficultyLevel] = None,
+        tags: Optional[List[str]] = None,
+        after_id: Optional[str] = None,
+        limit: int = 50
+    ) -> Tuple[List[Question], Optional[str], int]:
+        """
+        Get one page of questions matching the filters, in bank order
+        
+        Args:
+            q_type: Type filter
+            difficulty: Difficulty filter
+            tags: Tag filter (questions with any of the tags)
+            after_id: ID of the last question of the previous page
+            limit: Page size
+        
+        Returns:
+            (Questions, ID to continue after or None on the last page, total matches)
+        
+        Raises:
+            ValueError: If after_id is not in the bank (e.g. removed by a reload)
+        """
+        bank = self._bank
+        positions = self._match_positions(bank, q_type, difficulty, tags)
+        start = 0
+        if after_id is not None:
+            after = bank.positions.get(after_id)
+            if after is None:
+                raise ValueError(f"Question {after_id} is no longer in the bank")
+            start = bisect_right(positions, after)
+        
+        page = [bank.questions[i] for i in positions[start:start + limit]]
+        has_more = start + limit < len(positions)
+        return page, page[-1].id if page and has_more else None, len(positions)
     
     def select_questions_for_interview(
         self,
@@ -67,7 +340,11 @@ class QuestionService:
         Returns:
             List of selected questions
         """
-        candidates = self.questions.copy()
+        bank = self._bank
+        if not (difficulty_preference or type_preference or tags):
+            return [bank.questions[i] for i in self._sample_positions(bank, count)]
+        
+        candidates = bank.questions.copy()
         
         # Filter by preferences
         if difficulty_preference:
@@ -84,7 +361,7 @@ class QuestionService:
         
         # Fallback to all questions if filtered results are insufficient
         if len(candidates) < count:
-            candidates = self.questions.copy()
+            candidates = bank.questions.copy()
         
         # Random selection with type diversity
         if len(candidates) <= count:
@@ -109,6 +386,43 @@ class QuestionService:
         
         return selected
     
+    def _sample_positions(self, bank: _Bank, count: int) -> List[int]:
+        """
+        Pick random bank positions with type diversity, without copying or shuffling the bank
+        
+        Same distribution as shuffling the bank, taking the first question of
+        each type and then random others: types are drawn in the order a
+        shuffle reaches them (weighted by their size) and questions uniformly
+        within a type, so a pick costs O(count) instead of O(bank size).
+        
+        Args:
+            bank: Bank version to pick from
+            count: Number of positions
+        
+        Returns:
+            Distinct positions in random order (the whole bank if it is not larger)
+        """
+        size = len(bank.questions)
+        if size <= count:
+            return random.sample(range(size), size)
+        
+        # One question of each type first
+        type_sizes = {q_type: len(positions) for q_type, positions in bank.by_type.items()}
+        selected = []
+        while type_sizes and len(selected) < count:
+            q_type = random.choices(list(type_sizes), weights=list(type_sizes.values()))[0]
+            del type_sizes[q_type]
+            selected.append(random.choice(bank.by_type[q_type]))
+        
+        # Fill remaining slots randomly
+        taken = set(selected)
+        while len(selected) < count:
+            position = random.randrange(size)
+            if position not in taken:
+                taken.add(position)
+                selected.append(position)
+        return selected
+    
     def auto_select_questions(
         self,
         resume_data: Optional[dict] = None,
@@ -128,32 +442,9 @@ class QuestionService:
         Returns:
             List of selected questions (2 or 3)
         """
-        # Get all available questions
-        candidates = self.questions.copy()
-        
-        if not candidates:
-            return []
-        
-        # Step 1: First select 3 questions with type diversity
-        selected = []
-        types_used = set()
-        
-        # Shuffle for randomness
-        random.shuffle(candidates)
-        
-        # Try to select diverse types first
-        for q in candidates:
-            if len(selected) >= 3:
-                break
-            if q.type not in types_used:
-                selected.append(q)
-                types_used.add(q.type)
-        
-        # If not enough diverse types, fill randomly
-        remaining = [q for q in candidates if q not in selected]
-        random.shuffle(remaining)
-        while len(selected) < 3 and remaining:
-            selected.append(remaining.pop())
+        # Step 1: First select 3 questions with type diversity (random order)
+        bank = self._bank
+        selected = [bank.questions[i] for i in self._sample_positions(bank, 3)]
         
         # Step 2: Check if selected questions contain easy questions
         has_easy = any(q.difficulty == DifficultyLevel.EASY for q in selected)
@@ -174,7 +465,11 @@ class QuestionService:
         jd_data: Optional[dict] = None
     ) -> List[Question]:
         """
-        Select targeted questions based on resume and JD data (reserved interface)
+        Select targeted questions based on resume and JD data
+        
+        The resume and JD text is scored against every question (TF-IDF
+        cosine similarity); the best matches are picked with type diversity,
+        favoring the difficulty that suits the candidate's experience.
         
         Args:
             count: Number of questions
@@ -184,40 +479,68 @@ class QuestionService:
         Returns:
             List of selected questions
         """
-        # TODO: Analyze resume and JD data to select targeted questions
-        # Currently using default selection logic
-        tags = []
         difficulty = None
-        
         if resume_data:
-            # Extract relevant info from resume
-            skills = resume_data.get("skills", [])
-            experience_years = resume_data.get("experience_years", 0)
-            
             # Adjust difficulty based on experience
+            experience_years = resume_data.get("experience_years") or 0
             if experience_years >= 5:
                 difficulty = DifficultyLevel.HARD
             elif experience_years >= 2:
                 difficulty = DifficultyLevel.MEDIUM
             else:
                 difficulty = DifficultyLevel.EASY
-            
-            # Add tags based on skills
-            if "algorithm" in skills or "data structure" in skills:
-                tags.append("Algorithm")
-            if "system design" in skills:
-                tags.append("System Design")
-        
-        if jd_data:
-            # Extract relevant info from JD
-            requirements = jd_data.get("requirements", [])
-            # Can add more filtering logic based on JD requirements
-        
-        return self.select_questions_for_interview(
-            count=count,
-            difficulty_preference=difficulty,
-            tags=tags if tags else None
-        )
+        
+        profile = " ".join(_profile_text(data) for data in (resume_data, jd_data) if data)
+        k = max(count * 10, 30)
+        bank = self._bank
+        matches = bank.profile_matches.get((profile, k))
+        if matches is None:
+            matches = self.similarity_index.top(profile, k=k)
+            if len(bank.profile_matches) >= _PROFILE_CACHE_SIZE:
+                bank.profile_matches.pop(next(iter(bank.profile_matches)), None)
+            bank.profile_matches[(profile, k)] = matches
+        if not matches:
+            # Nothing in the profile relates to the bank
+            return self.select_questions_for_interview(count=count, difficulty_preference=difficulty)
+        
+        ranked = []
+        for question, score in matches:
+            if difficulty and question.difficulty == difficulty:
+                score += _DIFFICULTY_BONUS
+            ranked.append((score * random.uniform(1 - _MATCH_JITTER, 1), question))
+        ranked.sort(key=lambda item: item[0], reverse=True)
+        
+        # Best match of each type first, then the best of the rest
+        selected = []
+        types_used = set()
+        for _, question in ranked:
+            if len(selected) < count and question.type not in types_used:
+                selected.append(question)
+                types_used.add(question.type)
+        for _, question in ranked:
+            if len(selected) >= count:
+                break
+            if question not in selected:
+                selected.append(question)
+        
+        if len(selected) < count:
+            chosen = {q.id for q in selected}
+            others = [q for q in bank.questions if q.id not in chosen]
+            selected.extend(random.sample(others, min(count - len(selected), len(others))))
+        return selected
+
+
+def _profile_text(data, key: str = "") -> str:
+    """Flatten the text of parsed resume/JD data (emphasized fields count twice)"""
+    if isinstance(data, str):
+        text = data
+    elif isinstance(data, dict):
+        text = " ".join(_profile_text(value, name) for name, value in data.items())
+    elif isinstance(data, (list, tuple)):
+        text = " ".join(_profile_text(value) for value in data)
+    else:
+        return ""
+    return f"{text} {text}" if key in _PROFILE_EMPHASIS else text
 
 
 # Singleton instance
@@ -0,0 +1,298 @@
+"""
+Search Index - In-memory inverted index with BM25 ranking over the question bank
+
+Text is folded like key points (width, case, traditional characters) and
+split into character bigrams for Chinese runs and whole words for Latin
+letters and digits. Fields are weighted (title > tags, key points > content)
+and scored with BM25 over the weighted term frequencies.
+
+Scores are accumulated with NumPy over the postings arrays when it is
+installed, and in a dictionary otherwise.
+
+Documents get increasing numbers, so postings stay sorted by appending.
+Updates are incremental: only added, changed or removed questions are
+(re)tokenized. Removed documents stay in the postings as tombstones that
+are skipped at query time and no longer counted in document frequencies;
+the index is compacted once they make up a quarter of it.
+"""
+import heapq
+import math
+import re
+import threading
+import unicodedata
+from array import array
+from collections import Counter
+from operator import add, itemgetter
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from ..schemas.interview import DifficultyLevel, Question, QuestionType
+from .keypoint_matcher import to_simplified
+
+K1 = 1.2
+B = 0.75
+
+# Term frequency multipliers (whole numbers, so a field counts as repeated text)
+FIELD_WEIGHTS = (("title", 3), ("tags", 2), ("key_points", 2), ("content", 1))
+
+# Runs of CJK ideographs, or of ASCII / full-width letters and digits
+_TOKEN_RE = re.compile(r"[\u3400-\u4dbf\u4e00-\u9fff]+|[a-zA-Z0-9\uff10-\uff19\uff21-\uff3a\uff41-\uff5a]+")
+_MAX_CHAR_EXPANSION = 64  # Bigrams a single-character query may expand to
+_COMPACT_RATIO = 0.25
+
+# Filter codes per document for the NumPy engine (-1 for removed documents)
+_TYPE_CODES = {q_type: code for code, q_type in enumerate(QuestionType)}
+_DIFFICULTY_CODES = {level: code for code, level in enumerate(DifficultyLevel)}
+
+np = None  # NumPy module once loaded (optional dependency, imported on first index update)
+
+
+def load_numpy():
+    """Import NumPy if installed (kept off the app import path), or return None"""
+    global np
+    if np is None:
+        try:
+            import numpy
+        except ImportError:
+            return None
+        np = numpy
+    return np
+
+
+def tokenize(text: str) -> List[str]:
+    """Split text into search terms (character bigrams for Chinese, words otherwise)"""
+    terms = []
+    # Only letter runs need width folding; NFKC over the whole text is slow on CJK punctuation
+    for run in _TOKEN_RE.findall(to_simplified(text)):
+        if run[0] < "\u3400" or run[0] > "\u9fff":
+            terms.append(run.lower() if run.isascii() else unicodedata.normalize("NFKC", run).lower())
+        elif len(run) == 1:
+            terms.append(run)
+        else:
+            terms.extend(map(add, run, run[1:]))
+    return terms
+
+
+def weighted_terms(question: Question) -> Counter:
+    """Field-weighted term frequencies of a question"""
+    terms = []
+    for field, weight in FIELD_WEIGHTS:
+        value = getattr(question, field)
+        terms.extend(tokenize(" ".join(value) if isinstance(value, list) else value) * weight)
+    return Counter(terms)
+
+
+def _fingerprint(question: Question) -> tuple:
+    """Indexed text of a question, to detect changes on reload"""
+    return question.title, question.content, tuple(question.tags), tuple(question.key_points)
+
+
+class SearchIndex:
+    """Inverted index over title, content, tags and key points"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._reset()
+
+    def _reset(self):
+        self._postings: Dict[str, Tuple[array, array]] = {}  # term -> (doc numbers, weighted tf)
+        self._dead: Dict[str, int] = {}                       # Postings of removed documents per term
+        self._by_char: Dict[str, set] = {}                    # Character -> bigram terms containing it
+        self._docs: List[Optional[Question]] = []             # None once removed
+        self._lengths: List[float] = []
+        self._norms: List[Optional[float]] = []               # BM25 length normalization, None when removed
+        self._arrays: Optional[tuple] = None                  # NumPy (norms, type codes, difficulty codes)
+        self._doc_by_id: Dict[str, int] = {}
+        self._fingerprints: Dict[str, tuple] = {}
+        self._live = 0
+        self._total_length = 0.0
+
+    def __len__(self) -> int:
+        return self._live
+
+    def update(self, questions: List[Question]) -> Dict[str, int]:
+        """
+        Bring the index in line with the bank, touching only what changed
+
+        Args:
+            questions: The complete current bank
+
+        Returns:
+            Counts of added, updated (reindexed) and removed questions
+        """
+        with self._lock:
+            current = {q.id: q for q in questions}
+            removed = [qid for qid in self._doc_by_id if qid not in current]
+            changed, added = [], []
+            for qid, question in current.items():
+                doc = self._doc_by_id.get(qid)
+                if doc is None:
+                    added.append(question)
+                elif self._fingerprints[qid] != _fingerprint(question):
+                    changed.append(question)
+                else:
+                    self._docs[doc] = question  # Same text; keep postings, refresh the model
+
+            for qid in removed:
+                self._remove(qid)
+            for question in changed:
+                self._remove(question.id)
+                self._add(question)
+            for question in added:
+                self._add(question)
+
+            if len(self._docs) - self._live > _COMPACT_RATIO * max(len(self._docs), 1):
+                live = [q for q in self._docs if q is not None]
+                self._reset()
+                for question in live:
+                    self._add(question)
+            self._update_norms()
+            return {"added": len(added), "updated": len(changed), "removed": len(removed)}
+
+    def _add(self, question: Question):
+        doc = len(self._docs)
+        weights = weighted_terms(question)
+        for term, tf in weights.items():
+            postings = self._postings.get(term)
+            if postings is None:
+                postings = self._postings[term] = (array("I"), array("I"))
+                if len(term) == 2 and not term.isascii():
+                    for char in term:
+                        self._by_char.setdefault(char, set()).add(term)
+            postings[0].append(doc)
+            postings[1].append(tf)
+        length = sum(weights.values())
+        self._docs.append(question)
+        self._lengths.append(length)
+        self._doc_by_id[question.id] = doc
+        self._fingerprints[question.id] = _fingerprint(question)
+        self._live += 1
+        self._total_length += length
+
+    def _remove(self, question_id: str):
+        doc = self._doc_by_id.pop(question_id)
+        del self._fingerprints[question_id]
+        for term in weighted_terms(self._docs[doc]):
+            self._dead[term] = self._dead.get(term, 0) + 1  # The posting stays; it is skipped by its norm
+        self._docs[doc] = None
+        self._live -= 1
+        self._total_length -= self._lengths[doc]
+
+    def _update_norms(self):
+        avg_length = self._total_length / self._live if self._live else 1.0
+        self._norms = [
+            K1 * (1 - B + B * length / avg_length) if question is not None else None
+            for question, length in zip(self._docs, self._lengths)
+        ]
+        if load_numpy() is not None:
+            # An infinite norm scores removed documents 0, so they never count as matches
+            norms = np.array([np.inf if norm is None else norm for norm in self._norms], dtype=np.float64)
+            types = np.array([_TYPE_CODES[q.type] if q else -1 for q in self._docs], dtype=np.int8)
+            difficulties = np.array([_DIFFICULTY_CODES[q.difficulty] if q else -1 for q in self._docs], dtype=np.int8)
+            self._arrays = (norms, types, difficulties)
+
+    def document_frequency(self, term: str) -> int:
+        """Number of live documents containing a term"""
+        postings = self._postings.get(term)
+        return len(postings[0]) - self._dead.get(term, 0) if postings else 0
+
+    def postings(self) -> Iterator[Tuple[str, int, array, array]]:
+        """
+        Iterate (term, document frequency, doc numbers, weighted tf) for terms in live documents
+
+        Doc numbers index documents(); entries of removed documents are included.
+        Not synchronized with update(): call from the thread that updates the index.
+        """
+        for term, (doc_numbers, tfs) in self._postings.items():
+            df = len(doc_numbers) - self._dead.get(term, 0)
+            if df:
+                yield term, df, doc_numbers, tfs
+
+    def documents(self) -> List[Optional[Question]]:
+        """Questions by doc number (None for removed ones)"""
+        return self._docs
+
+    def _query_terms(self, query: str) -> List[str]:
+        terms = []
+        for term in tokenize(query):
+            if len(term) == 1 and not term.isascii():
+                # A lone character only occurs inside bigrams; search those instead
+                expansion = sorted(self._by_char.get(term, ()), key=self.document_frequency, reverse=True)
+                terms.extend(expansion[:_MAX_CHAR_EXPANSION])
+            terms.append(term)
+        return list(dict.fromkeys(terms))
+
+    def search(
+        self,
+        query: str,
+        limit: int = 20,
+        q_type: Optional[QuestionType] = None,
+        difficulty: Optional[DifficultyLevel] = None
+    ) -> Tuple[List[Tuple[Question, float]], int]:
+        """
+        Rank questions against a query with BM25
+
+        Args:
+            query: Free-text query
+            limit: Maximum number of results
+            q_type: Type filter
+            difficulty: Difficulty filter
+
+        Returns:
+            ([(question, score)] best first, total number of matching questions)
+        """
+        with self._lock:
+            terms = []
+            for term in self._query_terms(query):
+                df = self.document_frequency(term)
+                if df:
+                    weight = math.log(1 + (self._live - df + 0.5) / (df + 0.5)) * (K1 + 1)
+                    terms.append((weight, *self._postings[term]))
+            if self._arrays is not None:
+                return self._search_numpy(terms, limit, q_type, difficulty)
+
+            norms, docs = self._norms, self._docs
+            scores: Dict[int, float] = {}
+            get_score = scores.get
+            for weight, doc_numbers, tfs in terms:
+                for doc, tf in zip(doc_numbers, tfs):
+                    norm = norms[doc]
+                    if norm is not None:
+                        scores[doc] = get_score(doc, 0.0) + weight * tf / (tf + norm)
+
+            if q_type or difficulty:
+                scores = {
+                    doc: score for doc, score in scores.items()
+                    if (not q_type or docs[doc].type == q_type)
+                    and (not difficulty or docs[doc].difficulty == difficulty)
+                }
+            best = heapq.nlargest(limit, scores.items(), key=itemgetter(1))
+            return [(docs[doc], round(score, 4)) for doc, score in best], len(scores)
+
+    def _search_numpy(
+        self,
+        terms: List[Tuple[float, array, array]],
+        limit: int,
+        q_type: Optional[QuestionType],
+        difficulty: Optional[DifficultyLevel]
+    ) -> Tuple[List[Tuple[Question, float]], int]:
+        """BM25 accumulated over whole postings arrays at once (doc numbers are unique per term)"""
+        norms, types, difficulties = self._arrays
+        scores = np.zeros(len(norms))
+        for weight, doc_numbers, tfs in terms:
+            docs = np.frombuffer(doc_numbers, dtype=doc_numbers.typecode)
+            tf = np.frombuffer(tfs, dtype=tfs.typecode).astype(np.float64)
+            scores[docs] += weight * tf / (tf + norms[docs])
+
+        matched = scores > 0
+        if q_type:
+            matched &= types == _TYPE_CODES[q_type]
+        if difficulty:
+            matched &= difficulties == _DIFFICULTY_CODES[difficulty]
+        matched = np.flatnonzero(matched)
+        if limit < len(matched):
+            best = matched[np.argpartition(-scores[matched], limit - 1)[:limit]]
+        else:
+            best = matched
+        # Best first; ties in document order, as the dictionary engine returns them
+        best = best[np.lexsort((best, -scores[best]))]
+        return [(self._docs[doc], round(float(scores[doc]), 4)) for doc in best], len(matched)
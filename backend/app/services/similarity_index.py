@@ -0,0 +1,181 @@
+"""
+Similarity Index - Hashed TF-IDF vectors of the question bank for resume/JD matching
+
+Question vectors are built at bank load from the search index postings
+(title, content, key points and tags are already tokenized and weighted
+there): terms are hashed into a fixed number of columns, weighted with
+TF-IDF and L2-normalized. The matrix is kept column-wise and sparse
+(indptr / indices / data, as in CSC), so scoring a profile against the
+whole bank only reads the columns of the profile's terms. NumPy is used
+when installed; otherwise the same layout is held in Python arrays.
+"""
+import heapq
+import math
+import zlib
+from array import array
+from collections import Counter
+from typing import Dict, List, Optional, Tuple
+
+from ..schemas.interview import Question
+from .search_index import SearchIndex, load_numpy, tokenize
+
+np = None  # NumPy module once loaded (optional dependency, imported on first build)
+
+
+def _load_numpy() -> bool:
+    """Import NumPy if installed (kept off the app import path; it is only needed for the bank)"""
+    global np
+    if np is None:
+        np = load_numpy()
+    return np is not None
+
+
+def _column(term: str, dimensions: int) -> Tuple[int, float]:
+    """Hashed column and sign of a term (the sign keeps collisions from adding up)"""
+    digest = zlib.crc32(term.encode("utf-8"))
+    return digest % dimensions, -1.0 if digest & 0x80000000 else 1.0
+
+
+class SimilarityIndex:
+    """Cosine similarity between free text and every question of the bank"""
+
+    def __init__(self, hash_bits: int = 18):
+        self.dimensions = 1 << hash_bits
+        self.engine = ""  # "numpy" or "python" once built
+        # Column-compressed matrix of unit row vectors, with the questions and IDF it was built
+        # from (one tuple, replaced as a whole on rebuild)
+        self._matrix: tuple = ([], None, None, None, {})
+
+    def build(self, questions: List[Question], search_index: SearchIndex, positions: Dict[str, int]):
+        """
+        Vectorize the bank from the postings of an up-to-date search index
+
+        Args:
+            questions: The bank (row order)
+            search_index: Search index updated with the same questions
+            positions: Bank position by question ID
+        """
+        use_numpy = _load_numpy()
+        size = len(questions)
+        # Search index doc numbers -> bank rows (-1 for removed documents)
+        doc_rows = [positions[q.id] if q is not None else -1 for q in search_index.documents()]
+        idf = {}
+        entries = []  # (column, sign * idf, doc numbers, weighted tf) per term
+        for term, df, doc_numbers, tfs in search_index.postings():
+            idf[term] = weight = math.log((1 + size) / (1 + df)) + 1
+            column, sign = _column(term, self.dimensions)
+            entries.append((column, weight * sign, doc_numbers, tfs))
+
+        if use_numpy:
+            indptr, indices, data = self._build_numpy(entries, np.array(doc_rows, dtype=np.int64), size)
+        else:
+            indptr, indices, data = self._build_python(entries, doc_rows, size)
+        self._matrix = (questions, indptr, indices, data, idf)
+        self.engine = "numpy" if use_numpy else "python"
+
+    def _build_numpy(self, entries: list, doc_rows, size: int) -> tuple:
+        indptr = np.zeros(self.dimensions + 1, dtype=np.int64)
+        if not entries:
+            return indptr, np.zeros(0, dtype=np.int32), np.zeros(0, dtype=np.float32)
+        columns, rows, values = [], [], []
+        for column, weight, doc_numbers, tfs in entries:
+            term_rows = doc_rows[np.frombuffer(doc_numbers, dtype=doc_numbers.typecode)]
+            live = term_rows >= 0
+            rows.append(term_rows[live])
+            values.append((1 + np.log(np.frombuffer(tfs, dtype=tfs.typecode)[live])) * weight)
+            columns.append(np.full(len(rows[-1]), column, dtype=np.int64))
+        columns, rows, values = np.concatenate(columns), np.concatenate(rows), np.concatenate(values)
+
+        # Sort by (column, row) and add up entries of terms that hash to the same column
+        keys = columns * size + rows
+        order = np.argsort(keys, kind="stable")
+        keys, values = keys[order], values[order]
+        starts = np.flatnonzero(np.r_[True, keys[1:] != keys[:-1]])
+        data = np.add.reduceat(values, starts)
+        keys = keys[starts]
+        indices = (keys % size).astype(np.int32)
+
+        norms = np.sqrt(np.bincount(indices, weights=data * data, minlength=size))
+        norms[norms == 0] = 1.0
+        data = (data / norms[indices]).astype(np.float32)
+        np.cumsum(np.bincount(keys // size, minlength=self.dimensions), out=indptr[1:])
+        return indptr, indices, data
+
+    def _build_python(self, entries: list, doc_rows: List[int], size: int) -> tuple:
+        max_tf = max((max(tfs) for _, _, _, tfs in entries), default=0)
+        tf_weights = [0.0] + [1 + math.log(tf) for tf in range(1, max_tf + 1)]
+        cells: Dict[int, Dict[int, float]] = {}
+        for column, weight, doc_numbers, tfs in entries:
+            column_cells = cells.setdefault(column, {})
+            get_cell = column_cells.get
+            for doc, tf in zip(doc_numbers, tfs):
+                row = doc_rows[doc]
+                if row >= 0:
+                    column_cells[row] = get_cell(row, 0.0) + tf_weights[tf] * weight
+
+        squares = [0.0] * size
+        for column_cells in cells.values():
+            for row, value in column_cells.items():
+                squares[row] += value * value
+        norms = [math.sqrt(square) or 1.0 for square in squares]
+
+        indptr, indices, data = array("q", [0] * (self.dimensions + 1)), array("i"), array("f")
+        for column in sorted(cells):
+            column_cells = cells[column]
+            indices.extend(column_cells)
+            data.extend([value / norms[row] for row, value in column_cells.items()])
+            indptr[column + 1] = len(column_cells)
+        for column in range(self.dimensions):
+            indptr[column + 1] += indptr[column]
+        return indptr, indices, data
+
+    def vectorize(self, text: str, idf_by_term: Optional[Dict[str, float]] = None) -> Dict[int, float]:
+        """Sparse unit vector of a text (terms that no question contains are ignored)"""
+        if idf_by_term is None:
+            idf_by_term = self._matrix[4]
+        cells: Dict[int, float] = {}
+        for term, tf in Counter(tokenize(text)).items():
+            idf = idf_by_term.get(term)
+            if idf is None:
+                continue
+            column, sign = _column(term, self.dimensions)
+            cells[column] = cells.get(column, 0.0) + (1 + math.log(tf)) * idf * sign
+        norm = math.sqrt(sum(v * v for v in cells.values()))
+        return {column: value / norm for column, value in cells.items()} if norm else {}
+
+    def top(self, text: str, k: int) -> List[Tuple[Question, float]]:
+        """
+        Rank the bank against a text
+
+        Args:
+            text: Profile text (resume, JD)
+            k: Maximum number of results
+
+        Returns:
+            [(question, cosine similarity)] best first, positive scores only
+        """
+        # One snapshot, in case the bank is rebuilt meanwhile
+        questions, indptr, indices, data, idf = self._matrix
+        query = self.vectorize(text, idf)
+        size = len(questions)
+        if not query or not size:
+            return []
+
+        if isinstance(data, array):
+            scores: Dict[int, float] = {}
+            for column, weight in query.items():
+                for i in range(indptr[column], indptr[column + 1]):
+                    row = indices[i]
+                    scores[row] = scores.get(row, 0.0) + data[i] * weight
+            best = heapq.nlargest(k, scores.items(), key=lambda item: item[1])
+            return [(questions[row], score) for row, score in best if score > 0]
+
+        # Sparse matrix-vector product over the query's columns only
+        spans = [(indptr[column], indptr[column + 1], weight) for column, weight in query.items()]
+        rows = np.concatenate([indices[start:end] for start, end, _ in spans])
+        values = np.concatenate([data[start:end] * weight for start, end, weight in spans])
+        scores = np.bincount(rows, weights=values, minlength=size)
+        k = min(k, size)
+        best = np.argpartition(-scores, k - 1)[:k] if k < size else np.arange(size)
+        best = best[np.argsort(-scores[best])]
+        return [(questions[i], float(scores[i])) for i in best if scores[i] > 0]
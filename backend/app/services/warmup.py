@@ -0,0 +1,182 @@
+"""
+Warm-up - Eager construction of services and provider connections at startup
+"""
+import asyncio
+import socket
+import time
+from typing import Dict, Optional
+from urllib.parse import urlparse
+
+from ..core.config import Settings
+from .ai_service import get_ai_service, import_realtime_sdk
+from .interview_service import get_interview_service
+from .question_service import get_question_service
+
+
+class Readiness:
+    """
+    Result of the start-up warm-up, reported by /ready
+
+    Critical checks (question bank, services, self-check) decide readiness.
+    Provider connection checks are informational: without the provider the
+    app still serves rule-based fallbacks.
+    """
+
+    def __init__(self):
+        self.ready = False
+        self.stopping = False
+        self.checks: Dict[str, dict] = {}
+        self.started_at = time.time()
+        self.completed_at: Optional[float] = None
+
+    def record(self, name: str, ok: bool, started: float, detail: str = "", critical: bool = True):
+        self.checks[name] = {
+            "ok": ok,
+            "critical": critical,
+            "duration_ms": round((time.perf_counter() - started) * 1000, 1),
+            "detail": detail,
+        }
+
+    def complete(self):
+        self.ready = all(c["ok"] for c in self.checks.values() if c["critical"])
+        self.completed_at = time.time()
+
+    def snapshot(self) -> dict:
+        if self.stopping:
+            status = "stopping"
+        elif self.completed_at is None:
+            status = "starting"
+        else:
+            status = "ready" if self.ready else "not_ready"
+        return {
+            "status": status,
+            "checks": self.checks,
+            "warmup_seconds": round(self.completed_at - self.started_at, 3) if self.completed_at else None,
+        }
+
+
+def warm_services(readiness: Readiness):
+    """Build the service singletons and run an offline self-check (blocking, CPU only)"""
+    started = time.perf_counter()
+    try:
+        question_service = get_question_service()
+        count = len(question_service.get_all_questions())
+        readiness.record("question_bank", count > 0, started, f"{count} questions")
+    except Exception as e:
+        readiness.record("question_bank", False, started, str(e))
+        return
+
+    started = time.perf_counter()
+    try:
+        ai_service = get_ai_service()
+        interview_service = get_interview_service()
+        readiness.record("services", True, started)
+    except Exception as e:
+        readiness.record("services", False, started, str(e))
+        return
+
+    # Exercise the request path once: display model and rule-based scoring
+    started = time.perf_counter()
+    try:
+        question = question_service.get_all_questions()[0]
+        interview_service.get_question_for_display(question)
+        evaluation = ai_service._rule_based_evaluation(
+            question, question.correct_answer, question.explanation, True
+        )
+        readiness.record("self_check", evaluation.score > 0, started, f"rule-based score {evaluation.score}")
+    except Exception as e:
+        readiness.record("self_check", False, started, str(e))
+
+
+def _warm_llm_connection(base_address: Optional[str]) -> Optional[str]:
+    """
+    Import the SDK and open a pooled connection to the LLM host through its shared session
+
+    Returns:
+        The warmed base address, or None if the SDK has no shared session to warm
+    """
+    import dashscope
+    from dashscope.api_entities import http_request
+    # Private SDK helper: other SDK versions may not pool connections this way
+    if not hasattr(http_request, "_get_shared_sync_session"):
+        return None
+    base_address = base_address or dashscope.base_http_api_url
+    # Any HTTP answer (even 404) leaves a TLS connection in the pool
+    http_request._get_shared_sync_session().get(base_address, timeout=5)
+    return base_address
+
+
+def _resolve(url: str):
+    parsed = urlparse(url)
+    port = parsed.port or (443 if parsed.scheme in ("https", "wss") else 80)
+    socket.getaddrinfo(parsed.hostname, port)
+
+
+async def warm_connections(readiness: Readiness, settings: Settings):
+    """Load the provider SDK and warm connections (non-critical; failures are only reported)"""
+    ai_service = get_ai_service()
+    replay = ai_service.cassette is not None and ai_service.cassette.mode == "replay"
+    audio_services = [s for s in ("asr", "tts") if ai_service._get_api_key(s)]
+
+    # The audio SDK is imported lazily; load it here so the first TTS/ASR call does not
+    if audio_services:
+        started = time.perf_counter()
+        try:
+            await asyncio.to_thread(import_realtime_sdk)
+            readiness.record("realtime_sdk", True, started, critical=False)
+        except Exception as e:
+            readiness.record("realtime_sdk", False, started, f"{type(e).__name__}: {e}", critical=False)
+
+    if replay:
+        return  # Provider traffic is replayed, nothing to connect to
+
+    if ai_service._get_api_key("llm"):
+        started = time.perf_counter()
+        try:
+            base_address = await asyncio.to_thread(_warm_llm_connection, ai_service._generation_base_address())
+            readiness.record(
+                "llm_connection", base_address is not None, started,
+                base_address or "not warmed: SDK has no shared HTTP session", critical=False
+            )
+        except Exception as e:
+            readiness.record("llm_connection", False, started, f"{type(e).__name__}: {e}", critical=False)
+
+        if settings.warmup_llm_probe:
+            # A one-token generation also verifies the API key and model name
+            started = time.perf_counter()
+            try:
+                response = await ai_service._call_llm_async(
+                    messages=[{"role": "user", "content": "ping"}],
+                    model=settings.llm_fast_model or settings.llm_model,
+                    max_tokens=1
+                )
+                ok = response.status_code == 200
+                readiness.record("llm_probe", ok, started, "" if ok else f"{response.code}: {response.message}", critical=False)
+            except Exception as e:
+                readiness.record("llm_probe", False, started, f"{type(e).__name__}: {e}", critical=False)
+
+    # Realtime TTS/ASR open a WebSocket per call; resolving the host keeps DNS off the first call
+    for service in audio_services:
+        url = getattr(settings, f"{service}_api_base")
+        started = time.perf_counter()
+        try:
+            await asyncio.to_thread(_resolve, url)
+            readiness.record(f"{service}_dns", True, started, urlparse(url).hostname or "", critical=False)
+        except Exception as e:
+            readiness.record(f"{service}_dns", False, started, f"{type(e).__name__}: {e}", critical=False)
+
+
+async def warm_up(readiness: Readiness, settings: Settings):
+    """Run the whole warm-up and mark the readiness result"""
+    try:
+        await asyncio.wait_for(warm_connections(readiness, settings), timeout=settings.warmup_timeout)
+    except asyncio.TimeoutError:
+        readiness.checks["connections"] = {
+            "ok": False, "critical": False, "duration_ms": settings.warmup_timeout * 1000,
+            "detail": "warm-up timed out",
+        }
+    readiness.complete()
+
+
+# Singleton instance
+readiness = Readiness()
@@ -0,0 +1,82 @@
+"""
+Re-grade stored answers in bulk
+
+Usage:
+    python batch_evaluate.py answers.jsonl results.jsonl [--concurrency 16] [--no-cache]
+
+Each input line is a JSON object with question_id, selected_option (or
+option) and explanation. Results are appended to the output file as they
+complete; re-running the same command resumes after the last evaluated line.
+"""
+import argparse
+import asyncio
+import json
+import time
+from pathlib import Path
+
+from app.core.config import get_settings
+from app.services.batch_service import BatchEvaluator, EvaluationCache, load_checkpoint
+
+
+async def run_batch(args: argparse.Namespace) -> None:
+    """Run batch evaluation from input file to output file"""
+    settings = get_settings()
+    input_path = Path(args.input)
+    output_path = Path(args.output)
+
+    done = set() if args.restart else load_checkpoint(output_path)
+    if done:
+        print(f"Resuming: {len(done)} lines already evaluated")
+
+    cache = None
+    if not args.no_cache:
+        cache = EvaluationCache(Path(args.cache or settings.batch_cache_path))
+        print(f"Cache entries: {len(cache)}")
+
+    evaluator = BatchEvaluator(
+        concurrency=args.concurrency or settings.batch_concurrency,
+        cache=cache
+    )
+
+    counts = {"evaluated": 0, "cached": 0, "errors": 0}
+    started = time.monotonic()
+    mode = "w" if args.restart else "a"
+
+    with open(input_path, "r", encoding="utf-8") as source, \
+            open(output_path, mode, encoding="utf-8") as sink:
+        async for result in evaluator.run(source, skip_lines=done):
+            sink.write(json.dumps(result, ensure_ascii=False) + "\n")
+            sink.flush()
+
+            if "error" in result:
+                counts["errors"] += 1
+            elif result.get("cached"):
+                counts["cached"] += 1
+            else:
+                counts["evaluated"] += 1
+
+            total = sum(counts.values())
+            if total % 1000 == 0:
+                rate = total / max(time.monotonic() - started, 1e-6)
+                print(f"  {total} done ({rate:.1f}/s)")
+
+    elapsed = time.monotonic() - started
+    print(
+        f"\nFinished in {elapsed:.1f}s: {counts['evaluated']} evaluated, "
+        f"{counts['cached']} from cache, {counts['errors']} errors"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Batch re-grade stored answers")
+    parser.add_argument("input", help="Input JSONL of (question_id, selected_option, explanation)")
+    parser.add_argument("output", help="Output JSONL; also used as resume checkpoint")
+    parser.add_argument("--concurrency", type=int, default=None, help="Concurrent evaluations")
+    parser.add_argument("--cache", default=None, help="Cache file (default: BATCH_CACHE_PATH)")
+    parser.add_argument("--no-cache", action="store_true", help="Disable result cache")
+    parser.add_argument("--restart", action="store_true", help="Ignore checkpoint and overwrite output")
+    asyncio.run(run_batch(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,3 @@
+"""
+Benchmark tools (run from the backend directory, e.g. python -m bench.fake_dashscope)
+"""
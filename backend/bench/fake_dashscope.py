@@ -0,0 +1,427 @@
+"""
+Local DashScope stand-in for offline benchmarks
+
+Implements the parts of DashScope that AIService uses:
+- Native Generation API (JSON and SSE streaming):
+  POST /api/v1/services/aigc/text-generation/generation
+- Realtime WebSocket (TTS and ASR events): /api-ws/v1/realtime?model=...
+
+Latency is drawn from a seeded log-normal distribution, errors can be
+injected per request, and token usage is reported like the real service.
+
+Usage (from the backend directory):
+    python -m bench.fake_dashscope --port 9100 --latency-median 0.8 --error-rate 0.02
+
+Then point the backend at it:
+    LLM_API_KEY=fake
+    LLM_API_BASE=http://127.0.0.1:9100/api/v1
+    ASR_API_BASE=ws://127.0.0.1:9100/api-ws/v1/realtime
+    TTS_API_BASE=ws://127.0.0.1:9100/api-ws/v1/realtime
+
+Runtime control: GET/POST /_fake/config, GET /_fake/stats, POST /_fake/reset
+"""
+import argparse
+import asyncio
+import base64
+import hashlib
+import json
+import math
+import random
+import threading
+import uuid
+from collections import defaultdict
+from typing import Dict, List, Optional
+
+from fastapi import FastAPI, Request, WebSocket, WebSocketDisconnect
+from fastapi.responses import JSONResponse, StreamingResponse
+
+
+GENERATION_PATH = "/api/v1/services/aigc/text-generation/generation"
+REALTIME_PATH = "/api-ws/v1/realtime"
+
+TTS_BYTES_PER_SECOND = 24000 * 2   # PCM 24kHz mono 16-bit
+TTS_CHUNK_SECONDS = 0.1
+
+
+class FakeConfig:
+    """Behaviour of the fake provider (all times in seconds)"""
+
+    def __init__(self, **overrides):
+        self.seed: Optional[int] = 42
+        # Log-normal latency of a whole non-streaming call / time to first token
+        self.latency_median = 0.8
+        self.latency_sigma = 0.5
+        self.latency_min = 0.02
+        self.latency_max = 30.0
+        # Streaming output pace
+        self.tokens_per_second = 60.0
+        self.chunk_chars = 4
+        # Error injection (probabilities per request)
+        self.error_rate = 0.0        # HTTP 500 InternalError
+        self.throttle_rate = 0.0     # HTTP 429 Throttling
+        self.timeout_rate = 0.0      # No answer for hang_seconds
+        self.truncate_rate = 0.0     # JSON cut off / stream broken halfway
+        self.hang_seconds = 120.0
+        # Prompt caching: a system prompt seen before is reported as cached
+        self.cache_min_tokens = 1024
+        # Realtime audio
+        self.tts_seconds_per_char = 0.25
+        self.tts_realtime_factor = 5.0   # Audio is produced this many times faster than real time
+        self.asr_latency = 0.3
+        for key, value in overrides.items():
+            self.update(key, value)
+
+    def update(self, key: str, value):
+        if not hasattr(self, key):
+            raise KeyError(key)
+        current = getattr(self, key)
+        if current is not None and value is not None:
+            value = type(current)(value)
+        setattr(self, key, value)
+
+    def to_dict(self) -> dict:
+        return dict(vars(self))
+
+
+class FakeStats:
+    """Request, error and token counters"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.requests: Dict[str, int] = defaultdict(int)
+            self.errors: Dict[str, int] = defaultdict(int)
+            self.tokens: Dict[str, Dict[str, int]] = defaultdict(lambda: defaultdict(int))
+            self.audio_seconds: Dict[str, float] = defaultdict(float)
+            self.latency_total = 0.0
+
+    def record(self, kind: str, model: str, latency: float = 0.0):
+        with self._lock:
+            self.requests[f"{kind}:{model}"] += 1
+            self.latency_total += latency
+
+    def error(self, kind: str):
+        with self._lock:
+            self.errors[kind] += 1
+
+    def add_tokens(self, model: str, input_tokens: int, output_tokens: int, cached_tokens: int):
+        with self._lock:
+            self.tokens[model]["input"] += input_tokens
+            self.tokens[model]["output"] += output_tokens
+            self.tokens[model]["cached"] += cached_tokens
+
+    def add_audio(self, service: str, seconds: float):
+        with self._lock:
+            self.audio_seconds[service] += seconds
+
+    def to_dict(self) -> dict:
+        with self._lock:
+            return {
+                "requests": dict(self.requests),
+                "errors": dict(self.errors),
+                "tokens": {model: dict(counts) for model, counts in self.tokens.items()},
+                "audio_seconds": {k: round(v, 3) for k, v in self.audio_seconds.items()},
+                "latency_total": round(self.latency_total, 3),
+            }
+
+
+def count_tokens(text: str) -> int:
+    """Approximate tokenizer: one token per CJK character, four characters per token otherwise"""
+    cjk = sum(1 for char in text if "一" <= char <= "鿿")
+    return max(1, cjk + math.ceil((len(text) - cjk) / 4))
+
+
+def _text_of(content) -> str:
+    if isinstance(content, str):
+        return content
+    if isinstance(content, list):
+        return "".join(part.get("text", "") for part in content if isinstance(part, dict))
+    return ""
+
+
+class FakeDashScope:
+    """State shared by the HTTP and WebSocket handlers"""
+
+    def __init__(self, config: FakeConfig):
+        self.config = config
+        self.stats = FakeStats()
+        self.rng = random.Random(config.seed)
+        self._cached_prefixes = set()
+
+    def latency(self) -> float:
+        c = self.config
+        value = self.rng.lognormvariate(math.log(c.latency_median), c.latency_sigma)
+        return min(c.latency_max, max(c.latency_min, value))
+
+    def injected_fault(self) -> Optional[str]:
+        """Draw the fault of a request (None for a healthy answer)"""
+        c = self.config
+        roll = self.rng.random()
+        for fault, rate in (
+            ("error", c.error_rate),
+            ("throttle", c.throttle_rate),
+            ("timeout", c.timeout_rate),
+            ("truncate", c.truncate_rate),
+        ):
+            if roll < rate:
+                return fault
+            roll -= rate
+        return None
+
+    def usage(self, model: str, messages: List[dict], output: str) -> dict:
+        system = "".join(_text_of(m.get("content")) for m in messages if m.get("role") == "system")
+        input_tokens = sum(count_tokens(_text_of(m.get("content"))) for m in messages)
+        output_tokens = count_tokens(output) if output else 0
+        cached = 0
+        system_tokens = count_tokens(system) if system else 0
+        if system and system_tokens >= self.config.cache_min_tokens:
+            key = (model, hashlib.sha256(system.encode("utf-8")).hexdigest())
+            if key in self._cached_prefixes:
+                cached = system_tokens
+            self._cached_prefixes.add(key)
+        return {
+            "input_tokens": input_tokens,
+            "output_tokens": output_tokens,
+            "total_tokens": input_tokens + output_tokens,
+            "prompt_tokens_details": {"cached_tokens": cached},
+        }
+
+    def reply(self, messages: List[dict], json_mode: bool) -> str:
+        """Deterministic answer shaped like what AIService asks for"""
+        last = messages[-1] if messages else {}
+        if last.get("role") == "assistant" and last.get("partial"):
+            return '"continued": true}'
+
+        prompt = "\n".join(_text_of(m.get("content")) for m in messages)
+        digest = int(hashlib.sha256(prompt.encode("utf-8")).hexdigest()[:8], 16)
+        if not json_mode:
+            return "回答得不错，思路比较清晰。建议下一题把关键推导步骤说得更完整一些。"
+        if "strengths" in prompt:
+            return json.dumps({
+                "strengths": ["逻辑清晰", "表达有条理"],
+                "weaknesses": ["部分推导不够严谨"],
+                "overall_comment": "候选人整体表现良好，具备基本的逻辑分析能力。",
+                "recommendation": "建议进入下一轮面试。",
+            }, ensure_ascii=False)
+        return json.dumps({
+            "score": 40 + digest % 61,
+            "feedback": "解题思路基本正确，关键步骤有所体现。",
+            "hints": [],
+            "key_points_hit": [],
+            "key_points_missed": [],
+            "confidence": 60 + digest % 41,
+        }, ensure_ascii=False)
+
+
+def _error_body(code: str, message: str) -> dict:
+    return {"code": code, "message": message, "request_id": uuid.uuid4().hex}
+
+
+def create_app(config: Optional[FakeConfig] = None) -> FastAPI:
+    """Create the fake DashScope application"""
+    fake = FakeDashScope(config or FakeConfig())
+    app = FastAPI(title="Fake DashScope", docs_url=None, redoc_url=None)
+    app.state.fake = fake
+
+    @app.post(GENERATION_PATH)
+    async def generation(request: Request):
+        if not request.headers.get("authorization"):
+            return JSONResponse(_error_body("InvalidApiKey", "No API key provided."), status_code=401)
+
+        body = await request.json()
+        model = body.get("model", "")
+        messages = (body.get("input") or {}).get("messages") or []
+        parameters = body.get("parameters") or {}
+        json_mode = (parameters.get("response_format") or {}).get("type") == "json_object"
+        stream = request.headers.get("x-dashscope-sse") == "enable" or bool(parameters.get("stream"))
+        incremental = bool(parameters.get("incremental_output"))
+
+        latency = fake.latency()
+        fault = fake.injected_fault()
+        fake.stats.record("generation", model, latency)
+
+        if fault == "timeout":
+            fake.stats.error("timeout")
+            await asyncio.sleep(fake.config.hang_seconds)
+            return JSONResponse(_error_body("RequestTimeOut", "Request timed out."), status_code=504)
+        if fault in ("error", "throttle"):
+            fake.stats.error(fault)
+            await asyncio.sleep(latency / 4)
+            if fault == "throttle":
+                return JSONResponse(_error_body("Throttling", "Requests rate limit exceeded."), status_code=429)
+            return JSONResponse(_error_body("InternalError", "Injected internal error."), status_code=500)
+
+        output = fake.reply(messages, json_mode)
+        truncated = fault == "truncate"
+        if truncated:
+            fake.stats.error("truncate")
+
+        if not stream:
+            await asyncio.sleep(latency)
+            if truncated:
+                output = output[:len(output) // 2]
+            usage = fake.usage(model, messages, output)
+            fake.stats.add_tokens(model, usage["input_tokens"], usage["output_tokens"],
+                                  usage["prompt_tokens_details"]["cached_tokens"])
+            return {
+                "output": {"choices": [{
+                    "finish_reason": "length" if truncated else "stop",
+                    "message": {"role": "assistant", "content": output},
+                }]},
+                "usage": usage,
+                "request_id": uuid.uuid4().hex,
+            }
+
+        async def events():
+            request_id = uuid.uuid4().hex
+            step = max(1, fake.config.chunk_chars)
+            chunks = [output[i:i + step] for i in range(0, len(output), step)]
+            if truncated:
+                chunks = chunks[:max(1, len(chunks) // 2)]
+            chunk_delay = count_tokens(output) / max(1, len(chunks)) / fake.config.tokens_per_second
+
+            await asyncio.sleep(latency)  # Time to first token
+            sent = ""
+            for index, chunk in enumerate(chunks, start=1):
+                sent += chunk
+                last = index == len(chunks) and not truncated
+                usage = fake.usage(model, messages, sent) if last else {
+                    "input_tokens": 0, "output_tokens": count_tokens(sent), "total_tokens": 0
+                }
+                if last:
+                    fake.stats.add_tokens(model, usage["input_tokens"], usage["output_tokens"],
+                                          usage["prompt_tokens_details"]["cached_tokens"])
+                data = {
+                    "output": {"choices": [{
+                        "finish_reason": "stop" if last else "null",
+                        "message": {"role": "assistant", "content": chunk if incremental else sent},
+                    }]},
+                    "usage": usage,
+                    "request_id": request_id,
+                }
+                yield f"id:{index}\nevent:result\n:HTTP_STATUS/200\ndata:{json.dumps(data, ensure_ascii=False)}\n\n"
+                await asyncio.sleep(chunk_delay)
+
+            if truncated:
+                error = _error_body("InternalError", "Injected stream interruption.")
+                yield f"id:{len(chunks) + 1}\nevent:error\nstatus:500\ndata:{json.dumps(error)}\n\n"
+
+        return StreamingResponse(events(), media_type="text/event-stream")
+
+    @app.websocket(REALTIME_PATH)
+    async def realtime(websocket: WebSocket, model: str = ""):
+        await websocket.accept()
+        is_tts = "tts" in model.lower()
+        session_id = f"sess_{uuid.uuid4().hex[:16]}"
+        fake.stats.record("tts" if is_tts else "asr", model)
+        await websocket.send_json({"type": "session.created", "session": {"id": session_id, "model": model}})
+
+        text_parts: List[str] = []
+        audio_bytes = 0
+        sample_rate = 16000
+        try:
+            while True:
+                message = await websocket.receive_json()
+                event_type = message.get("type", "")
+                if event_type == "session.update":
+                    session = message.get("session") or {}
+                    sample_rate = int(session.get("sample_rate") or sample_rate)
+                    await websocket.send_json({"type": "session.updated", "session": {"id": session_id, **session}})
+                elif event_type == "input_text_buffer.append":
+                    text_parts.append(message.get("text", ""))
+                elif event_type == "input_audio_buffer.append":
+                    audio_bytes += len(base64.b64decode(message.get("audio", "")))
+                elif event_type == "session.finish":
+                    if fake.injected_fault() in ("error", "throttle", "timeout"):
+                        fake.stats.error("realtime")
+                        await websocket.send_json({"type": "error", "error": {"message": "Injected realtime error"}})
+                    elif is_tts:
+                        await _synthesize(fake, websocket, "".join(text_parts))
+                    else:
+                        await _transcribe(fake, websocket, audio_bytes / (sample_rate * 2))
+                    await websocket.send_json({"type": "session.finished"})
+                    break
+        except WebSocketDisconnect:
+            return
+        await websocket.close()
+
+    @app.get("/_fake/config")
+    async def get_config():
+        return fake.config.to_dict()
+
+    @app.post("/_fake/config")
+    async def set_config(request: Request):
+        try:
+            changes = await request.json()
+            for key, value in changes.items():
+                fake.config.update(key, value)
+        except (AttributeError, KeyError, TypeError, ValueError) as e:
+            return JSONResponse({"detail": f"Invalid config: {e}"}, status_code=400)
+        # Only an explicit seed restarts the sequence; other changes keep the run going
+        if "seed" in changes:
+            fake.rng.seed(fake.config.seed)
+        return fake.config.to_dict()
+
+    @app.get("/_fake/stats")
+    async def get_stats():
+        return fake.stats.to_dict()
+
+    @app.post("/_fake/reset")
+    async def reset():
+        fake.stats.reset()
+        fake.rng.seed(fake.config.seed)
+        return {"success": True}
+
+    return app
+
+
+async def _synthesize(fake: FakeDashScope, websocket: WebSocket, text: str):
+    """Stream silent PCM audio whose length follows the text length"""
+    seconds = len(text) * fake.config.tts_seconds_per_char
+    fake.stats.add_audio("tts", seconds)
+    response_id = f"resp_{uuid.uuid4().hex[:16]}"
+    await asyncio.sleep(fake.latency())
+    await websocket.send_json({"type": "response.created", "response": {"id": response_id}})
+
+    chunk = base64.b64encode(bytes(int(TTS_BYTES_PER_SECOND * TTS_CHUNK_SECONDS))).decode("ascii")
+    for _ in range(max(1, math.ceil(seconds / TTS_CHUNK_SECONDS))):
+        await websocket.send_json({"type": "response.audio.delta", "response_id": response_id, "delta": chunk})
+        await asyncio.sleep(TTS_CHUNK_SECONDS / fake.config.tts_realtime_factor)
+    await websocket.send_json({"type": "response.audio.done", "response_id": response_id})
+    await websocket.send_json({"type": "response.done", "response": {"id": response_id}})
+
+
+async def _transcribe(fake: FakeDashScope, websocket: WebSocket, seconds: float):
+    """Return a fixed transcript after the configured latency"""
+    fake.stats.add_audio("asr", seconds)
+    await asyncio.sleep(fake.config.asr_latency)
+    await websocket.send_json({
+        "type": "conversation.item.input_audio_transcription.completed",
+        "item_id": f"item_{uuid.uuid4().hex[:16]}",
+        "transcript": "我先排除了明显错误的选项，然后验证剩下的答案。",
+    })
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local DashScope stand-in for benchmarks")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=9100)
+    defaults = FakeConfig()
+    for key, value in defaults.to_dict().items():
+        parser.add_argument(
+            f"--{key.replace('_', '-')}",
+            type=type(value) if value is not None else int,
+            default=value
+        )
+    args = parser.parse_args()
+
+    import uvicorn
+    config = FakeConfig(**{key: getattr(args, key) for key in defaults.to_dict()})
+    uvicorn.run(create_app(config), host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""
+Import-time budget check for the application module
+
+Runs `python -X importtime -c "import app.main"` in fresh interpreters,
+reports the median total and the slowest modules, and fails (exit code 1)
+when the median exceeds the budget or when a module that must be loaded
+lazily (the DashScope SDK) is imported at startup.
+
+Usage (from the backend directory):
+    python -m bench.importtime
+    python -m bench.importtime --budget-ms 600 --runs 7 --top 15
+"""
+import argparse
+import os
+import re
+import statistics
+import subprocess
+import sys
+from collections import defaultdict
+from typing import Dict, List, Tuple
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Loaded on first use; importing them at startup is a regression
+LAZY_MODULES = ("dashscope",)
+
+_LINE_RE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|(\s*)(\S+)$")
+
+
+def measure(module: str) -> Tuple[int, Dict[str, Tuple[int, int]]]:
+    """
+    Import a module in a fresh interpreter
+
+    Returns:
+        (Total cumulative microseconds, {module: (self us, cumulative us)})
+    """
+    env = dict(os.environ, PYTHONPATH=BACKEND_DIR)
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=BACKEND_DIR, env=env, capture_output=True, text=True, check=True
+    )
+    modules = {}
+    total = 0
+    for line in result.stderr.splitlines():
+        match = _LINE_RE.match(line)
+        if not match:
+            continue
+        self_us, cumulative_us, name = int(match.group(1)), int(match.group(2)), match.group(4)
+        modules[name] = (self_us, cumulative_us)
+        if name == module:
+            total = cumulative_us
+    return total, modules
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Import-time budget check")
+    parser.add_argument("--module", default="app.main", help="Module to import")
+    parser.add_argument("--budget-ms", type=float, default=800.0, help="Budget for the median import time")
+    parser.add_argument("--runs", type=int, default=5, help="Fresh interpreters to measure")
+    parser.add_argument("--top", type=int, default=10, help="Slowest modules to list (by self time)")
+    args = parser.parse_args()
+
+    totals: List[int] = []
+    self_times: Dict[str, List[int]] = defaultdict(list)
+    imported = set()
+    for _ in range(args.runs):
+        total, modules = measure(args.module)
+        totals.append(total)
+        imported.update(modules)
+        for name, (self_us, _) in modules.items():
+            self_times[name].append(self_us)
+
+    median_ms = statistics.median(totals) / 1000
+    print(f"import {args.module}: median {median_ms:.1f}ms "
+          f"(min {min(totals) / 1000:.1f}ms, max {max(totals) / 1000:.1f}ms, {args.runs} runs)")
+    print("Slowest modules by self time:")
+    slowest = sorted(self_times.items(), key=lambda item: statistics.median(item[1]), reverse=True)
+    for name, values in slowest[:args.top]:
+        print(f"  {statistics.median(values) / 1000:8.1f}ms  {name}")
+
+    failures = []
+    if median_ms > args.budget_ms:
+        failures.append(f"median import time {median_ms:.1f}ms exceeds the budget of {args.budget_ms:.0f}ms")
+    for lazy in LAZY_MODULES:
+        if lazy in imported:
+            failures.append(f"{lazy} is imported at startup but must be loaded lazily")
+
+    if failures:
+        for failure in failures:
+            print(f"FAIL: {failure}")
+        sys.exit(1)
+    print(f"OK: within {args.budget_ms:.0f}ms budget")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,288 @@
+"""
+End-to-end interview load test
+
+Simulates N concurrent candidates going through the full flow:
+create session -> start -> (current-question -> think -> submit-answer
+-> feedback) x questions -> report.
+
+The app is driven in-process through the ASGI transport (default) or over
+HTTP with --url. Results are printed (or written with --output) as JSON:
+throughput, p50/p95/p99 latency per endpoint, error rates, and AI fallback
+/ retry counts scraped from /metrics before and after the run.
+
+Usage (from the backend directory, ideally against bench.fake_dashscope):
+    python -m bench.loadtest --candidates 50 --questions 5 --think-time 2
+    python -m bench.loadtest --url http://127.0.0.1:8000 --candidates 200 --output result.json
+"""
+import argparse
+import asyncio
+import json
+import math
+import random
+import re
+import sys
+import time
+from collections import defaultdict
+from typing import Dict, List, Optional
+
+import httpx
+
+
+EXPLANATIONS = [
+    "排除法。",
+    "我先看题干条件，排除了明显矛盾的选项，然后代入剩下的选项验证。",
+    "首先列出已知条件，然后逐一分析每个选项是否满足全部条件。如果某个选项与任一条件冲突就排除，"
+    "最后只剩一个选项满足所有条件，再反过来检查一遍推理过程，确认没有遗漏的情况，所以选择这个答案。",
+]
+
+_SAMPLE_RE = re.compile(r'^([a-zA-Z_:][a-zA-Z0-9_:]*)(\{[^}]*\})?\s+(\S+)$')
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of a sorted list"""
+    if not values:
+        return 0.0
+    rank = max(1, math.ceil(pct / 100 * len(values)))
+    return values[rank - 1]
+
+
+def parse_metrics(text: str) -> Dict[str, float]:
+    """Parse Prometheus text exposition into {'name{labels}': value}"""
+    samples = {}
+    for line in text.splitlines():
+        if not line or line.startswith("#"):
+            continue
+        match = _SAMPLE_RE.match(line)
+        if match:
+            samples[match.group(1) + (match.group(2) or "")] = float(match.group(3))
+    return samples
+
+
+def _metric_delta(before: Dict[str, float], after: Dict[str, float], name: str) -> Dict[str, float]:
+    """Per-label increase of a counter during the run (non-zero entries only)"""
+    result = {}
+    for key, value in after.items():
+        if key.split("{")[0] != name:
+            continue
+        delta = value - before.get(key, 0.0)
+        if delta:
+            labels = key[len(name):].strip("{}") or "total"
+            result[labels] = delta
+    return result
+
+
+class Recorder:
+    """Collects latencies and errors per endpoint"""
+
+    def __init__(self):
+        self.latencies: Dict[str, List[float]] = defaultdict(list)
+        self.errors: Dict[str, Dict[str, int]] = defaultdict(lambda: defaultdict(int))
+        self.interviews_completed = 0
+        self.interviews_failed = 0
+
+    def record(self, endpoint: str, seconds: float, error: Optional[str] = None):
+        self.latencies[endpoint].append(seconds)
+        if error:
+            self.errors[endpoint][error] += 1
+
+    def summary(self) -> dict:
+        endpoints = {}
+        for endpoint, values in sorted(self.latencies.items()):
+            values = sorted(values)
+            errors = sum(self.errors[endpoint].values())
+            endpoints[endpoint] = {
+                "count": len(values),
+                "errors": errors,
+                "error_rate": round(errors / len(values), 4),
+                "error_types": dict(self.errors[endpoint]),
+                "mean_ms": round(sum(values) / len(values) * 1000, 2),
+                "p50_ms": round(percentile(values, 50) * 1000, 2),
+                "p95_ms": round(percentile(values, 95) * 1000, 2),
+                "p99_ms": round(percentile(values, 99) * 1000, 2),
+                "max_ms": round(values[-1] * 1000, 2),
+            }
+        return endpoints
+
+
+class Candidate:
+    """One simulated candidate taking one interview"""
+
+    def __init__(self, client: httpx.AsyncClient, recorder: Recorder, args, rng: random.Random, index: int):
+        self.client = client
+        self.recorder = recorder
+        self.args = args
+        self.rng = rng
+        self.index = index
+
+    async def _request(self, endpoint: str, method: str, path: str, **kwargs) -> Optional[dict]:
+        """Send a request and record it under the endpoint name (None on failure)"""
+        started = time.perf_counter()
+        try:
+            response = await self.client.request(method, path, **kwargs)
+        except httpx.HTTPError as e:
+            self.recorder.record(endpoint, time.perf_counter() - started, type(e).__name__)
+            return None
+        elapsed = time.perf_counter() - started
+        if response.status_code >= 400:
+            self.recorder.record(endpoint, elapsed, f"HTTP {response.status_code}")
+            return None
+        self.recorder.record(endpoint, elapsed)
+        return response.json()
+
+    async def _think(self):
+        if self.args.think_time > 0:
+            await asyncio.sleep(self.rng.lognormvariate(math.log(self.args.think_time), self.args.think_sigma))
+
+    async def run(self) -> bool:
+        """Run the whole interview; returns whether it completed"""
+        session = await self._request("POST /sessions", "POST", "/api/interview/sessions", json={
+            "candidate_name": f"loadtest-{self.index}",
+            "position": "benchmark",
+            "question_count": self.args.questions,
+        })
+        if not session:
+            return False
+        session_id = session["id"]
+        prefix = f"/api/interview/sessions/{session_id}"
+
+        if not await self._request("POST /sessions/{id}/start", "POST", f"{prefix}/start"):
+            return False
+
+        while True:
+            current = await self._request("GET /sessions/{id}/current-question", "GET", f"{prefix}/current-question")
+            if not current or not current.get("success"):
+                return False
+            question = current["data"]["question"]
+
+            await self._think()
+            options = [option["key"] for option in question.get("options") or []]
+            result = await self._request("POST /sessions/{id}/submit-answer", "POST", f"{prefix}/submit-answer", json={
+                "question_id": question["id"],
+                "selected_option": self.rng.choice(options) if options else None,
+                "explanation": self.rng.choice(EXPLANATIONS),
+            })
+            if not result:
+                return False
+
+            if self.args.feedback:
+                await self._request("GET /sessions/{id}/feedback/{qid}", "GET", f"{prefix}/feedback/{question['id']}")
+            if not result["has_next_question"]:
+                break
+
+        return await self._request("GET /sessions/{id}/report", "GET", f"{prefix}/report") is not None
+
+
+async def _scrape_metrics(client: httpx.AsyncClient) -> Dict[str, float]:
+    try:
+        response = await client.get("/metrics")
+        response.raise_for_status()
+        return parse_metrics(response.text)
+    except httpx.HTTPError as e:
+        print(f"Could not scrape /metrics: {e}", file=sys.stderr)
+        return {}
+
+
+async def run_load(client: httpx.AsyncClient, args) -> dict:
+    """Run all candidates against the client and build the report"""
+    recorder = Recorder()
+    before = await _scrape_metrics(client)
+
+    async def candidate(index: int):
+        # Spread arrivals evenly over the ramp-up period
+        if args.ramp_up > 0:
+            await asyncio.sleep(args.ramp_up * index / args.candidates)
+        rng = random.Random(args.seed * 100003 + index)
+        for _ in range(args.iterations):
+            ok = await Candidate(client, recorder, args, rng, index).run()
+            if ok:
+                recorder.interviews_completed += 1
+            else:
+                recorder.interviews_failed += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(candidate(i) for i in range(args.candidates)))
+    duration = time.perf_counter() - started
+    after = await _scrape_metrics(client)
+
+    endpoints = recorder.summary()
+    total_requests = sum(e["count"] for e in endpoints.values())
+    total_errors = sum(e["errors"] for e in endpoints.values())
+    fallbacks = _metric_delta(before, after, "upstream_fallbacks_total")
+    ai_requests = sum(
+        endpoints.get(name, {}).get("count", 0)
+        for name in ("POST /sessions/{id}/submit-answer", "GET /sessions/{id}/feedback/{qid}", "GET /sessions/{id}/report")
+    )
+    return {
+        "config": {
+            "target": args.url or "in-process",
+            "candidates": args.candidates,
+            "iterations": args.iterations,
+            "questions": args.questions,
+            "think_time": args.think_time,
+            "ramp_up": args.ramp_up,
+            "seed": args.seed,
+        },
+        "duration_s": round(duration, 3),
+        "interviews": {
+            "completed": recorder.interviews_completed,
+            "failed": recorder.interviews_failed,
+            "per_second": round(recorder.interviews_completed / duration, 3) if duration else 0.0,
+        },
+        "requests": {
+            "total": total_requests,
+            "errors": total_errors,
+            "error_rate": round(total_errors / total_requests, 4) if total_requests else 0.0,
+            "per_second": round(total_requests / duration, 2) if duration else 0.0,
+        },
+        "endpoints": endpoints,
+        "ai": {
+            "fallbacks": fallbacks,
+            "fallback_rate": round(sum(fallbacks.values()) / ai_requests, 4) if ai_requests else 0.0,
+            "retries": _metric_delta(before, after, "upstream_retries_total"),
+            "upstream_errors": _metric_delta(before, after, "upstream_errors_total"),
+            "evaluation_tiers": _metric_delta(before, after, "evaluation_tier_total"),
+            "tokens": _metric_delta(before, after, "llm_tokens_total"),
+            "event_loop_blocks": sum(_metric_delta(before, after, "event_loop_blocking_calls_total").values()),
+        },
+    }
+
+
+async def main_async(args) -> dict:
+    timeout = httpx.Timeout(args.timeout)
+    if args.url:
+        limits = httpx.Limits(max_connections=args.candidates, max_keepalive_connections=args.candidates)
+        async with httpx.AsyncClient(base_url=args.url, timeout=timeout, limits=limits) as client:
+            return await run_load(client, args)
+
+    from app.main import app
+    transport = httpx.ASGITransport(app=app)
+    async with app.router.lifespan_context(app):
+        async with httpx.AsyncClient(transport=transport, base_url="http://loadtest", timeout=timeout) as client:
+            return await run_load(client, args)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="End-to-end interview load test")
+    parser.add_argument("--url", help="Base URL of a running server (default: in-process ASGI)")
+    parser.add_argument("--candidates", type=int, default=10, help="Concurrent candidates")
+    parser.add_argument("--iterations", type=int, default=1, help="Interviews per candidate")
+    parser.add_argument("--questions", type=int, default=3, help="Questions per interview")
+    parser.add_argument("--think-time", type=float, default=1.0, help="Median think time before each answer (s, 0 to disable)")
+    parser.add_argument("--think-sigma", type=float, default=0.5, help="Log-normal sigma of the think time")
+    parser.add_argument("--ramp-up", type=float, default=0.0, help="Seconds over which candidates arrive")
+    parser.add_argument("--no-feedback", dest="feedback", action="store_false", help="Skip the feedback request")
+    parser.add_argument("--timeout", type=float, default=120.0, help="Request timeout (s)")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--output", help="Write the JSON result to this file")
+    args = parser.parse_args()
+
+    result = asyncio.run(main_async(args))
+    text = json.dumps(result, ensure_ascii=False, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+    print(text)
+
+
+if __name__ == "__main__":
+    main()
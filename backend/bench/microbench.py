@@ -0,0 +1,256 @@
+"""
+Micro-benchmarks of the pure-Python hot paths with regression gating
+
+Cases run on the real question bank and on synthetic banks of 10k and
+100k questions, plus short and long explanations. Each case is timed with
+timeit (auto-ranged loop count, best of --repeat runs) and compared with
+a stored baseline; the run fails (exit code 1) when a case got slower than
+the baseline by more than --threshold.
+
+Usage (from the backend directory):
+    python -m bench.microbench --save-baseline        # record bench/baseline.json
+    python -m bench.microbench --require-baseline     # compare against it (fail without one)
+    python -m bench.microbench --filter select --sizes 33,10000
+
+Baselines depend on the machine; record them on the machine that compares.
+Without --require-baseline a missing baseline only prints a note, so a
+gate must pass the flag. tests/test_microbench.py runs every case under
+pytest and applies the same gate to cases found in the baseline.
+"""
+import os
+
+# The report case must use the rule-based analysis, never the network
+os.environ["LLM_API_KEY"] = ""
+os.environ.pop("DASHSCOPE_API_KEY", None)
+os.environ.setdefault("LOOP_MONITOR_ENABLED", "false")
+
+import argparse
+import asyncio
+import json
+import random
+import statistics
+import sys
+import timeit
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, List, Tuple
+
+from app.schemas.interview import (
+    AnswerEvaluation, AnswerRecord, CreateInterviewRequest, DifficultyLevel, Question, QuestionType
+)
+from app.services.ai_service import get_ai_service
+from app.services.interview_service import get_interview_service
+from app.services.question_service import get_question_service
+
+
+DEFAULT_BASELINE = Path(__file__).parent / "baseline.json"
+DEFAULT_SIZES = (33, 10_000, 100_000)
+
+SHORT_EXPLANATION = "排除法，先看条件再验证。"
+LONG_EXPLANATION = (
+    "首先我把题目给出的条件逐条列出来，然后用逻辑推理的方法分析每个选项。"
+    "如果某个选项与已知条件矛盾，就用排除法把它去掉；对剩下的选项做信息推断，"
+    "看看能否从其他人的发言里反推出结论。最后我又反过来验证了一遍推理过程。"
+) * 40
+BULK_JD = {"title": "后端开发（校招）", "requirements": ["算法与数据结构", "逻辑推理能力", "概率统计基础"]}
+
+
+def make_bank(size: int, seed: int = 7) -> List[Question]:
+    """Synthetic question bank shaped like data/questions.json"""
+    rng = random.Random(seed)
+    types = list(QuestionType)
+    difficulties = list(DifficultyLevel)
+    words = ["逻辑推理", "信息推断", "排除法", "数学计算", "比例关系", "递归思维", "边界条件", "优先级", "风险评估"]
+    bank = []
+    for i in range(size):
+        q_type = types[i % len(types)]
+        bank.append(Question(
+            id=f"{q_type.value}_{i:06d}",
+            type=q_type,
+            difficulty=difficulties[rng.randrange(len(difficulties))],
+            title=f"合成题目 {i}",
+            content="已知条件如下，请选择正确答案并说明理由。" * 4,
+            options=[{"key": key, "content": f"选项{key}的内容"} for key in "ABCD"],
+            correct_answer=rng.choice("ABCD"),
+            explanation="参考解析：" + "推理步骤。" * 20,
+            key_points=rng.sample(words, 3),
+            tags=[f"tag{i % 50}", q_type.value],
+        ))
+    return bank
+
+
+def load_bank(size: int) -> List[Question]:
+    """The real bank for its own size, a synthetic bank otherwise"""
+    real = get_question_service().get_all_questions()
+    return list(real) if size == len(real) else make_bank(size)
+
+
+def build_cases(sizes: Tuple[int, ...]) -> List[Tuple[str, Callable[[], Callable[[], object]]]]:
+    """
+    Benchmark cases as (name, setup); setup prepares state and returns the timed callable
+
+    Setup runs once per case, so building large banks is not timed.
+    """
+    questions = get_question_service()
+    interviews = get_interview_service()
+    ai = get_ai_service()
+    cases = []
+
+    def use_bank(size: int) -> List[Question]:
+        bank = load_bank(size)
+        questions.set_questions(bank)
+        random.seed(1)
+        return bank
+
+    for size in sizes:
+        cases.append((f"select_questions[{size}]", lambda size=size: (
+            use_bank(size), lambda: questions.select_questions_for_interview(count=5)
+        )[1]))
+        cases.append((f"auto_select_questions[{size}]", lambda size=size: (
+            use_bank(size), questions.auto_select_questions
+        )[1]))
+
+    for size in sizes:
+        def bulk_setup(size=size):
+            use_bank(size)
+            requests = [
+                CreateInterviewRequest(candidate_name=f"candidate{i}", jd_data=BULK_JD if i % 2 else None)
+                for i in range(100)
+            ]
+
+            def create():
+                for session in interviews.create_sessions(requests):
+                    del interviews.sessions[session.id]
+            return create
+        cases.append((f"create_sessions[{size} x100]", bulk_setup))
+
+    for size in sizes:
+        cases.append((f"search_questions[{size}]", lambda size=size: (
+            use_bank(size), lambda: questions.search_questions("逻辑推理 排除法", limit=20)
+        )[1]))
+
+    def display_setup():
+        question = use_bank(33)[0]
+        return lambda: interviews.get_question_for_display(question)
+    cases.append(("question_display", display_setup))
+
+    for label, explanation in (("short", SHORT_EXPLANATION), ("long", LONG_EXPLANATION)):
+        def prompt_setup(explanation=explanation):
+            question = use_bank(33)[0]
+            return lambda: ai._build_evaluation_prompt(question, "B", explanation, with_confidence=True)
+        cases.append((f"evaluation_prompt[{label}]", prompt_setup))
+
+        def rule_setup(explanation=explanation):
+            question = use_bank(33)[0]
+            return lambda: ai._rule_based_evaluation(question, "B", explanation, True)
+        cases.append((f"rule_based_evaluation[{label}]", rule_setup))
+
+    def report_setup():
+        bank = use_bank(33)[:10]
+        answers = [
+            AnswerRecord(
+                question_id=q.id,
+                selected_option="A",
+                explanation=LONG_EXPLANATION,
+                evaluation=AnswerEvaluation(
+                    is_correct=i % 2 == 0, score=60 + i, feedback="解题思路基本正确。" * 10,
+                    key_points_hit=q.key_points[:1], key_points_missed=q.key_points[1:]
+                ),
+                submitted_at=datetime.now(),
+            )
+            for i, q in enumerate(bank)
+        ]
+        loop = asyncio.new_event_loop()
+        return lambda: loop.run_until_complete(
+            ai.generate_report("bench", "candidate", "engineer", bank, answers, 600)
+        )
+    cases.append(("generate_report[10 answers]", report_setup))
+    return cases
+
+
+def load_baseline(path: str) -> Dict[str, dict]:
+    """Results of a saved baseline by case name (empty if there is none)"""
+    if not os.path.exists(path):
+        return {}
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f).get("results", {})
+
+
+def slowdown(result: Dict[str, float], reference: Dict[str, float]) -> float:
+    """Relative change of the best time against a baseline entry (0.1 = 10% slower)"""
+    return result["best"] / reference["best"] - 1
+
+
+def measure(func: Callable[[], object], repeat: int) -> Dict[str, float]:
+    """Time one case: best and median seconds per call over `repeat` runs"""
+    timer = timeit.Timer(func)
+    number, _ = timer.autorange()
+    times = [t / number for t in timer.repeat(repeat=repeat, number=number)]
+    return {"best": min(times), "median": statistics.median(times), "loops": number}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Micro-benchmarks with regression gating")
+    parser.add_argument("--baseline", default=str(DEFAULT_BASELINE), help="Baseline JSON file")
+    parser.add_argument("--save-baseline", action="store_true", help="Store the results as the new baseline")
+    parser.add_argument("--threshold", type=float, default=0.25, help="Allowed slowdown vs. baseline (0.25 = 25%%)")
+    parser.add_argument("--repeat", type=int, default=5, help="Timing runs per case (best is compared)")
+    parser.add_argument("--sizes", default=",".join(str(s) for s in DEFAULT_SIZES), help="Bank sizes for selection cases")
+    parser.add_argument("--filter", default="", help="Only run cases whose name contains this")
+    parser.add_argument(
+        "--require-baseline", action="store_true",
+        help="Fail when there is no baseline or a case is missing from it (use in CI gates)"
+    )
+    args = parser.parse_args()
+
+    sizes = tuple(int(s) for s in args.sizes.split(",") if s)
+    baseline = {} if args.save_baseline else load_baseline(args.baseline)
+    if args.require_baseline and not args.save_baseline and not baseline:
+        print(f"No baseline at {args.baseline}; record one with --save-baseline on this machine")
+        sys.exit(2)
+
+    results = {}
+    regressions = []
+    unmatched = []
+    print(f"{'case':<36} {'best':>12} {'median':>12} {'baseline':>12} {'change':>8}")
+    for name, setup in build_cases(sizes):
+        if args.filter and args.filter not in name:
+            continue
+        result = measure(setup(), args.repeat)
+        results[name] = result
+
+        reference = baseline.get(name)
+        change = ""
+        if reference:
+            ratio = slowdown(result, reference)
+            change = f"{ratio:+.1%}"
+            if ratio > args.threshold:
+                regressions.append(name)
+                change += " !"
+        elif baseline:
+            unmatched.append(name)
+        reference_text = f"{reference['best'] * 1e6:.1f}us" if reference else "-"
+        print(f"{name:<36} {result['best'] * 1e6:>10.1f}us {result['median'] * 1e6:>10.1f}us "
+              f"{reference_text:>12} {change:>8}")
+
+    if args.save_baseline:
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump({
+                "created_at": datetime.now().isoformat(timespec="seconds"),
+                "python": sys.version.split()[0],
+                "results": results,
+            }, f, indent=2)
+        print(f"Baseline saved to {args.baseline}")
+    elif not baseline:
+        print(f"No baseline at {args.baseline}; run with --save-baseline to record one")
+
+    if regressions:
+        print(f"Regressed by more than {args.threshold:.0%}: {', '.join(regressions)}")
+        sys.exit(1)
+    if unmatched and args.require_baseline:
+        print(f"Not in the baseline: {', '.join(unmatched)}; re-record it with --save-baseline")
+        sys.exit(2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,40 @@
+"""
+Gunicorn configuration for multi-worker deployments (pre-fork with preload)
+
+    cd backend
+    gunicorn -c gunicorn.conf.py
+
+The master builds the question bank and services once (app.server.create_app)
+and freezes them for the GC; workers are forked from it and share that memory
+copy-on-write. Each worker still runs the app lifespan (loop monitor,
+provider warm-up) and reinitializes its own provider clients after the fork.
+
+Interview sessions live in each worker's memory, so a session created in
+one worker is unknown to the others. WEB_CONCURRENCY above 1 is refused
+unless ALLOW_MULTIPLE_WORKERS is set, which is only safe behind routing
+that sends every request of a session to the same worker (or once
+sessions are kept in shared storage). Metrics and budgets are kept per
+worker process as well.
+"""
+import os
+
+from app.core.config import get_settings
+
+bind = f"0.0.0.0:{os.environ.get('PORT', '8000')}"
+workers = int(os.environ.get("WEB_CONCURRENCY", "1"))
+if workers > 1 and not get_settings().allow_multiple_workers:
+    raise RuntimeError(
+        f"WEB_CONCURRENCY={workers}: interview sessions are stored per worker process, so requests "
+        "of one session must all reach the same worker. Set ALLOW_MULTIPLE_WORKERS=true once routing "
+        "is session-affine or sessions are shared, or run a single worker"
+    )
+worker_class = "uvicorn_worker.UvicornWorker"
+wsgi_app = "app.server:create_app()"
+preload_app = True
+graceful_timeout = 30
+keepalive = 5
+
+
+def post_fork(server, worker):
+    from app.server import after_fork
+    after_fork()
@@ -0,0 +1,43 @@
+"""
+Shared test setup: fail async tests that block the event loop
+"""
+import asyncio
+
+import pytest
+
+from app.core.loop_monitor import LoopMonitor
+
+# Looser than the server default: test machines are noisier than production
+BLOCK_THRESHOLD = 0.25
+
+
+@pytest.fixture
+async def no_blocking_calls():
+    """Watch the test's event loop and fail the test if anything blocked it"""
+    monitor = LoopMonitor(interval=BLOCK_THRESHOLD, block_threshold=BLOCK_THRESHOLD, watchdog=True)
+    monitor.start()
+    yield monitor
+    await monitor.stop()
+    if monitor.violations:
+        worst = max(monitor.violations, key=lambda violation: violation.duration)
+        pytest.fail(
+            f"Event loop blocked {len(monitor.violations)} time(s), "
+            f"longest {worst.duration * 1000:.0f}ms:\n{worst.stack}",
+            pytrace=False
+        )
+
+
+def pytest_collection_modifyitems(items):
+    """Run every async test under no_blocking_calls (opt out with @pytest.mark.allow_blocking)"""
+    for item in items:
+        function = getattr(item, "function", None)
+        if (
+            asyncio.iscoroutinefunction(function)
+            and item.get_closest_marker("allow_blocking") is None
+            and "no_blocking_calls" not in item.fixturenames
+        ):
+            item.fixturenames.insert(0, "no_blocking_calls")
+
+
+def pytest_configure(config):
+    config.addinivalue_line("markers", "allow_blocking: the test blocks the event loop on purpose")
@@ -0,0 +1,91 @@
+"""
+Tests for batch re-grading checkpoints and cache files
+"""
+import json
+from types import SimpleNamespace
+
+from app.schemas.interview import DifficultyLevel, Question, QuestionType
+from app.services.ai_service import AIService
+from app.services.batch_service import BatchEvaluator, EvaluationCache, load_checkpoint
+
+
+def write_lines(path, *lines):
+    path.write_bytes(b"".join(lines))
+
+
+def result_line(line, evaluated=True):
+    record = {"line": line, "evaluation": {"score": 80}} if evaluated else {"line": line, "error": "timeout"}
+    return (json.dumps(record) + "\n").encode("utf-8")
+
+
+def test_checkpoint_keeps_evaluated_lines_only(tmp_path):
+    output = tmp_path / "results.jsonl"
+    write_lines(output, result_line(1), result_line(2, evaluated=False), result_line(3))
+    assert load_checkpoint(output) == {1, 3}
+
+
+def test_checkpoint_missing_file(tmp_path):
+    assert load_checkpoint(tmp_path / "missing.jsonl") == set()
+
+
+def test_checkpoint_cuts_off_a_half_written_last_line(tmp_path):
+    output = tmp_path / "results.jsonl"
+    partial = '{"line": 3, "evaluation": {"feedback": "回答'.encode("utf-8")[:-1]
+    write_lines(output, result_line(1), result_line(2), partial)
+    assert load_checkpoint(output) == {1, 2}
+    assert output.read_bytes() == result_line(1) + result_line(2)
+
+    with open(output, "a", encoding="utf-8") as sink:
+        sink.write(result_line(3).decode("utf-8"))
+    assert load_checkpoint(output) == {1, 2, 3}
+
+
+def test_checkpoint_skips_undecodable_lines(tmp_path):
+    output = tmp_path / "results.jsonl"
+    write_lines(output, result_line(1), b'{"line": 2, "evaluation": "\xff\xfe"}\n', result_line(3))
+    assert load_checkpoint(output) == {1, 3}
+
+
+def test_cache_skips_damaged_lines(tmp_path):
+    path = tmp_path / "cache.jsonl"
+    cache = EvaluationCache(path)
+    cache.put("a", {"score": 90})
+    with open(path, "ab") as f:
+        f.write(b'{"key": "b", "evaluation": "\xff\n{"key": "c"')
+    assert EvaluationCache(path).get("a") == {"score": 90}
+    assert len(EvaluationCache(path)) == 1
+
+
+async def test_rule_based_run_grades_blocks_in_input_order(monkeypatch):
+    questions = {
+        question_id: Question(
+            id=question_id, type=QuestionType.LOGIC, difficulty=DifficultyLevel.EASY,
+            title="t", content="c", correct_answer="A", explanation="e", key_points=["排除法"]
+        )
+        for question_id in ("q1", "q2")
+    }
+    ai = AIService()
+    monkeypatch.setattr(ai, "_get_api_key", lambda service="llm": None)
+    many_calls = []
+    evaluate_many = ai.rule_based_evaluate_many
+    monkeypatch.setattr(
+        ai, "rule_based_evaluate_many",
+        lambda question, answers: many_calls.append(len(answers)) or evaluate_many(question, answers)
+    )
+    evaluator = BatchEvaluator(
+        concurrency=2, ai_service=ai,
+        question_service=SimpleNamespace(get_question_by_id=questions.get)
+    )
+    lines = [
+        json.dumps({"question_id": f"q{i % 2 + 1}", "selected_option": "A", "explanation": "排 除法"})
+        for i in range(10)
+    ] + ["not json", json.dumps({"question_id": "missing"})]
+
+    results = [result async for result in evaluator.run(lines, skip_lines={3})]
+
+    by_line = {result["line"]: result for result in results}
+    assert sorted(by_line) == [1, 2, 4, 5, 6, 7, 8, 9, 10, 11, 12]
+    assert by_line[1]["evaluation"]["key_points_hit"] == ["排除法"]
+    assert by_line[11]["error"] == "Invalid JSON"
+    assert by_line[12]["error"] == "Question not found"
+    assert sorted(many_calls) == [4, 5]
@@ -0,0 +1,144 @@
+"""
+Tests for the circuit breaker and what counts against it
+"""
+import time
+from http import HTTPStatus
+from types import SimpleNamespace
+
+import pytest
+
+from app.core.circuit_breaker import CircuitBreaker, CircuitOpenError, CircuitState, is_breaker_failure_status
+from app.core.resilience import RetryPolicy
+from app.services.ai_service import AIService
+
+
+def make_breaker(**kwargs):
+    options = dict(window=10, min_calls=4, failure_rate_threshold=0.5, open_seconds=0.05)
+    options.update(kwargs)
+    return CircuitBreaker("test", **options)
+
+
+def test_stays_closed_below_min_calls():
+    breaker = make_breaker()
+    for _ in range(3):
+        breaker.record_failure()
+    assert breaker.state == CircuitState.CLOSED
+    assert breaker.allow_request()
+
+
+def test_opens_on_failure_rate():
+    breaker = make_breaker()
+    breaker.record_success(0.1)
+    breaker.record_success(0.1)
+    breaker.record_failure()
+    assert breaker.state == CircuitState.CLOSED
+    breaker.record_failure()
+    assert breaker.state == CircuitState.OPEN
+    assert not breaker.allow_request()
+    assert breaker.open_count == 1
+
+
+def test_opens_on_slow_call_rate():
+    breaker = make_breaker(slow_call_seconds=1.0, slow_call_rate_threshold=0.75)
+    for _ in range(3):
+        breaker.record_success(2.0)
+    breaker.record_success(0.1)
+    assert breaker.state == CircuitState.OPEN
+
+
+def test_half_open_probe_closes_or_reopens():
+    breaker = make_breaker()
+    for _ in range(4):
+        breaker.record_failure()
+    time.sleep(0.06)
+    assert breaker.state == CircuitState.HALF_OPEN
+    assert breaker.allow_request()
+    assert not breaker.allow_request()
+    breaker.record_failure()
+    assert breaker.state == CircuitState.OPEN
+
+    time.sleep(0.06)
+    assert breaker.allow_request()
+    breaker.record_success(0.1)
+    assert breaker.state == CircuitState.CLOSED
+
+
+def test_ignored_call_frees_the_probe_slot():
+    breaker = make_breaker()
+    for _ in range(4):
+        breaker.record_failure()
+    time.sleep(0.06)
+    assert breaker.allow_request()
+    breaker.record_ignored()
+    assert breaker.state == CircuitState.HALF_OPEN
+    assert breaker.allow_request()
+
+
+def test_ignored_calls_do_not_count():
+    breaker = make_breaker()
+    for _ in range(10):
+        breaker.record_ignored()
+    assert breaker.snapshot()["window_calls"] == 0
+    assert breaker.state == CircuitState.CLOSED
+
+
+@pytest.mark.parametrize("status, counts", [
+    (HTTPStatus.UNAUTHORIZED, True),
+    (HTTPStatus.FORBIDDEN, True),
+    (HTTPStatus.TOO_MANY_REQUESTS, True),
+    (HTTPStatus.INTERNAL_SERVER_ERROR, True),
+    (HTTPStatus.SERVICE_UNAVAILABLE, True),
+    (HTTPStatus.BAD_REQUEST, False),
+    (HTTPStatus.REQUEST_ENTITY_TOO_LARGE, False),
+    (HTTPStatus.NOT_FOUND, False),
+])
+def test_breaker_failure_statuses(status, counts):
+    assert is_breaker_failure_status(status) is counts
+
+
+@pytest.fixture
+def ai_service():
+    service = AIService()
+    service.llm_retry_policy = RetryPolicy(attempt_timeout=1.0, max_retries=0)
+    service.breakers["llm"] = make_breaker(open_seconds=60)
+    return service
+
+
+def llm_response(status_code, code=""):
+    return SimpleNamespace(status_code=status_code, code=code, message="", output=None, usage=None)
+
+
+async def test_rejected_inputs_do_not_open_the_llm_breaker(ai_service):
+    ai_service._call_llm = lambda **kwargs: llm_response(HTTPStatus.BAD_REQUEST, "DataInspectionFailed")
+    for _ in range(10):
+        response = await ai_service._call_llm_async([{"role": "user", "content": "hi"}])
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+    assert ai_service.breakers["llm"].state == CircuitState.CLOSED
+
+
+async def test_auth_errors_open_the_llm_breaker(ai_service):
+    ai_service._call_llm = lambda **kwargs: llm_response(HTTPStatus.UNAUTHORIZED, "InvalidApiKey")
+    for _ in range(4):
+        await ai_service._call_llm_async([{"role": "user", "content": "hi"}])
+    with pytest.raises(CircuitOpenError):
+        await ai_service._call_llm_async([{"role": "user", "content": "hi"}])
+
+
+async def test_connection_errors_count_and_other_errors_do_not(ai_service):
+    def refuse(**kwargs):
+        raise ConnectionRefusedError()
+
+    def invalid(**kwargs):
+        raise ValueError("messages must not be empty")
+
+    ai_service._call_llm = invalid
+    for _ in range(10):
+        with pytest.raises(ValueError):
+            await ai_service._call_llm_async([])
+    assert ai_service.breakers["llm"].state == CircuitState.CLOSED
+
+    ai_service._call_llm = refuse
+    for _ in range(4):
+        with pytest.raises(ConnectionRefusedError):
+            await ai_service._call_llm_async([{"role": "user", "content": "hi"}])
+    assert ai_service.breakers["llm"].state == CircuitState.OPEN
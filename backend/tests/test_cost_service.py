@@ -0,0 +1,57 @@
+"""
+Tests for cost accounting and budget levels
+"""
+import pytest
+
+from app.core.config import get_settings
+from app.core.metrics import BUDGET_DEGRADATIONS
+from app.schemas.interview import SessionUsage
+from app.services.cost_service import BudgetLevel, CostTracker
+
+
+@pytest.fixture
+def tracker():
+    settings = get_settings().model_copy(update={
+        "session_budget": 1.0, "daily_budget": 0.0, "budget_degrade_ratio": 0.8
+    })
+    return CostTracker(settings)
+
+
+def degradations(level):
+    return BUDGET_DEGRADATIONS.labels("session", level).value
+
+
+def test_levels_follow_session_spend(tracker):
+    usage = SessionUsage()
+    assert tracker.check(usage) == (BudgetLevel.OK, "session")
+    usage.estimated_cost = 0.85
+    assert tracker.check(usage)[0] == BudgetLevel.DEGRADED
+    usage.estimated_cost = 1.0
+    assert tracker.check(usage)[0] == BudgetLevel.EXHAUSTED
+    assert usage.degraded
+    assert usage.budget_level == "exhausted"
+
+
+def test_degradations_are_counted_once_per_level_change(tracker):
+    degraded, exhausted = degradations("degraded"), degradations("exhausted")
+    usage = SessionUsage(estimated_cost=0.9)
+    for _ in range(5):
+        tracker.check(usage)
+    assert degradations("degraded") == degraded + 1
+
+    usage.estimated_cost = 1.5
+    for _ in range(5):
+        tracker.check(usage)
+    assert degradations("exhausted") == exhausted + 1
+
+    tracker.check(SessionUsage(estimated_cost=0.9))
+    assert degradations("degraded") == degraded + 2
+
+
+def test_llm_cost_is_added_to_the_session(tracker):
+    usage = SessionUsage()
+    cost = tracker.record_llm(usage, tracker.settings.llm_model, input_tokens=1000, output_tokens=500)
+    assert cost > 0
+    assert usage.estimated_cost == pytest.approx(cost)
+    assert usage.llm_calls == 1
+    assert tracker.daily_cost == pytest.approx(cost)
@@ -0,0 +1,127 @@
+"""
+Tests for ETags, conditional GETs and precompressed static payloads
+"""
+import gzip
+import json
+
+import pytest
+from fastapi import FastAPI, Request
+from fastapi.testclient import TestClient
+
+from app.core import http_cache
+from app.core.http_cache import StaticPayload, cached_response, negotiate_encoding
+
+BODY = json.dumps([{"id": i, "title": "题目" * 20} for i in range(50)], ensure_ascii=False).encode("utf-8")
+
+
+@pytest.fixture
+def payload():
+    return StaticPayload(BODY, version="v1")
+
+
+@pytest.fixture
+def client(payload):
+    app = FastAPI()
+
+    @app.get("/view")
+    async def view(request: Request):
+        return await cached_response(request, payload, max_age=60)
+
+    @app.get("/small")
+    async def small(request: Request):
+        return await cached_response(request, StaticPayload(b"[]", version="v1"))
+
+    return TestClient(app)
+
+
+def test_etag_depends_on_version_and_body(payload):
+    assert payload.etag.startswith('"v1-')
+    assert StaticPayload(BODY, version="v2").etag != payload.etag
+    assert StaticPayload(BODY + b" ", version="v1").etag != payload.etag
+    assert StaticPayload(BODY, version="v1").etag == payload.etag
+
+
+def test_each_coding_has_its_own_etag(payload):
+    assert payload.etag_for(None) == payload.etag
+    assert payload.etag_for("gzip") == payload.etag[:-1] + '-gzip"'
+
+
+def test_matches_any_representation(payload):
+    assert payload.matches(payload.etag)
+    assert payload.matches(f'"other", W/{payload.etag_for("gzip")}')
+    assert payload.matches("*")
+    assert not payload.matches('"other"')
+    assert not payload.matches(None)
+
+
+def test_precompress_caches_encoded_bodies(payload):
+    assert not payload.is_encoded("gzip")
+    payload.precompress()
+    assert payload.is_encoded("gzip")
+    assert gzip.decompress(payload.encoded("gzip")) == BODY
+    assert payload.encoded("gzip") is payload.encoded("gzip")
+
+
+def test_precompress_skips_small_bodies():
+    small = StaticPayload(b"[]", version="v1").precompress(min_size=1024)
+    assert not small.is_encoded("gzip")
+
+
+@pytest.mark.parametrize("header, expected", [
+    (None, None),
+    ("", None),
+    ("gzip, deflate", "gzip"),
+    ("GZIP", "gzip"),
+    ("gzip;q=0", None),
+    ("identity", None),
+    ("*", "gzip"),
+    ("*;q=0", None),
+    ("gzip;q=bad", None),
+])
+def test_negotiate_encoding(monkeypatch, header, expected):
+    monkeypatch.setattr(http_cache, "ENCODINGS", ("gzip",))
+    assert negotiate_encoding(header) == expected
+
+
+def test_brotli_is_preferred_when_installed(monkeypatch):
+    monkeypatch.setattr(http_cache, "ENCODINGS", ("br", "gzip"))
+    assert negotiate_encoding("gzip, br") == "br"
+    assert negotiate_encoding("gzip, br;q=0") == "gzip"
+
+
+def test_response_is_compressed_and_private(client, payload):
+    response = client.get("/view", headers={"Accept-Encoding": "gzip"})
+    assert response.status_code == 200
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.headers["etag"] == payload.etag_for("gzip")
+    assert response.headers["cache-control"] == "private, max-age=60"
+    assert response.headers["vary"] == "Accept-Encoding"
+    assert response.content == BODY
+
+
+def test_identity_response(client, payload):
+    response = client.get("/view", headers={"Accept-Encoding": "identity"})
+    assert "content-encoding" not in response.headers
+    assert response.headers["etag"] == payload.etag
+    assert response.content == BODY
+
+
+def test_conditional_get_returns_304_without_body(client):
+    etag = client.get("/view", headers={"Accept-Encoding": "gzip"}).headers["etag"]
+    response = client.get("/view", headers={"Accept-Encoding": "gzip", "If-None-Match": etag})
+    assert response.status_code == 304
+    assert response.content == b""
+    assert response.headers["etag"] == etag
+    assert response.headers["cache-control"] == "private, max-age=60"
+
+
+def test_stale_etag_gets_the_body(client):
+    response = client.get("/view", headers={"If-None-Match": '"v0-0000"'})
+    assert response.status_code == 200
+    assert response.content == BODY
+
+
+def test_small_bodies_are_not_compressed_and_revalidate(client):
+    response = client.get("/small", headers={"Accept-Encoding": "gzip"})
+    assert "content-encoding" not in response.headers
+    assert response.headers["cache-control"] == "private, no-cache"
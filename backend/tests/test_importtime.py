@@ -0,0 +1,34 @@
+"""
+Startup import budget (see bench/importtime.py)
+"""
+import statistics
+
+import pytest
+
+from bench import importtime
+
+BUDGET_MS = 800
+RUNS = 3
+
+
+@pytest.fixture(scope="module")
+def app_imports():
+    """Import app.main in fresh interpreters: (median total ms, modules imported by any run)"""
+    totals, imported = [], set()
+    for _ in range(RUNS):
+        total, modules = importtime.measure("app.main")
+        totals.append(total)
+        imported.update(modules)
+    return statistics.median(totals) / 1000, imported
+
+
+def test_app_import_is_within_budget(app_imports):
+    median_ms, _ = app_imports
+    assert median_ms <= BUDGET_MS, f"import app.main took {median_ms:.1f}ms (budget {BUDGET_MS}ms)"
+
+
+@pytest.mark.parametrize("module", importtime.LAZY_MODULES)
+def test_lazy_modules_are_not_imported_at_startup(app_imports, module):
+    _, imported = app_imports
+    assert module not in imported
+    assert not any(name.startswith(module + ".") for name in imported)
@@ -0,0 +1,108 @@
+"""
+Tests for key point normalization and matching
+"""
+import pytest
+
+from app.schemas.interview import DifficultyLevel, Question, QuestionType
+from app.services.ai_service import AIService
+from app.services.keypoint_matcher import KeyPointMatcher, compile_matchers, expand_key_point, get_matcher, normalize
+
+
+def make_question(question_id="q1", key_points=("滑动窗口", "DP"), synonyms=None, correct_answer="B"):
+    return Question(
+        id=question_id,
+        type=QuestionType.ALGORITHM,
+        difficulty=DifficultyLevel.MEDIUM,
+        title="最长子串",
+        content="求最长不重复子串的长度",
+        correct_answer=correct_answer,
+        explanation="用滑动窗口维护当前子串",
+        key_points=list(key_points),
+        synonyms=synonyms or {},
+    )
+
+
+def test_normalize_folds_width_case_script_and_whitespace():
+    assert normalize("ＤＰ") == "dp"
+    assert normalize("Dynamic  Programming") == "dynamicprogramming"
+    assert normalize("排 除\t法") == "排除法"
+    assert normalize("動態規劃") == "动态规划"
+    assert normalize("复杂度O（n），空间Ｏ(１)") == "复杂度o(n),空间o(1)"
+    assert normalize("①") == "1"
+
+
+def test_expand_key_point_adds_stems_without_droppable_suffix():
+    variants = expand_key_point("排除法")
+    assert "排除法" in variants
+    assert "排除" in variants
+
+
+@pytest.mark.parametrize("explanation", [
+    "先用DP求解",
+    "先用dp求解",
+    "先用Dp求解",
+    "先用ＤＰ求解",
+    "用 dynamic programming 做",
+    "用Dynamic   Programming做",
+    "用动态规划",
+    "用動態規劃",
+    "用 动 态 规 划",
+])
+def test_spellings_of_a_key_point_match(explanation):
+    matcher = KeyPointMatcher(["动态规划"], {"动态规划": ["DP", "dynamic programming"]})
+    assert matcher.match(explanation) == ["动态规划"]
+
+
+def test_key_point_split_by_whitespace_matches():
+    matcher = KeyPointMatcher(["滑动窗口", "排除法"])
+    assert matcher.match("维护一个滑 动 窗口，再用排 除法") == ["滑动窗口", "排除法"]
+
+
+def test_matches_are_in_key_point_order_and_misses_are_left_out():
+    matcher = KeyPointMatcher(["双指针", "滑动窗口", "哈希表"])
+    assert matcher.match("哈希表记录位置，滑动窗口右移") == ["滑动窗口", "哈希表"]
+    assert matcher.match("暴力枚举") == []
+    assert matcher.match("") == []
+
+
+def test_ascii_explanation_matches_ascii_synonyms_only():
+    matcher = KeyPointMatcher(["滑动窗口", "哈希表"], {"滑动窗口": ["sliding window"], "哈希表": ["hash map"]})
+    assert matcher.match("Sliding Window with a HASH MAP") == ["滑动窗口", "哈希表"]
+
+
+def test_match_many_matches_each_explanation():
+    matcher = KeyPointMatcher(["滑动窗口", "DP"])
+    explanations = ["滑动窗口", "dp", "滑 动窗口 + Dp", "枚举"]
+    assert matcher.match_many(explanations) == [["滑动窗口"], ["DP"], ["滑动窗口", "DP"], []]
+    assert matcher.match_many(explanations) == [matcher.match(text) for text in explanations]
+
+
+def test_compiled_matchers_are_shared_and_kept_on_reload():
+    first, second = make_question("q1"), make_question("q2")
+    compile_matchers([first, second])
+    matcher = get_matcher(first)
+    assert get_matcher(second) is matcher
+    compile_matchers([first])
+    assert get_matcher(first) is matcher
+
+
+def test_changed_key_points_get_a_new_matcher():
+    compile_matchers([make_question("q1")])
+    changed = make_question("q1", key_points=("双指针",))
+    assert get_matcher(changed).match("双指针") == ["双指针"]
+
+
+def test_rule_based_evaluate_many_matches_single_evaluations():
+    ai = AIService()
+    question = make_question()
+    answers = [("B", "滑动 窗口加dp"), ("A", "DP"), (None, "不知道"), ("B", "")]
+    many = ai.rule_based_evaluate_many(question, answers)
+    single = [
+        ai._rule_based_evaluation(
+            question, option, explanation, option == question.correct_answer if option else False
+        )
+        for option, explanation in answers
+    ]
+    assert many == single
+    assert many[0].key_points_hit == ["滑动窗口", "DP"]
+    assert many[0].is_correct and not many[1].is_correct and not many[2].is_correct
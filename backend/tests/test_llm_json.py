@@ -0,0 +1,156 @@
+"""
+Tests for tolerant and incremental parsing of LLM JSON output
+"""
+import json
+from http import HTTPStatus
+from types import SimpleNamespace
+
+import pytest
+
+from app.core.resilience import RetryPolicy
+from app.schemas.interview import DifficultyLevel, Question, QuestionType
+from app.services.ai_service import AIService
+from app.services.llm_json import IncrementalJSONParser, coerce_evaluation, parse_json_lenient, valid_json_prefix
+
+
+EVALUATION = {"score": 85, "feedback": "思路清晰", "hints": [], "key_points_hit": ["排除法"], "key_points_missed": []}
+
+
+@pytest.mark.parametrize("text", [
+    json.dumps(EVALUATION, ensure_ascii=False),
+    "```json\n" + json.dumps(EVALUATION, ensure_ascii=False) + "\n```",
+    "评估结果如下：" + json.dumps(EVALUATION, ensure_ascii=False) + " 以上。",
+    json.dumps(EVALUATION, ensure_ascii=False)[:-1] + ",}",
+])
+def test_parse_repairs_common_defects(text):
+    assert parse_json_lenient(text) == EVALUATION
+
+
+def test_python_literals_are_fixed_outside_strings_only():
+    text = '{"is_correct": True, "hints": None, "feedback": "None of the options is True, }"}'
+    assert parse_json_lenient(text) == {
+        "is_correct": True, "hints": None, "feedback": "None of the options is True, }"
+    }
+
+
+def test_truncated_output_keeps_complete_fields():
+    text = '{"score": 70, "feedback": "答案正确，但遗漏了'
+    assert parse_json_lenient(text, allow_truncated=False) is None
+    result = parse_json_lenient(text)
+    assert result["score"] == 70
+    assert result["feedback"].startswith("答案正确")
+
+
+def test_unusable_output():
+    assert parse_json_lenient(None) is None
+    assert parse_json_lenient("") is None
+    assert parse_json_lenient("no json here") is None
+    assert parse_json_lenient("[1, 2]") is None
+
+
+def test_valid_json_prefix_ends_after_last_complete_field():
+    assert valid_json_prefix('{"score": 70, "feedback": "ok", "hints": ["a", ') == '{"score": 70, "feedback": "ok",'
+    assert valid_json_prefix('{"score": 70, "feedback": "o') == '{"score": 70,'
+    assert valid_json_prefix('{"score": 70}') is None
+    assert valid_json_prefix('{"sco') is None
+
+
+def test_incremental_parser_reports_fields_as_they_complete():
+    parser = IncrementalJSONParser()
+    text = '```json\n{"score": 90, "feedback": "好, {不错}", "hints": ["a", "b"]}\n```'
+    seen = []
+    for i in range(0, len(text), 3):
+        completed = parser.feed(text[i:i + 3])
+        seen.extend(completed)
+        if "score" in completed:
+            assert "feedback" not in parser.fields
+    assert seen == ["score", "feedback", "hints"]
+    assert parser.done
+    assert parser.fields == {"score": 90, "feedback": "好, {不错}", "hints": ["a", "b"]}
+
+
+def test_coerce_evaluation_clamps_and_wraps():
+    evaluation = coerce_evaluation({"score": "120", "feedback": "好", "hints": "多想想"}, is_correct=True)
+    assert evaluation.score == 100
+    assert evaluation.hints == ["多想想"]
+    assert coerce_evaluation({"score": "abc", "feedback": ""}, is_correct=False).score == 30
+    assert coerce_evaluation({"unrelated": 1}, is_correct=True) is None
+
+
+def stream_chunks(text, size=4):
+    return [
+        SimpleNamespace(
+            status_code=HTTPStatus.OK,
+            output=SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=text[i:i + size]))]),
+            usage=None
+        )
+        for i in range(0, len(text), size)
+    ]
+
+
+@pytest.fixture
+def streaming_ai():
+    service = AIService()
+    service.llm_retry_policy = RetryPolicy(attempt_timeout=1.0, max_retries=0)
+    return service
+
+
+def test_stream_stops_at_the_closing_brace(streaming_ai):
+    read = []
+    chunks = stream_chunks(json.dumps(EVALUATION, ensure_ascii=False) + "\n以上是评估结果。" * 5)
+
+    def fake_stream(**kwargs):
+        for chunk in chunks:
+            read.append(chunk)
+            yield chunk
+
+    streaming_ai._call_llm = fake_stream
+    response = streaming_ai._collect_stream([])
+    assert response.fields == EVALUATION
+    assert not response.stopped
+    assert len(read) < len(chunks)
+
+
+def test_stream_stops_once_fields_decide(streaming_ai):
+    read = []
+    text = '{"score": 40, "confidence": 30, "feedback": "' + "很长的反馈" * 50 + '"}'
+    chunks = stream_chunks(text)
+
+    def fake_stream(**kwargs):
+        for chunk in chunks:
+            read.append(chunk)
+            yield chunk
+
+    streaming_ai._call_llm = fake_stream
+    response = streaming_ai._collect_stream([], stop_when=lambda fields: "confidence" in fields)
+    assert response.stopped
+    assert response.fields == {"score": 40, "confidence": 30}
+    assert len(read) < 10
+
+
+async def test_fast_answer_is_cut_off_when_it_will_be_escalated(streaming_ai, monkeypatch):
+    question = Question(
+        id="q1", type=QuestionType.LOGIC, difficulty=DifficultyLevel.EASY, title="t", content="c",
+        correct_answer="A", explanation="e", key_points=["排除法"]
+    )
+    streaming_ai.settings = streaming_ai.settings.model_copy(update={
+        "llm_stream_json": True, "llm_fast_model": "fast", "llm_model": "large", "llm_api_key": "test"
+    })
+    streaming_ai.router.fast_model = "fast"
+    calls = []
+    read = {"fast": 0, "large": 0}
+
+    def fake_call(messages, stream=False, model=None, **kwargs):
+        calls.append(model)
+        confidence = 20 if model == "fast" else 95
+        text = json.dumps({"score": 88, "confidence": confidence, **EVALUATION}, ensure_ascii=False)
+        for chunk in stream_chunks(text):
+            read[model] += 1
+            yield chunk
+
+    streaming_ai._call_llm = fake_call
+    evaluation, tier = await streaming_ai.evaluate_answer_with_tier(question, "A", "用排除法逐一排除错误选项")
+    assert calls == ["fast", "large"]
+    assert read["fast"] < read["large"] / 2
+    assert tier.value == "large"
+    assert evaluation.feedback == EVALUATION["feedback"]
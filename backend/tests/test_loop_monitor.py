@@ -0,0 +1,84 @@
+"""
+Tests for event-loop blocking detection
+"""
+import asyncio
+import time
+
+import pytest
+
+from app.core.loop_monitor import BlockingCallError, LoopMonitor
+
+
+async def serve(monitor: LoopMonitor, block: bool):
+    """Stand-in for the check_blocking_calls middleware: the app runs in a task of its own"""
+    violations = monitor.track_request()
+
+    async def endpoint():
+        await asyncio.sleep(0.01)
+        if block:
+            time.sleep(0.2)
+        return "ok"
+
+    result = await asyncio.create_task(endpoint())
+    await asyncio.sleep(0.1)  # Give the watchdog time to report
+    return result, violations
+
+
+@pytest.mark.allow_blocking
+async def test_strict_monitor_charges_blocking_to_its_request():
+    monitor = LoopMonitor(interval=0.05, block_threshold=0.05, strict=True)
+    monitor.start()
+    try:
+        (blocked_result, blocked), (clean_result, clean) = await asyncio.gather(
+            serve(monitor, block=True), serve(monitor, block=False)
+        )
+    finally:
+        await monitor.stop()
+
+    assert blocked_result == clean_result == "ok"
+    assert len(blocked) == 1
+    assert "time.sleep" in blocked[0].stack or "endpoint" in blocked[0].stack
+    assert clean == []
+    monitor.check(clean)
+    with pytest.raises(BlockingCallError):
+        monitor.check(blocked)
+
+
+@pytest.mark.allow_blocking
+async def test_blocking_outside_requests_is_recorded_but_not_charged():
+    monitor = LoopMonitor(interval=0.05, block_threshold=0.05, strict=True)
+    monitor.start()
+    try:
+        _, violations = await serve(monitor, block=False)
+        await asyncio.sleep(0.01)
+        time.sleep(0.2)
+        await asyncio.sleep(0.05)
+    finally:
+        await monitor.stop()
+    assert monitor.violation_count == 1
+    assert violations == []
+
+
+async def test_owned_tasks_behave_like_plain_ones():
+    monitor = LoopMonitor(interval=0.05, block_threshold=0.2, strict=True)
+    monitor.start()
+    try:
+        monitor.track_request()
+
+        async def fail():
+            await asyncio.sleep(0)
+            raise ValueError("boom")
+
+        task = asyncio.create_task(fail(), name="owned")
+        with pytest.raises(ValueError):
+            await task
+        assert task.get_name() == "owned"
+
+        slow = asyncio.create_task(asyncio.sleep(10))
+        await asyncio.sleep(0)
+        slow.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await slow
+        assert await asyncio.wait_for(asyncio.sleep(0, result=3), timeout=1) == 3
+    finally:
+        await monitor.stop()
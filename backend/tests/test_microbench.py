@@ -0,0 +1,46 @@
+"""
+Micro-benchmark cases as tests
+
+Every case of bench/microbench.py is run once, so a broken hot path fails
+here. Cases found in a saved baseline (bench/baseline.json, recorded on
+this machine with `python -m bench.microbench --save-baseline`) are also
+timed and fail when slower than the baseline by more than the threshold.
+"""
+import pytest
+
+from bench import microbench
+from app.services.question_service import get_question_service
+
+# Real bank and one synthetic size; 100k is left to the CLI
+SIZES = (microbench.DEFAULT_SIZES[0], 10_000)
+THRESHOLD = 0.25
+
+CASES = dict(microbench.build_cases(SIZES))
+
+
+@pytest.fixture(scope="module", autouse=True)
+def restore_question_bank():
+    """Cases install synthetic banks into the shared question service"""
+    questions = get_question_service()
+    bank = list(questions.get_all_questions())
+    yield
+    questions.set_questions(bank)
+
+
+@pytest.fixture(scope="module")
+def baseline():
+    return microbench.load_baseline(str(microbench.DEFAULT_BASELINE))
+
+
+@pytest.mark.parametrize("name", list(CASES))
+def test_case(name, baseline):
+    func = CASES[name]()
+    func()
+    reference = baseline.get(name)
+    if reference is None:
+        return
+    result = microbench.measure(func, repeat=3)
+    ratio = microbench.slowdown(result, reference)
+    assert ratio <= THRESHOLD, (
+        f"{name}: {result['best'] * 1e6:.1f}us vs baseline {reference['best'] * 1e6:.1f}us ({ratio:+.1%})"
+    )
@@ -0,0 +1,98 @@
+"""
+Tests for parser call deduplication and the result cache
+"""
+import asyncio
+
+import pytest
+
+from app.services.parser_service import ParserError, ParserService
+
+
+class FakeParser:
+    """Stand-in for ParserService._call that waits for release()"""
+
+    def __init__(self, result=None, error=None):
+        self.calls = 0
+        self.result = result if result is not None else {"name": "张三"}
+        self.error = error
+        self.started = asyncio.Event()
+        self._release = asyncio.Event()
+
+    def release(self):
+        self._release.set()
+
+    async def __call__(self, kind, url, api_key, send):
+        self.calls += 1
+        self.started.set()
+        await self._release.wait()
+        if self.error is not None:
+            raise self.error
+        return self.result
+
+
+@pytest.fixture
+def service():
+    service = ParserService()
+    service.settings = service.settings.model_copy(update={"jd_parser_api_url": "http://parser.test/jd"})
+    return service
+
+
+async def test_concurrent_callers_share_one_call(service):
+    service._call = fake = FakeParser()
+    callers = [asyncio.create_task(service.parse_text("jd", "后端工程师")) for _ in range(5)]
+    await fake.started.wait()
+    assert service.cache_info() == {"entries": 0, "in_flight": 1}
+    fake.release()
+
+    results = await asyncio.gather(*callers)
+    assert fake.calls == 1
+    assert [cached for _, cached in results] == [False, True, True, True, True]
+    assert all(data == {"name": "张三"} for data, _ in results)
+    assert service.cache_info() == {"entries": 1, "in_flight": 0}
+    assert await service.parse_text("jd", "后端工程师") == ({"name": "张三"}, True)
+    assert fake.calls == 1
+
+
+async def test_cancelling_the_first_caller_does_not_fail_the_others(service):
+    service._call = fake = FakeParser()
+    first = asyncio.create_task(service.parse_text("jd", "后端工程师"))
+    await fake.started.wait()
+    second = asyncio.create_task(service.parse_text("jd", "后端工程师"))
+    await asyncio.sleep(0)
+
+    first.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await first
+    fake.release()
+    assert await second == ({"name": "张三"}, True)
+    assert fake.calls == 1
+    assert service.cache_info() == {"entries": 1, "in_flight": 0}
+
+
+async def test_cancelling_every_caller_still_caches_the_result(service):
+    service._call = fake = FakeParser()
+    caller = asyncio.create_task(service.parse_text("jd", "后端工程师"))
+    await fake.started.wait()
+    caller.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await caller
+    fake.release()
+    while service.cache_info()["in_flight"]:
+        await asyncio.sleep(0)
+    assert await service.parse_text("jd", "后端工程师") == ({"name": "张三"}, True)
+    assert fake.calls == 1
+
+
+async def test_failures_reach_every_caller_as_parser_error(service):
+    service._call = fake = FakeParser(error=RuntimeError("connection reset"))
+    callers = [asyncio.create_task(service.parse_text("jd", "后端工程师")) for _ in range(3)]
+    await fake.started.wait()
+    fake.release()
+    results = await asyncio.gather(*callers, return_exceptions=True)
+    assert all(isinstance(e, ParserError) and str(e) == "connection reset" for e in results)
+    assert service.cache_info() == {"entries": 0, "in_flight": 0}
+
+    # Failures are not cached: the next request calls the parser again
+    fake.error = None
+    assert await service.parse_text("jd", "后端工程师") == ({"name": "张三"}, False)
+    assert fake.calls == 2
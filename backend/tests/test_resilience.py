@@ -0,0 +1,178 @@
+"""
+Tests for deadlines, retries and hedged requests
+"""
+import threading
+import time
+from http import HTTPStatus
+from types import SimpleNamespace
+
+import pytest
+
+from app.core.resilience import (
+    Deadline, DeadlineExceeded, LatencyTracker, RetryPolicy, call_with_retry,
+    is_retryable_error, is_retryable_response
+)
+
+
+def response(status_code=HTTPStatus.OK, **fields):
+    return SimpleNamespace(status_code=status_code, **fields)
+
+
+def no_backoff(max_retries=2, **kwargs):
+    return RetryPolicy(attempt_timeout=1.0, max_retries=max_retries, backoff_base=0.0, backoff_max=0.0, **kwargs)
+
+
+class Calls:
+    """Blocking fake provider returning or raising the scripted results in order"""
+
+    def __init__(self, *results, delay=0.0):
+        self.results = list(results)
+        self.delay = delay
+        self.timeouts = []
+        self._lock = threading.Lock()
+
+    def __call__(self, timeout):
+        with self._lock:
+            self.timeouts.append(timeout)
+            result = self.results.pop(0) if len(self.results) > 1 else self.results[0]
+        delay = result[1] if isinstance(result, tuple) else self.delay
+        result = result[0] if isinstance(result, tuple) else result
+        time.sleep(delay)
+        if isinstance(result, BaseException):
+            raise result
+        return result
+
+    @property
+    def count(self):
+        return len(self.timeouts)
+
+
+def test_deadline_remaining_never_negative():
+    deadline = Deadline(0.01)
+    time.sleep(0.02)
+    assert deadline.remaining() == 0.0
+    assert deadline.expired
+
+
+def test_latency_percentile_needs_samples():
+    tracker = LatencyTracker()
+    for i in range(19):
+        tracker.record(i)
+    assert tracker.percentile(95) is None
+    tracker.record(19)
+    assert tracker.percentile(95) == 19
+    assert tracker.percentile(50) == 10
+
+
+def test_backoff_is_capped_with_full_jitter():
+    policy = RetryPolicy(backoff_base=0.5, backoff_max=2.0)
+    assert all(0 <= policy.backoff(1) <= 0.5 for _ in range(50))
+    assert all(0 <= policy.backoff(10) <= 2.0 for _ in range(50))
+
+
+def test_retryable_classification():
+    assert is_retryable_response(response(HTTPStatus.TOO_MANY_REQUESTS))
+    assert is_retryable_response(response(HTTPStatus.SERVICE_UNAVAILABLE))
+    assert not is_retryable_response(response(HTTPStatus.BAD_REQUEST))
+    assert not is_retryable_response(response(HTTPStatus.OK))
+    assert is_retryable_error(TimeoutError())
+    assert is_retryable_error(ConnectionResetError())
+    assert not is_retryable_error(ValueError())
+
+
+async def test_success_needs_one_attempt():
+    calls = Calls(response())
+    result = await call_with_retry(calls, no_backoff(), Deadline(5))
+    assert result.status_code == HTTPStatus.OK
+    assert calls.count == 1
+
+
+async def test_retries_transient_errors_and_responses():
+    calls = Calls(ConnectionResetError(), response(HTTPStatus.SERVICE_UNAVAILABLE), response())
+    result = await call_with_retry(calls, no_backoff(), Deadline(5))
+    assert result.status_code == HTTPStatus.OK
+    assert calls.count == 3
+
+
+async def test_non_retryable_response_is_returned_as_is():
+    calls = Calls(response(HTTPStatus.BAD_REQUEST), response())
+    result = await call_with_retry(calls, no_backoff(), Deadline(5))
+    assert result.status_code == HTTPStatus.BAD_REQUEST
+    assert calls.count == 1
+
+
+async def test_non_retryable_error_is_raised_immediately():
+    calls = Calls(ValueError("bad request"))
+    with pytest.raises(ValueError):
+        await call_with_retry(calls, no_backoff(), Deadline(5))
+    assert calls.count == 1
+
+
+async def test_exhausted_retries_return_last_response():
+    calls = Calls(response(HTTPStatus.TOO_MANY_REQUESTS))
+    result = await call_with_retry(calls, no_backoff(max_retries=2), Deadline(5))
+    assert result.status_code == HTTPStatus.TOO_MANY_REQUESTS
+    assert calls.count == 3
+
+
+async def test_exhausted_retries_raise_last_error():
+    calls = Calls(ConnectionResetError("reset"))
+    with pytest.raises(ConnectionResetError):
+        await call_with_retry(calls, no_backoff(max_retries=1), Deadline(5))
+    assert calls.count == 2
+
+
+async def test_attempt_timeout_is_bounded_by_deadline():
+    calls = Calls(response())
+    await call_with_retry(calls, RetryPolicy(attempt_timeout=20.0), Deadline(0.5))
+    assert calls.timeouts[0] <= 0.5
+
+
+async def test_expired_deadline_makes_no_attempt():
+    calls = Calls(response())
+    deadline = Deadline(0.0)
+    with pytest.raises(DeadlineExceeded):
+        await call_with_retry(calls, no_backoff(), deadline)
+    assert calls.count == 0
+
+
+async def test_slow_attempt_times_out_and_is_retried():
+    calls = Calls((response(), 0.5), (response(HTTPStatus.CREATED), 0.0))
+    policy = RetryPolicy(attempt_timeout=0.1, max_retries=1, backoff_base=0.0, backoff_max=0.0)
+    result = await call_with_retry(calls, policy, Deadline(5))
+    assert result.status_code == HTTPStatus.CREATED
+
+
+async def test_hedge_wins_when_primary_is_slow():
+    calls = Calls((response(which="primary"), 0.5), (response(which="hedge"), 0.0))
+    policy = no_backoff(max_retries=0, hedge_enabled=True, hedge_min_delay=0.05)
+    started = time.monotonic()
+    result = await call_with_retry(calls, policy, Deadline(5))
+    assert result.which == "hedge"
+    assert calls.count == 2
+    assert time.monotonic() - started < 0.4
+
+
+async def test_no_hedge_when_primary_is_fast():
+    calls = Calls(response())
+    policy = no_backoff(max_retries=0, hedge_enabled=True, hedge_min_delay=0.5)
+    await call_with_retry(calls, policy, Deadline(5))
+    assert calls.count == 1
+
+
+async def test_failed_hedge_does_not_win_over_a_success():
+    calls = Calls((response(which="primary"), 0.2), (ConnectionResetError(), 0.0))
+    policy = no_backoff(max_retries=0, hedge_enabled=True, hedge_min_delay=0.05)
+    result = await call_with_retry(calls, policy, Deadline(5))
+    assert result.which == "primary"
+
+
+async def test_hedge_delay_follows_observed_p95():
+    tracker = LatencyTracker()
+    for _ in range(20):
+        tracker.record(0.3)
+    calls = Calls((response(which="primary"), 0.15), (response(which="hedge"), 0.0))
+    policy = no_backoff(max_retries=0, hedge_enabled=True, hedge_min_delay=0.01)
+    result = await call_with_retry(calls, policy, Deadline(5), latency=tracker)
+    assert result.which == "primary"
+    assert calls.count == 1
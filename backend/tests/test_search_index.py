@@ -0,0 +1,130 @@
+"""
+Tests for the BM25 question search index
+"""
+import random
+
+import pytest
+
+from app.schemas.interview import DifficultyLevel, Question, QuestionType
+from app.services import search_index
+from app.services.search_index import SearchIndex, tokenize
+
+WORDS = ["逻辑推理", "排除法", "动态规划", "概率统计", "二进制", "博弈论", "边界条件", "Binary Search", "DP"]
+
+
+def make_question(question_id, title, content="请选择正确答案", key_points=(), tags=(),
+                  q_type=QuestionType.LOGIC, difficulty=DifficultyLevel.EASY):
+    return Question(
+        id=question_id, type=q_type, difficulty=difficulty, title=title, content=content,
+        correct_answer="A", explanation="解析", key_points=list(key_points), tags=list(tags)
+    )
+
+
+def make_bank(size, seed=3):
+    rng = random.Random(seed)
+    return [
+        make_question(
+            f"q{i}", f"题目{i} {rng.choice(WORDS)}", content=" ".join(rng.sample(WORDS, 3)) * rng.randint(1, 3),
+            key_points=rng.sample(WORDS, 2), tags=[rng.choice(WORDS)],
+            q_type=rng.choice(list(QuestionType)), difficulty=rng.choice(list(DifficultyLevel))
+        )
+        for i in range(size)
+    ]
+
+
+def python_engine(index):
+    """Force the dictionary engine (as without NumPy installed)"""
+    index._arrays = None
+    return index
+
+
+def test_tokenize_bigrams_words_and_folding():
+    assert tokenize("动态规划") == ["动态", "态规", "规划"]
+    assert tokenize("用 DP 求解") == ["用", "dp", "求解"]
+    assert tokenize("ＢＦＳ與DFS") == ["bfs", "与", "dfs"]
+    assert tokenize("邏輯") == ["逻辑"]
+    assert tokenize("，。！") == []
+
+
+def test_title_matches_rank_above_content_matches():
+    index = SearchIndex()
+    index.update([
+        make_question("content", "普通题目", content="可以用动态规划求解"),
+        make_question("title", "动态规划入门"),
+        make_question("other", "概率题"),
+    ])
+    results, total = index.search("动态规划")
+    assert [q.id for q, _ in results] == ["title", "content"]
+    assert total == 2
+    assert results[0][1] > results[1][1] > 0
+
+
+def test_single_character_query_expands_to_bigrams():
+    index = SearchIndex()
+    index.update([make_question("a", "博弈论"), make_question("b", "概率")])
+    results, _ = index.search("弈")
+    assert [q.id for q, _ in results] == ["a"]
+
+
+def test_filters_and_limit():
+    index = SearchIndex()
+    index.update([
+        make_question("easy", "排除法", difficulty=DifficultyLevel.EASY),
+        make_question("hard", "排除法", difficulty=DifficultyLevel.HARD),
+        make_question("math", "排除法", q_type=QuestionType.MATH),
+    ])
+    results, total = index.search("排除法", difficulty=DifficultyLevel.HARD)
+    assert [q.id for q, _ in results] == ["hard"] and total == 1
+    results, total = index.search("排除法", q_type=QuestionType.MATH)
+    assert [q.id for q, _ in results] == ["math"]
+    results, total = index.search("排除法", limit=2)
+    assert len(results) == 2 and total == 3
+
+
+def test_incremental_update_touches_only_changes():
+    index = SearchIndex()
+    bank = [make_question("a", "动态规划"), make_question("b", "二进制"), make_question("c", "博弈论")]
+    assert index.update(bank) == {"added": 3, "updated": 0, "removed": 0}
+    assert index.update(bank) == {"added": 0, "updated": 0, "removed": 0}
+
+    changed = [make_question("a", "概率统计"), bank[1], make_question("d", "动态规划")]
+    assert index.update(changed) == {"added": 1, "updated": 1, "removed": 1}
+    assert len(index) == 3
+    assert [q.id for q, _ in index.search("动态规划")[0]] == ["d"]
+    assert index.search("博弈论") == ([], 0)
+    assert index.document_frequency("动态") == 1
+    assert {term for term, *_ in index.postings()} >= {"概率", "二进", "动态"}
+
+
+def test_compaction_keeps_results():
+    index = SearchIndex()
+    bank = make_bank(40)
+    index.update(bank)
+    before = index.search("逻辑推理 排除法", limit=40)
+    index.update(bank[:20])
+    assert len(index.documents()) == 20  # Half the documents were tombstones: compacted
+    index.update(bank)
+    after = index.search("逻辑推理 排除法", limit=40)
+    assert sorted((q.id, score) for q, score in after[0]) == sorted((q.id, score) for q, score in before[0])
+
+
+@pytest.mark.skipif(search_index.load_numpy() is None, reason="NumPy not installed")
+@pytest.mark.parametrize("query", ["动态规划", "逻辑推理 排除法", "binary search dp", "二", "没有结果的查询"])
+@pytest.mark.parametrize("filters", [{}, {"q_type": QuestionType.MATH}, {"difficulty": DifficultyLevel.HARD}])
+def test_numpy_and_python_engines_agree(query, filters):
+    bank = make_bank(300)
+    numpy_index, dict_index = SearchIndex(), SearchIndex()
+    numpy_index.update(bank)
+    dict_index.update(bank)
+    numpy_index.update(bank[:250] + bank[260:])  # Tombstones too
+    dict_index.update(bank[:250] + bank[260:])
+    python_engine(dict_index)
+
+    expected, expected_total = dict_index.search(query, limit=15, **filters)
+    results, total = numpy_index.search(query, limit=15, **filters)
+    assert total == expected_total
+    assert [score for _, score in results] == pytest.approx([score for _, score in expected])
+    # Ties may be cut at a different document; everything above the last score must agree
+    if results:
+        cut = results[-1][1]
+        assert {q.id for q, s in results if s > cut} == {q.id for q, s in expected if s > cut}
@@ -0,0 +1,109 @@
+"""
+Tests for hashed TF-IDF similarity between profiles and the question bank
+"""
+import math
+import random
+
+import pytest
+
+from app.schemas.interview import DifficultyLevel, Question, QuestionType
+from app.services import search_index, similarity_index
+from app.services.search_index import SearchIndex
+from app.services.similarity_index import SimilarityIndex
+
+TOPICS = ["动态规划", "概率统计", "二进制编码", "博弈论", "逻辑推理", "哈希冲突", "SQL 优化", "系统设计"]
+
+
+def make_question(question_id, title, content, key_points=()):
+    return Question(
+        id=question_id, type=QuestionType.ALGORITHM, difficulty=DifficultyLevel.MEDIUM, title=title,
+        content=content, correct_answer="A", explanation="解析", key_points=list(key_points)
+    )
+
+
+def make_bank(size, seed=5):
+    rng = random.Random(seed)
+    bank = []
+    for i in range(size):
+        topics = rng.sample(TOPICS, 2)
+        bank.append(make_question(f"q{i}", f"题目{i} {topics[0]}", "，".join(topics) * rng.randint(1, 3), topics))
+    return bank
+
+
+def build(questions, hash_bits=18, removed=()):
+    """Build like QuestionService: search index first (optionally with tombstones), then vectors"""
+    index = SearchIndex()
+    index.update(questions)
+    if removed:
+        questions = [q for q in questions if q.id not in removed]
+        index.update(questions)
+    similarity = SimilarityIndex(hash_bits)
+    similarity.build(questions, index, {q.id: i for i, q in enumerate(questions)})
+    return similarity
+
+
+@pytest.fixture(params=["numpy", "python"])
+def engine(request, monkeypatch):
+    if request.param == "numpy" and search_index.load_numpy() is None:
+        pytest.skip("NumPy not installed")
+    if request.param == "python":
+        monkeypatch.setattr(similarity_index, "_load_numpy", lambda: False)
+    return request.param
+
+
+def test_profile_ranks_matching_question_first(engine):
+    bank = [
+        make_question("dp", "动态规划", "背包问题，状态转移", ["动态规划"]),
+        make_question("prob", "概率统计", "抛硬币的期望", ["概率"]),
+        make_question("sys", "系统设计", "设计一个短链接服务", ["系统设计"]),
+    ]
+    similarity = build(bank)
+    assert similarity.engine == engine
+    results = similarity.top("熟悉动态规划与背包问题", k=3)
+    assert results[0][0].id == "dp"
+    assert all(0 < score <= 1.0 + 1e-6 for _, score in results)
+    assert "sys" not in [q.id for q, _ in results]
+
+
+def test_unknown_terms_and_empty_bank(engine):
+    similarity = build(make_bank(10))
+    assert similarity.top("完全无关的文本内容", k=5) == []
+    assert similarity.top("", k=5) == []
+    assert build([]).top("动态规划", k=5) == []
+
+
+def test_vectorize_returns_unit_vectors(engine):
+    similarity = build(make_bank(20))
+    vector = similarity.vectorize("动态规划和概率统计，动态规划")
+    assert math.isclose(math.sqrt(sum(v * v for v in vector.values())), 1.0, rel_tol=1e-9)
+
+
+def test_question_is_closest_to_its_own_text(engine):
+    bank = make_bank(30)
+    similarity = build(bank)
+    question = bank[7]
+    best, score = similarity.top(question.title + question.content + " ".join(question.key_points * 2), k=1)[0]
+    assert score > 0.5
+    assert set(best.key_points) == set(question.key_points)
+
+
+def test_removed_questions_are_not_returned(engine):
+    bank = make_bank(40)
+    similarity = build(bank, removed={"q1", "q2", "q3"})
+    ids = {q.id for q, _ in similarity.top("动态规划 概率统计 博弈论", k=40)}
+    assert ids and not ids & {"q1", "q2", "q3"}
+
+
+@pytest.mark.skipif(search_index.load_numpy() is None, reason="NumPy not installed")
+@pytest.mark.parametrize("hash_bits", [18, 6])  # 6 bits: most terms share a column
+def test_numpy_and_python_engines_agree(monkeypatch, hash_bits):
+    bank = make_bank(200)
+    profile = "熟悉动态规划、哈希冲突处理和 SQL 优化，做过系统设计"
+    with_numpy = build(bank, hash_bits, removed={"q5", "q50"}).top(profile, k=200)
+    monkeypatch.setattr(similarity_index, "_load_numpy", lambda: False)
+    with_python = build(bank, hash_bits, removed={"q5", "q50"}).top(profile, k=200)
+
+    assert len(with_numpy) == len(with_python)
+    numpy_scores = {q.id: score for q, score in with_numpy}
+    for question, score in with_python:
+        assert numpy_scores[question.id] == pytest.approx(score, rel=1e-5, abs=1e-6)
@@ -70,9 +70,27 @@ export const interviewApi = {
   // 取消面试
   cancelInterview(sessionId) {
     return api.post(`/interview/sessions/${sessionId}/cancel`)
+  },
+
+  // 解析简历（file: File 对象，或传 text 文本）
+  parseResume({ file, text } = {}) {
+    return api.post('/interview/parse/resume', documentForm(file, text), { timeout: 60000 })
+  },
+
+  // 解析JD（file: File 对象，或传 text 文本）
+  parseJD({ file, text } = {}) {
+    return api.post('/interview/parse/jd', documentForm(file, text), { timeout: 60000 })
   }
 }
 
+// 解析接口的表单数据（axios 会为 FormData 设置 multipart 请求头）
+function documentForm(file, text) {
+  const form = new FormData()
+  if (file) form.append('file', file)
+  else if (text) form.append('text', text)
+  return form
+}
+
 // 题库相关API
 export const questionApi = {
   // 获取所有题目
@@ -80,6 +98,16 @@ export const questionApi = {
     return api.get('/questions/')
   },
 
+  // 分页获取题目（params: type, difficulty, tags, fields, limit, cursor, count_only）
+  getQuestionPage(params = {}) {
+    return api.get('/questions/page', { params })
+  },
+
+  // 全文检索题目（params: q, type, difficulty, fields, limit）
+  searchQuestions(params = {}) {
+    return api.get('/questions/search', { params })
+  },
+
   // 获取题目类型
   getQuestionTypes() {
     return api.get('/questions/types')